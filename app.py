@@ -1,16 +1,14 @@
 import streamlit as st
 import pandas as pd
-import statistics
-import requests
-import re
-import json
-import os
 import time
-import html
-import collections
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from datetime import datetime, timedelta
+from ytintel.api import YouTubeGateway, cancellation
+from ytintel.cache import MetadataCache, SpyCache, ResultCache, result_key
+from ytintel.filters import duration_bucket, window_start, MAX_TIME_SLICES
+from ytintel.jobs import JobRunner
+from ytintel.spy import batch_channel_spy
+from ytintel.store import AppStore
+from ytintel.export import clean_filename, export_basename, export_txt, export_json, write_export_zip
+from ytintel import batch, planner, results, scan, seo, telemetry
 
 # ==========================================
 # 1. KONFIGURASI HALAMAN
@@ -22,17 +20,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-SETTINGS_FILE = "settings.json"
-HISTORY_FILE = "history.json"
-SEARCH_LOG_FILE = "search_log.json"
-
 # Inisialisasi State
 if 'search_results' not in st.session_state:
     st.session_state['search_results'] = None
 if 'total_scanned' not in st.session_state:
     st.session_state['total_scanned'] = 0
-if 'current_key_index' not in st.session_state:
-    st.session_state['current_key_index'] = 0
 if 'init_done' not in st.session_state:
     st.session_state['init_done'] = False
 if 'seo_results' not in st.session_state:
@@ -43,10 +35,11 @@ if 'debug_info' not in st.session_state:
 # ==========================================
 # 2. UTILS & DATABASE
 # ==========================================
-def clean_filename(text):
-    text = html.unescape(text)
-    cleaned = re.sub(r'[\\/*?:"<>|]', "", text)
-    return cleaned.strip()
+@st.cache_resource
+def get_app_store():
+    # Settings, history download & log pencarian di satu SQLite (migrasi
+    # otomatis dari settings.json / history.json / search_log.json lama)
+    return AppStore()
 
 def load_settings():
     config = {
@@ -57,76 +50,73 @@ def load_settings():
         "saved_max_subs": 0, 
         "saved_min_views": 1000,
         "saved_days_back": 30,
-        "saved_dark_mode": True
+        "saved_time_slices": 1,
+        "saved_dark_mode": True,
+        "saved_spy_ttl_hours": 24
     }
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, "r") as f:
-                saved = json.load(f)
-                config.update(saved)
-        except:
-            pass
+    try:
+        config = get_app_store().load_settings(config)
+    except:
+        pass
     return config
 
-def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+def load_download_history(video_ids):
+    try:
+        return get_app_store().download_history(video_ids)
+    except:
+        return {}
 
 def load_search_log():
-    if os.path.exists(SEARCH_LOG_FILE):
-        try:
-            with open(SEARCH_LOG_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+    try:
+        return get_app_store().search_log()
+    except:
+        return []
 
 def save_search_log(query, mode):
-    log = load_search_log()
     display_query = query if query.strip() != "" else "(Tanpa Kata Kunci)"
-    new_item = {
-        "query": display_query,
-        "mode": mode, 
-        "time": datetime.now().strftime("%d/%m %H:%M")
-    }
-    log = [x for x in log if x['query'].lower() != display_query.lower() or x['mode'] != mode]
-    log.insert(0, new_item)
-    with open(SEARCH_LOG_FILE, "w") as f:
-        json.dump(log[:30], f)
-
-def delete_search_log(index=None, delete_all=False):
-    if delete_all:
-        with open(SEARCH_LOG_FILE, "w") as f:
-            json.dump([], f)
-    else:
-        log = load_search_log()
-        if 0 <= index < len(log):
-            log.pop(index)
-            with open(SEARCH_LOG_FILE, "w") as f:
-                json.dump(log, f)
+    get_app_store().add_search_log(display_query, mode)
+
+def delete_search_log(log_id=None, delete_all=False):
+    get_app_store().delete_search_log(log_id=log_id, delete_all=delete_all)
 
 def mark_as_downloaded(video_id, title):
-    history = load_history()
-    history[video_id] = {
-        "title": title,
-        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
     try:
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(history, f)
+        get_app_store().mark_downloaded(video_id, title)
     except:
         pass
 
+def mark_many_as_downloaded(videos):
+    try:
+        get_app_store().mark_many_downloaded(videos)
+    except:
+        pass
+
+# State Metadata Editor: widget meta_{field}_{idx} hanya dibuat untuk baris di
+# halaman aktif. Streamlit membuang state widget yang tidak dirender, jadi
+# hasil edit disalin ke meta_edits lewat on_change dan dipakai lagi saat
+# baris itu dirender ulang / diexport.
+META_FIELDS = {
+    "title": lambda row: row['Judul Video'],
+    "chan": lambda row: row['Channel'],
+    "link": lambda row: row['Link'],
+    "tags": lambda row: ", ".join(row['Tags List']),
+    "desc": lambda row: row['Deskripsi'],
+}
+EDITOR_PAGE_SIZES = [10, 25, 50]
+
+def meta_for(row, edits):
+    return {field: edits.get(field, default(row)) for field, default in META_FIELDS.items()}
+
+def get_meta(idx, row):
+    return meta_for(row, st.session_state.get('meta_edits', {}).get(idx, {}))
+
+def remember_meta(idx, field):
+    st.session_state.setdefault('meta_edits', {}).setdefault(idx, {})[field] = st.session_state[f"meta_{field}_{idx}"]
+
 initial_config = load_settings()
-download_history = load_history()
 
 if not st.session_state['init_done']:
-    modes = ["🌱 Hemat", "⚖️ Sedang", "🔥 Agresif", "☠️ BRUTAL"]
+    modes = list(scan.SCAN_LIMITS)
     idx = 1
     if initial_config["saved_scan_mode"] in modes:
         idx = modes.index(initial_config["saved_scan_mode"])
@@ -142,11 +132,12 @@ def auto_save():
         "saved_max_subs": st.session_state.widget_max_subs,
         "saved_min_views": st.session_state.widget_min_views,
         "saved_days_back": st.session_state.widget_days_back,
-        "saved_dark_mode": st.session_state.get("widget_dark_mode", True)
+        "saved_time_slices": st.session_state.get("widget_time_slices", 1),
+        "saved_dark_mode": st.session_state.get("widget_dark_mode", True),
+        "saved_spy_ttl_hours": st.session_state.get("widget_spy_ttl", 24)
     }
     try:
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(current_settings, f)
+        get_app_store().save_settings(current_settings)
     except:
         pass
 
@@ -199,496 +190,346 @@ st.markdown(f"""
 # 4. FUNGSI LOGIKA (BACKEND)
 # ==========================================
 
-def parse_duration(pt_string):
+@st.cache_resource
+def get_gateway():
+    # Client pool + key scheduler: dibuat sekali per proses, dipakai bersama
+    # oleh semua sesi & rerun (state kuota juga tersimpan ke disk)
+    return YouTubeGateway()
+
+@st.cache_resource
+def get_metadata_cache():
+    # Cache videos/channels di SQLite, dipakai bersama antar sesi & tab
+    return MetadataCache()
+
+@st.cache_resource
+def get_spy_cache():
+    # Hasil Channel Spy per channelId, dipakai bersama semua sesi
+    return SpyCache()
+
+def load_cached_spies(channel_ids, ttl):
     try:
-        pattern = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
-        match = pattern.match(pt_string)
-        if not match: return 0
-        h, m, s = match.groups()
-        return (int(h or 0) * 3600) + (int(m or 0) * 60) + int(s or 0)
+        return get_spy_cache().lookup(channel_ids, ttl=ttl)
     except:
-        return 0
-
-def format_duration_human(seconds):
-    h = seconds // 3600
-    m = (seconds % 3600) // 60
-    s = seconds % 60
-    return f"{h}j {m}m {s}d" if h > 0 else f"{m}m {s}d"
+        return {}
 
-def get_videos_details_batch(youtube, video_ids):
-    if not video_ids: return {}
-    results = {}
+def execute_channel_spy(api_keys_list, channel_id, ttl=None, force=False):
     try:
-        res = youtube.videos().list(part="contentDetails,statistics,snippet", id=','.join(video_ids)).execute()
-        for item in res.get('items', []):
-            vid = item['id']
-            dur_str = item['contentDetails']['duration']
-            sec = parse_duration(dur_str)
-            results[vid] = {
-                "title": html.unescape(item['snippet']['title']),
-                "duration_text": format_duration_human(sec),
-                "duration_seconds": sec,
-                "views": int(item['statistics'].get('viewCount', 0)),
-                "url": f"https://www.youtube.com/watch?v={vid}"
-            }
+        return batch_channel_spy(get_gateway(), get_metadata_cache(), api_keys_list, [channel_id], spy_cache=get_spy_cache(), ttl=ttl, force=force).get(channel_id)
     except:
-        pass
-    return results
-
-def execute_channel_spy(api_key, channel_id):
-    youtube = build('youtube', 'v3', developerKey=api_key)
-    spy_data = {
-        "channel_desc": "-", "channel_keywords": [], 
-        "channel_age": 0, "channel_created": "-", 
-        "subscriber_count": 0, "total_views_all": 0, "total_video_count": 0,
-        "live_count": 0, "reguler_count": 0,
-        "top_live_list": [], "top_reg_list": [] 
-    }
+        return None
+
+def execute_batch_spy(api_keys_list, channel_ids, on_status=None, report=None, ttl=None, force=False):
     try:
-        ch_res = youtube.channels().list(part="snippet,statistics,brandingSettings", id=channel_id).execute()
-        if ch_res['items']:
-            item = ch_res['items'][0]
-            stt = item['statistics']
-            snp = item['snippet']
-            brd = item.get('brandingSettings', {}).get('channel', {})
-            spy_data["total_views_all"] = int(stt.get('viewCount', 0))
-            spy_data["total_video_count"] = int(stt.get('videoCount', 0))
-            if not stt.get('hiddenSubscriberCount'):
-                spy_data["subscriber_count"] = int(stt.get('subscriberCount', 0))
-            spy_data["channel_desc"] = snp.get('description', '-')
-            raw_kw = brd.get('keywords', '')
-            if raw_kw:
-                import shlex
-                try: spy_data["channel_keywords"] = shlex.split(raw_kw)
-                except: spy_data["channel_keywords"] = raw_kw.split(' ')
-            created_at_str = snp.get('publishedAt', '') 
-            if created_at_str:
-                created_date = datetime.strptime(created_at_str[:10], "%Y-%m-%d")
-                now = datetime.now()
-                spy_data["channel_age"] = round((now - created_date).days / 365, 1)
-                spy_data["channel_created"] = created_date.strftime("%Y-%m-%d")
-
-        live_req = youtube.search().list(part="id", channelId=channel_id, type="video", eventType="completed", order="viewCount", maxResults=3).execute()
-        spy_data["live_count"] = live_req.get('pageInfo', {}).get('totalResults', 0)
-        live_ids = [i['id']['videoId'] for i in live_req.get('items', [])]
-
-        reg_req = youtube.search().list(part="id", channelId=channel_id, type="video", order="viewCount", maxResults=3).execute()
-        spy_data["reguler_count"] = max(0, spy_data["total_video_count"] - spy_data["live_count"])
-        reg_ids = [i['id']['videoId'] for i in reg_req.get('items', [])]
-
-        all_ids_to_fetch = live_ids + reg_ids
-        details_map = get_videos_details_batch(youtube, all_ids_to_fetch)
-
-        for vid in live_ids:
-            if vid in details_map: spy_data["top_live_list"].append(details_map[vid])
-        for vid in reg_ids:
-            if vid in details_map: spy_data["top_reg_list"].append(details_map[vid])
-    except: return None
-    return spy_data
-
-@st.cache_data(ttl=600) 
-def search_viral_videos_fast(api_keys_list, keyword, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds):
-    # Jika keyword kosong, gunakan pencarian wildcard '*' agar tetap menemukan video populer
-    search_query = keyword if keyword.strip() != "" else "*"
-    
-    published_after = (datetime.now() - timedelta(days=days_back)).isoformat("T") + "Z"
-    all_video_items = []
-    next_page_token = None
-    pages_needed = (target_limit // 50) + (1 if target_limit % 50 > 0 else 0)
-    pages_fetched = 0
-    status_text = st.empty()
-    progress_bar = st.progress(0)
-    
-    while pages_fetched < pages_needed:
-        current_idx = st.session_state['current_key_index']
-        if current_idx >= len(api_keys_list): current_idx = 0
-        current_key = api_keys_list[current_idx].strip()
-        try:
-            youtube = build('youtube', 'v3', developerKey=current_key)
-            status_text.write(f"🔥 Scanning... {len(all_video_items)}/{target_limit} (Key #{current_idx+1})")
-            search_req = youtube.search().list(part="snippet", q=search_query, order="viewCount", publishedAfter=published_after, type="video", maxResults=50, pageToken=next_page_token)
-            search_res = search_req.execute()
-            items = search_res.get('items', [])
-            all_video_items.extend(items)
-            next_page_token = search_res.get('nextPageToken')
-            pages_fetched += 1
-            progress_bar.progress(min(len(all_video_items) / target_limit, 1.0))
-            if not next_page_token or len(all_video_items) >= target_limit: break
-        except HttpError as e:
-            if e.resp.status in [403, 429, 500, 503]:
-                new_index = (current_idx + 1) % len(api_keys_list)
-                st.session_state['current_key_index'] = new_index
-                if new_index == 0 and pages_fetched == 0:
-                    st.error("❌ SEMUA API KEY HABIS!")
-                    return [], 0
-                continue
-            else: break
-    
-    progress_bar.empty()
-    status_text.empty()
-    if not all_video_items: return [], 0
+        return batch_channel_spy(get_gateway(), get_metadata_cache(), api_keys_list, channel_ids, on_status=on_status, report=report, spy_cache=get_spy_cache(), ttl=ttl, force=force)
+    except:
+        return {}
+
+@st.cache_resource
+def get_result_cache():
+    # Hasil akhir scan & analisa SEO, dipakai bersama semua sesi dan kedua
+    # tab. Kunci = query ternormalisasi + window waktu yang dibulatkan + filter
+    # (tanpa API key), TTL 10 menit, dibatasi total ukuran memori.
+    return ResultCache()
+
+@st.cache_resource
+def get_job_runner():
+    # Scan & analisa jalan sebagai job di worker pool bersama semua sesi
+    # (batas job paralel: env YTINTEL_JOB_WORKERS). Script cuma submit job,
+    # polling statusnya, dan mengambil hasil di rerun setelah job selesai.
+    return JobRunner()
+
+def get_engines():
+    # Resource bersama diambil di thread script lalu dioper ke job: thread
+    # worker tidak punya konteks Streamlit
+    return get_gateway(), get_metadata_cache(), get_result_cache()
+
+def search_viral_videos_fast(job, engines, api_keys_list, keyword, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=None, slices=1):
+    # Cache hasil menyimpan superset kandidat scan (planner.new_superset):
+    # filter yang berubah cukup diterapkan ulang di sini, paling-paling
+    # melengkapi kandidat yang dulu dilewati planner. Durasi cuma ikut kunci
+    # lewat kategori videoDuration-nya.
+    gateway, metadata_cache, result_cache = engines
+    cache_key = result_key("scan", keyword, window_start(days_back), target_limit=target_limit, bucket=duration_bucket(min_total_seconds, max_total_seconds), slices=slices)
+    report = report if report is not None else {}
+    hit = result_cache.get(cache_key)
+    if hit:
+        # Refilter bukan hit cache murni: statistik pre-filter, planner &
+        # waktu per tahap milik run asal diganti punya run ini (melengkapi
+        # data + filter lokal), request API-nya tetap tercatat di telemetri
+        (superset, total, cached_report), age = hit
+        report.update(cached_report, cached_age=int(age), refiltered=True, detail_ids_skipped=0, detail_calls_saved=0, timings={})
+        report.pop('plan', None)
+        started = time.perf_counter()
+        superset, report['topped_up'] = scan.complete_superset(gateway, metadata_cache, api_keys_list, superset, max_subs, min_views, min_total_seconds, max_total_seconds, report)
+        if report['topped_up']: result_cache.put(cache_key, (superset, total, cached_report))
+        scan.add_timing(report, 'top_up', started)
+        started = time.perf_counter()
+        report['details_skipped'], report['channels_skipped'] = planner.skipped(superset)
+        rows, _ = scan.select_rows(superset, superset['order'], max_subs, min_views, min_total_seconds, max_total_seconds)
+        df = results.to_frame(rows).sort_values(by='Durasi Detik', ascending=False)
+        scan.add_timing(report, 'rows', started)
+        return df, total
+
+    def on_progress(total_scanned, target_limit, key_idx):
+        job.update(total_scanned / target_limit, f"🔥 Scanning... {total_scanned}/{target_limit} ({key_label(key_idx, slices)})")
+
+    # Tiap halaman langsung jadi frame bertipe (tanpa deskripsi & tags),
+    # jadi list dict per baris tidak pernah menumpuk sampai ukuran BRUTAL.
+    # Frame sementara ditampilkan UI sebagai tabel live.
+    superset = planner.new_superset()
+    frames, total = [], 0
+    for rows, total in scan.iter_viral_videos(gateway, metadata_cache, api_keys_list, keyword, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=report, on_progress=on_progress, slices=slices, superset=superset):
+        if not rows: continue
+        frames.append(results.to_frame(rows))
+        job.update(partial=results.concat_frames(frames))
+    final_df = results.concat_frames(frames).sort_values(by='Durasi Detik', ascending=False)
+
+    if superset['order']:
+        result_cache.put(cache_key, (superset, total, dict(report)))
+    return final_df, total
+
+def format_age(seconds):
+    return f"{seconds // 60}m {seconds % 60}d" if seconds >= 60 else f"{seconds}d"
+
+def key_label(key_idx, slices):
+    # Ronde time-sliced (key_idx None) bisa pakai beberapa key sekaligus
+    return f"Key #{key_idx+1}" if key_idx is not None else f"{slices} sub-window paralel"
+
+def slice_note(report):
+    n = report.get('time_slices', 1)
+    return f" | 🕒 Time slicing: {n} sub-window waktu paralel" if n > 1 else ""
+
+def prefilter_note(report):
+    # Hemat dari videoDuration di search.list tidak bisa dihitung (video di
+    # luar kategori tidak pernah dikembalikan); yang dihitung cuma refresh
+    # statistik video cache yang durasinya pasti gagal.
+    bucket = f"search.list videoDuration={report.get('duration_bucket', 'any')} | " if 'duration_bucket' in report else ""
+    return (f"⏱️ Pre-filter durasi: {bucket}{report.get('detail_ids_skipped', 0)} video cache gagal durasi tidak di-refresh "
+            f"({report.get('detail_calls_saved', 0)} call videos.list hemat){slice_note(report)}")
+
+PLAN_LABELS = {planner.CHANNELS_FIRST: "subs dulu", planner.VIDEOS_FIRST: "detail dulu"}
+
+def plan_note(report):
+    # Ringkasan query planner (urutan enrichment + data yang tidak perlu di-fetch).
+    # Refilter tidak menjalankan planner: urutan run asal tidak ditampilkan
+    plan = report.get('plan') or report.get('plan_order')
+    if report.get('refiltered'): order = "tidak dijalankan (refilter data scan bersama)"
+    elif isinstance(plan, dict): order = ", ".join(f"{PLAN_LABELS[o]} {n} hlm" for o, n in plan.items() if n) or "-"
+    else: order = PLAN_LABELS.get(plan, "tanpa filter subs, channel tidak di-fetch")
+    return f"🧭 Planner: {order} | {report.get('details_skipped', 0)} detail video & {report.get('channels_skipped', 0)} channel tidak perlu di-fetch"
+
+def reuse_note(report):
+    topped = report.get('topped_up')
+    return f"{topped} ID yang dulu dilewati planner dilengkapi lewat API." if topped else "tanpa kuota API."
+
+def split_keywords(raw):
+    return list(dict.fromkeys(k.strip() for k in raw.split('\n') if k.strip()))
+
+def search_viral_videos_batch(job, engines, api_keys_list, keywords, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=None, slices=1):
+    # Multi keyword: search semua keyword paralel, detail & channel di-fetch
+    # sekali untuk gabungan ID-nya. Return (frame unik + kolom Keyword, total)
+    gateway, metadata_cache, result_cache = engines
+    cache_key = result_key("scan_batch", keywords, window_start(days_back), max_subs=max_subs, min_views=min_views, target_limit=target_limit, min_sec=min_total_seconds, max_sec=max_total_seconds, slices=slices)
+    report = report if report is not None else {}
+    hit = result_cache.get(cache_key)
+    if hit:
+        (df, total, cached_report), age = hit
+        report.update(cached_report, cached_age=int(age))
+        return df, total
+    rows_by_kw = batch.batch_scan(gateway, metadata_cache, api_keys_list, keywords, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=report, on_status=lambda text: job.update(message=f"🔥 {text}"), slices=slices)
+    df = results.to_frame(batch.merge_scan_rows(rows_by_kw)).sort_values(by='Durasi Detik', ascending=False)
+    if len(df):
+        result_cache.put(cache_key, (df, report.get('total_scanned', 0), dict(report)))
+    return df, report.get('total_scanned', 0)
+
+def scan_job(job, engines, api_keys_list, multi, keyword, keywords, mode, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, slices=1):
+    # Jalan di thread worker (JobRunner): tanpa st.*, hasil dikembalikan ke UI
+    gateway, metadata_cache, _ = engines
+    report = {}
+    trace = telemetry.ScanTrace("scan_batch" if multi else "scan", keyword, metadata_cache=metadata_cache, etags=gateway.etags)
+    with telemetry.tracing(trace), cancellation(job.update):
+        if multi:
+            data, total = search_viral_videos_batch(job, engines, api_keys_list, keywords, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=report, slices=slices)
+        else:
+            data, total = search_viral_videos_fast(job, engines, api_keys_list, keyword, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=report, slices=slices)
+    record = finish_trace(trace, [report.get('timings')], report, results=len(data), mode=mode, slices=slices)
+    return {"data": data, "total": total, "report": report, "trace": record}
 
-    active_key = api_keys_list[st.session_state['current_key_index']].strip()
-    youtube = build('youtube', 'v3', developerKey=active_key)
-    
-    channel_ids = list(set([item['snippet']['channelId'] for item in all_video_items]))
-    subs_map = {}
-    for i in range(0, len(channel_ids), 50):
-        chunk = channel_ids[i:i+50]
-        try:
-            c_res = youtube.channels().list(part="statistics", id=','.join(chunk)).execute()
-            for item in c_res.get('items', []):
-                val = item['statistics']['hiddenSubscriberCount']
-                subs_map[item['id']] = 0 if val else int(item['statistics']['subscriberCount'])
-        except: pass
-
-    ids_to_check = [v['id']['videoId'] for v in all_video_items if subs_map.get(v['snippet']['channelId'], 0) < max_subs] if max_subs > 0 else [v['id']['videoId'] for v in all_video_items]
-    ids_to_check = ids_to_check[:1000]
-    
-    final_data = []
-    if ids_to_check:
-        check_msg = st.empty()
-        for i in range(0, len(ids_to_check), 50):
-            chunk = ids_to_check[i:i+50]
-            check_msg.caption(f"🕵️ Filter Detail Video... {i}/{len(ids_to_check)}")
-            try:
-                v_res = youtube.videos().list(part="snippet,statistics,contentDetails", id=','.join(chunk)).execute()
-                for item in v_res['items']:
-                    stats = item['statistics']
-                    snippet = item['snippet']
-                    content = item['contentDetails']
-                    views = int(stats.get('viewCount', 0))
-                    duration_sec = parse_duration(content['duration'])
-                    
-                    # LOGIKA FILTER DURASI (MIN & MAKS)
-                    if not (min_total_seconds <= duration_sec <= max_total_seconds): 
-                        continue
-                        
-                    if views < min_views: continue
-                    eng_rate = ((int(stats.get('likeCount', 0)) + int(stats.get('commentCount', 0))) / views * 100) if views > 0 else 0
-                    tags_list = snippet.get('tags', [])
-                    final_data.append({
-                        "Thumbnail": snippet['thumbnails']['high']['url'],
-                        "Judul Video": html.unescape(snippet['title']),
-                        "Channel": html.unescape(snippet['channelTitle']),
-                        "ChannelId": snippet['channelId'],
-                        "Subs": subs_map.get(snippet['channelId'], 0),
-                        "Views": views,
-                        "Engagement": round(eng_rate, 2),
-                        "Durasi": format_duration_human(duration_sec),
-                        "Durasi Detik": duration_sec,
-                        "Tags List": tags_list,
-                        "Deskripsi": html.unescape(snippet.get('description', "")),
-                        "Link": f"https://www.youtube.com/watch?v={item['id']}",
-                        "VideoId": item['id']
-                    })
-            except: pass
-        check_msg.empty()
-    return final_data, len(all_video_items)
+def load_scan_text(api_keys_list, video_ids):
+    # Deskripsi & tags baris hasil scan (tidak disimpan di frame hasil)
+    return results.load_text(get_gateway(), get_metadata_cache(), api_keys_list, video_ids)
 
 # ==========================================
-# 5. NEW: ANALISA SEO VIRAL (PURE STATS & MAX VOLUME)
+# JOB BACKGROUND (SUBMIT, POLLING, AMBIL HASIL)
 # ==========================================
+JOB_POLL_SECONDS = 1.0
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_monitor(state_key, label, live_cols=None):
+    # Cuma fragment ini yang di-rerun tiap detik selama job jalan; begitu job
+    # selesai, seluruh halaman di-rerun supaya hasilnya diambil take_job_result
+    runner = get_job_runner()
+    job = runner.get(st.session_state.get(state_key))
+    if job is None: return
+    if job.finished: st.rerun()
+    if job.status == "queued":
+        st.info(f"⏳ {label} menunggu worker ({runner.queue_position(job)} job di depan, maks {runner.max_workers} job paralel).")
+    else:
+        st.progress(job.progress or 0.0, text=job.message or f"{label} berjalan...")
+    c_info, c_cancel = st.columns([3, 1])
+    c_info.caption(f"🧵 Job {job.id} | {job.elapsed():.0f} dtk | boleh ubah widget lain, scan tetap jalan.")
+    if job.cancel_requested:
+        c_cancel.caption("⏹️ Membatalkan...")
+    elif c_cancel.button("⏹️ Batalkan", key=f"cancel_{state_key}", use_container_width=True):
+        job.cancel()
+        st.rerun()
+    partial = job.partial
+    if live_cols and partial is not None:
+        st.dataframe(partial[live_cols], use_container_width=True, hide_index=True)
+
+def submit_job(state_key, kind, label, fn, *args):
+    # Satu job aktif per tab per sesi: job lama yang masih jalan dibatalkan
+    runner = get_job_runner()
+    runner.cancel(st.session_state.get(state_key))
+    st.session_state[state_key] = runner.submit(kind, label, fn, *args).id
+
+def take_job_result(state_key, label, live_cols=None):
+    # Return job.result sekali saat job selesai (lalu job dilepas dari runner);
+    # selama job jalan tampilkan progress & tombol batal, return None
+    runner = get_job_runner()
+    job_id = st.session_state.get(state_key)
+    if not job_id: return None
+    job = runner.get(job_id)
+    if job is None:
+        del st.session_state[state_key]
+        return None
+    if not job.finished:
+        job_monitor(state_key, label, live_cols)
+        return None
+    runner.release(job_id)
+    del st.session_state[state_key]
+    if job.status == "failed": st.error(f"❌ {label} gagal: {job.error}")
+    elif job.status == "cancelled": st.info(f"⏹️ {label} dibatalkan.")
+    return job.result if job.status == "done" else None
 
-def backfill_one_word_keywords(tag_stats, min_freq=3):
-    existing_1_word = set()
-    for k, v in tag_stats.items():
-        if v['len'] == 1:
-            existing_1_word.add(k)
-
-    stopwords = {'and', 'the', 'with', 'for', 'you', 'from', 'in', 'on', 'at', 'to', 'of', 'by', 'my', 'is', 'a', 'it', 'video', 'videos', 'lyric', 'lyrics', 'official', 'hd', '4k', 'mv'}
-
-    new_entries = {}
-
-    for k, v in tag_stats.items():
-        # Only process if parent meets frequency criteria
-        if (v['len'] == 2 or v['len'] == 3) and v['count'] >= min_freq: 
-            words = k.split()
-            for w in words:
-                w_clean = w.strip()
-                if len(w_clean) > 2 and w_clean not in stopwords and w_clean not in existing_1_word:
-                    if w_clean in new_entries:
-                        avg_v_new = v['total_views'] // v['count']
-                        avg_v_old = new_entries[w_clean]['total_views'] // new_entries[w_clean]['count']
-                        if avg_v_new > avg_v_old:
-                            new_entries[w_clean] = {
-                                'count': v['count'], 
-                                'total_views': v['total_views'], 
-                                'total_likes': v['total_likes'], 
-                                'len': 1 
-                            }
-                    else:
-                        new_entries[w_clean] = {
-                            'count': v['count'], 
-                            'total_views': v['total_views'], 
-                            'total_likes': v['total_likes'], 
-                            'len': 1
-                        }
-                    
-    final_stats = tag_stats.copy()
-    final_stats.update(new_entries)
-    return final_stats
-
-def analyze_viral_seo(api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters):
-    
-    # FRESH STATS
-    debug_stats = {
-        'total_found_search': 0,
-        'blocked_duration': 0,
-        'blocked_views': 0,
-        'blocked_subs': 0,
-        'passed_final': 0,
-        'auto_rescued': False,
-        'unique_channels_count': 0,
-        'total_videos_processed': 0,
-        'real_total_views': 0,
-        'yt_key_line': 0
-    }
-    
-    tag_stats = {} 
-
-    target_counts = []
-    if "1 Kata" in length_filters: target_counts.append(1)
-    if "2 Kata" in length_filters: target_counts.append(2)
-    if "3+ Kata" in length_filters: target_counts.append(3)
-    if not target_counts: target_counts = [1, 2, 3]
-
-    # --- BOOSTED FETCH COUNT FOR "LOW RESULT" FIX ---
-    if mode_research == "🌱 Hemat":
-        target_fetch_count = 200 # Up from 100
-    elif mode_research == "⚖️ Sedang":
-        target_fetch_count = 500 # Up from 250
-    elif mode_research == "🔥 Agresif":
-        target_fetch_count = 1000 # Up from 450
-    else: # BRUTAL / GOD MODE
-        target_fetch_count = 1500 # Massive
-
-    published_after = (datetime.now() - timedelta(days=days_back)).isoformat("T") + "Z"
-    
-    idx = st.session_state['current_key_index']
-    if idx >= len(api_keys_list): idx = 0
-    
-    # KEY ROTATION LOGIC
-    raw_items = []
-    video_ids = []
-    next_page_token = None
-    
-    while len(raw_items) < target_fetch_count:
-        if idx >= len(api_keys_list): idx = 0
-        active_key = api_keys_list[idx].strip()
-        youtube = build('youtube', 'v3', developerKey=active_key)
-        
-        try:
-            search_req = youtube.search().list(
-                part="id,snippet", 
-                q=title_query, 
-                order="viewCount", 
-                publishedAfter=published_after, 
-                type="video", 
-                maxResults=50, 
-                pageToken=next_page_token
-            )
-            search_res = search_req.execute()
-            items = search_res.get('items', [])
-            
-            if not items: break
-            
-            raw_items.extend(items)
-            next_page_token = search_res.get('nextPageToken')
-            
-            if not next_page_token: break
-            
-        except HttpError as e:
-            if e.resp.status in [403, 429]:
-                idx = (idx + 1) % len(api_keys_list)
-                st.session_state['current_key_index'] = idx
-                continue
-            else:
-                break 
-    
-    video_ids = [item['id']['videoId'] for item in raw_items]
-    debug_stats['total_found_search'] = len(video_ids)
-    debug_stats['yt_key_line'] = idx + 1 
-
-    if not video_ids: 
-        return [], debug_stats
-
-    # DETAILS FETCHING (ROTATION AWARE)
-    valid_items_stage1 = []
-    channel_ids_to_check = []
-    
-    for i in range(0, len(video_ids), 50):
-        chunk_ids = video_ids[i:i+50]
-        max_retries = len(api_keys_list)
-        attempts = 0
-        success = False
-        
-        while attempts < max_retries and not success:
-            if idx >= len(api_keys_list): idx = 0
-            active_key = api_keys_list[idx].strip()
-            youtube = build('youtube', 'v3', developerKey=active_key)
-            
-            try:
-                vid_res = youtube.videos().list(
-                    part="snippet,statistics,contentDetails", id=','.join(chunk_ids)
-                ).execute()
-                
-                for item in vid_res.get('items', []):
-                    stats = item['statistics']
-                    content = item['contentDetails']
-                    views = int(stats.get('viewCount', 0))
-                    dur_sec = parse_duration(content['duration'])
-                    
-                    if dur_sec < min_duration_sec: 
-                        debug_stats['blocked_duration'] += 1
-                        continue
-                    if views < min_views: 
-                        debug_stats['blocked_views'] += 1
-                        continue
-                    
-                    valid_items_stage1.append(item)
-                    channel_ids_to_check.append(item['snippet']['channelId'])
-                success = True
-            except HttpError as e:
-                if e.resp.status in [403, 429]:
-                    idx = (idx + 1) % len(api_keys_list)
-                    st.session_state['current_key_index'] = idx
-                    attempts += 1
-                else:
-                    break
-
-    if not valid_items_stage1: return [], debug_stats
-    
-    # CHANNEL FETCHING (ROTATION AWARE)
-    subs_map = {}
-    unique_chans = list(set(channel_ids_to_check))
-    
-    for i in range(0, len(unique_chans), 50):
-        chunk = unique_chans[i:i+50]
-        max_retries = len(api_keys_list)
-        attempts = 0
-        success = False
-        
-        while attempts < max_retries and not success:
-            if idx >= len(api_keys_list): idx = 0
-            active_key = api_keys_list[idx].strip()
-            youtube = build('youtube', 'v3', developerKey=active_key)
-            
-            try:
-                c_res = youtube.channels().list(part="statistics", id=','.join(chunk)).execute()
-                for c_item in c_res.get('items', []):
-                    if c_item['statistics'].get('hiddenSubscriberCount'):
-                        subs_map[c_item['id']] = 0
-                    else:
-                        subs_map[c_item['id']] = int(c_item['statistics'].get('subscriberCount', 0))
-                success = True
-            except HttpError as e:
-                if e.resp.status in [403, 429]:
-                    idx = (idx + 1) % len(api_keys_list)
-                    st.session_state['current_key_index'] = idx
-                    attempts += 1
-                else:
-                    break
-
-    items_to_process = []
-    items_rescued_from_subs = [] 
-
-    for item in valid_items_stage1:
-        cid = item['snippet']['channelId']
-        subs = subs_map.get(cid, 0) 
-        
-        if max_subs > 0:
-            if subs > max_subs:
-                debug_stats['blocked_subs'] += 1
-                items_rescued_from_subs.append(item) 
-                continue
-        
-        debug_stats['passed_final'] += 1
-        items_to_process.append(item)
-
-    if len(items_to_process) == 0 and len(items_rescued_from_subs) > 0:
-        items_to_process = items_rescued_from_subs
-        debug_stats['auto_rescued'] = True 
-        debug_stats['passed_final'] = len(items_rescued_from_subs)
-
-    unique_channels_final = set()
-    real_total_views_accumulated = 0 
-
-    for item in items_to_process:
-        unique_channels_final.add(item['snippet']['channelId'])
-        real_total_views_accumulated += int(item['statistics'].get('viewCount', 0))
-
-    debug_stats['unique_channels_count'] = len(unique_channels_final)
-    debug_stats['total_videos_processed'] = len(items_to_process)
-    debug_stats['real_total_views'] = real_total_views_accumulated 
-
-    for item in items_to_process:
-        views = int(item['statistics'].get('viewCount', 0))
-        likes = int(item['statistics'].get('likeCount', 0))
-        tags = item['snippet'].get('tags', [])
-        title_words = re.findall(r'\w+', item['snippet']['title'].lower())
-        
-        all_keywords = tags + [w for w in title_words if len(w) > 3]
-        
-        for tag in all_keywords:
-            tag_clean = tag.lower().strip()
-            
-            technical_junk = ['hd', '4k', '1080p', 'hq', 'official video', 'lyric video', 'official audio']
-            if any(junk in tag_clean for junk in technical_junk): continue
-
-            word_len = len(tag_clean.split())
-            
-            is_valid_len = False
-            if word_len == 1 and 1 in target_counts: is_valid_len = True
-            elif word_len == 2 and 2 in target_counts: is_valid_len = True
-            elif word_len >= 3 and 3 in target_counts: is_valid_len = True
-            
-            if not is_valid_len: continue
-
-            if tag_clean not in tag_stats:
-                tag_stats[tag_clean] = {'count': 0, 'total_views': 0, 'total_likes': 0, 'len': word_len}
-            
-            tag_stats[tag_clean]['count'] += 1
-            tag_stats[tag_clean]['total_views'] += views
-            tag_stats[tag_clean]['total_likes'] += likes
-
-    # === 1. FILTER FREKUENSI (MIN 3 VIDEO) ===
-    tag_stats = {k: v for k, v in tag_stats.items() if v['count'] >= 3}
+# ==========================================
+# TELEMETRI SCAN (PANEL + FILE METRICS)
+# ==========================================
+def finish_trace(trace, timings, report, **extra):
+    # Hit cache murni membawa timings run lamanya, tidak dihitung. Refilter
+    # superset (report['refiltered']) dicatat terpisah: timings & request
+    # API-nya milik run ini.
+    cached = report.get('cached_age') is not None and not report.get('refiltered')
+    if not cached:
+        for t in timings: trace.add_stages(t)
+    return trace.finish(cached=cached, refiltered=bool(report.get('refiltered')), **extra)
+
+def flush_trace(state_key, render_started):
+    # Tahap render diukur sekali (di run yang sama dengan scan-nya), baru
+    # record ditulis ke file metrics; rerun berikutnya tidak menulis ulang
+    record = st.session_state.get(state_key)
+    if record and 'render' not in record['stages']:
+        telemetry.write_metrics(telemetry.add_render(record, time.perf_counter() - render_started))
+        load_latency_summary.clear()
+    return record
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_latency_summary():
+    return telemetry.latency_summary(telemetry.read_metrics())
+
+def render_telemetry(record):
+    with st.expander(f"📈 Telemetri: {record['wall_s']:.2f} dtk | {record['calls']} call API / {record['units']:,} unit kuota"):
+        if record.get('cached'):
+            st.caption("⚡ Dari cache hasil bersama: tidak ada request API.")
+        elif record.get('refiltered'):
+            st.caption(f"♻️ Refilter data scan bersama: {record['calls']} request API untuk melengkapi data, waktu per tahap milik run ini.")
+        c_stage, c_api = st.columns(2)
+        with c_stage:
+            st.markdown("**Waktu per tahap**")
+            stages = record['stages']
+            total_s = sum(stages.values()) or 1
+            st.dataframe(pd.DataFrame([{"Tahap": k, "Detik": round(v, 3), "%": round(v / total_s * 100, 1)} for k, v in stages.items()]), use_container_width=True, hide_index=True)
+        with c_api:
+            st.markdown("**Request API per endpoint**")
+            if record['endpoints']:
+                st.dataframe(pd.DataFrame([{"Endpoint": k, "Call": v['calls'], "Unit": v['units'], "304": v['not_modified'], "Rotasi": v['rotated'], "Error": v['errors']} for k, v in record['endpoints'].items()]), use_container_width=True, hide_index=True)
+            if record['keys']:
+                st.dataframe(pd.DataFrame([{"Key": k, "Call": v['calls'], "Unit": v['units'], "Rotasi": v['rotated']} for k, v in record['keys'].items()]), use_container_width=True, hide_index=True)
+        meta, etag = record['cache'].get('metadata', {}), record['cache'].get('etag', {})
+        st.caption(f"🗄️ Cache metadata: {meta.get('hits', 0)} hit / {meta.get('stale', 0)} refresh / {meta.get('misses', 0)} miss ({meta.get('hit_rate', 0)}%) | "
+                   f"🏷️ ETag 304: {etag.get('not_modified', 0)} dari {etag.get('not_modified', 0) + etag.get('modified', 0)} ({etag.get('hit_rate', 0)}%) | "
+                   f"🔁 Rotasi key: {record['rotations']} | ⛔ Key habis: {record['exhausted']}")
+        summary = load_latency_summary().get(record['kind'])
+        if summary:
+            st.caption(f"📊 {record['kind']}: p50 {summary['p50']} dtk / p95 {summary['p95']} dtk dari {summary['n']} run terakhir (tanpa hit cache & refilter), rata-rata {summary['units_avg']:,} unit | {telemetry.METRICS_FILE}")
 
-    # === 2. BACKFILL ===
-    tag_stats = backfill_one_word_keywords(tag_stats, min_freq=3)
+# ==========================================
+# 5. NEW: ANALISA SEO VIRAL (PURE STATS & MAX VOLUME)
+# ==========================================
 
-    results = []
-    # Stopwords minimal
-    stopwords = ['and', 'the', 'with', 'for', 'you', 'from', 'in', 'on', 'at', 'to', 'of', 'by', 'my', 'is', 'a', 'it', 'video', 'videos', 'lyric', 'lyrics', 'official', 'hd', '4k']
-    
-    for tag, data in tag_stats.items():
-        if tag in stopwords: continue
-        
-        freq = data['count']
-        avg_views = data['total_views'] / freq
-        avg_likes = data['total_likes'] / freq
-        
-        score_view = min((avg_views / 50000) * 40, 40)
-        score_freq = min(freq * 10, 30)
-        score_eng = min((avg_likes / (avg_views+1) * 100) * 10, 30)
-        final_score = score_view + score_freq + score_eng
-        
-        cat_text = "1 Kata"
-        if data['len'] == 2: cat_text = "2 Kata"
-        elif data['len'] >= 3: cat_text = "3+ Kata"
-
-        results.append({
-            "Jenis": cat_text,
-            "Kata Kunci": tag,
-            "Muncul di Video": freq,
-            "Rata-rata Views": int(avg_views),
-            "Engagement Score": round(score_eng, 1),
-            "Skor Viral": round(final_score, 1),
-            "word_count_raw": data['len']
-        })
-        
-    return results, debug_stats
+def analyze_viral_seo(job, engines, api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, adaptive=False, stability_threshold=0.9, stability_pages=2, top_n=20, slices=1):
+    gateway, metadata_cache, result_cache = engines
+    on_progress = lambda found, target, key_idx: job.update(found / target, f"🔍 Search {found}/{target} video ({key_label(key_idx, slices)})")
+    if not adaptive:
+        # Non-adaptif: cache menyimpan superset (seo.search_candidates), filter
+        # & agregasi keyword diterapkan ulang tiap kali; API cuma dipakai untuk
+        # melengkapi kandidat yang dulu dilewati planner
+        cache_key = result_key("seo", title_query, window_start(days_back), bucket=duration_bucket(min_duration_sec), mode=mode_research, slices=slices)
+        hit = result_cache.get(cache_key)
+        if hit:
+            superset, age = hit
+            top_up = {'timings': {}}
+            started = time.perf_counter()
+            superset, top_up['topped_up'] = seo.complete_superset(gateway, metadata_cache, api_keys_list, superset, max_subs, min_views, min_duration_sec, report=top_up)
+            if top_up['topped_up']: result_cache.put(cache_key, superset)
+            scan.add_timing(top_up, 'top_up', started)
+            res, debug = seo.refilter(superset, max_subs, min_views, min_duration_sec, length_filters, top_up=top_up)
+            return res, {**debug, 'cached_age': int(age)}
+        superset = seo.search_candidates(gateway, metadata_cache, api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, on_progress, slices)
+        if superset['order']: result_cache.put(cache_key, superset)
+        return seo.refilter(superset, max_subs, min_views, min_duration_sec, length_filters)
+    # Mode adaptif: jumlah halaman bergantung filter, hasil akhirnya yang di-cache
+    cache_key = result_key("seo_adaptive", title_query, window_start(days_back), max_subs=max_subs, min_views=min_views, min_sec=min_duration_sec, mode=mode_research, lengths=tuple(sorted(length_filters)), slices=slices,
+                           threshold=stability_threshold, pages=stability_pages, top_n=top_n)
+    hit = result_cache.get(cache_key)
+    if hit:
+        (res, debug), age = hit
+        return res, {**debug, 'cached_age': int(age)}
+    res, debug = seo.analyze_viral_seo(gateway, metadata_cache, api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, adaptive=adaptive, stability_threshold=stability_threshold, stability_pages=stability_pages, top_n=top_n, on_progress=on_progress, slices=slices)
+    if res: result_cache.put(cache_key, (res, debug))
+    return res, debug
+
+def batch_analyze_viral_seo(job, engines, api_keys_list, queries, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, report=None, slices=1):
+    gateway, metadata_cache, result_cache = engines
+    cache_key = result_key("seo_batch", queries, window_start(days_back), max_subs=max_subs, min_views=min_views, min_sec=min_duration_sec, mode=mode_research, lengths=tuple(sorted(length_filters)), slices=slices)
+    report = report if report is not None else {}
+    hit = result_cache.get(cache_key)
+    if hit:
+        (out, cached_report), age = hit
+        report.update(cached_report, cached_age=int(age))
+        return out
+    out = batch.batch_analyze_viral_seo(gateway, metadata_cache, api_keys_list, queries, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, report=report, on_status=lambda text: job.update(message=f"🔍 {text}"), slices=slices)
+    if any(res for res, _ in out.values()): result_cache.put(cache_key, (out, dict(report)))
+    return out
+
+def seo_job(job, engines, api_keys_list, multi, query, queries, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, adaptive, stability_threshold, slices=1):
+    # Jalan di thread worker (JobRunner). Mode adaptif tidak dipakai di multi
+    # keyword: semua query di-paginate bareng supaya enrichment bisa digabung
+    gateway, metadata_cache, _ = engines
+    trace = telemetry.ScanTrace("seo_batch" if multi else "seo", query, metadata_cache=metadata_cache, etags=gateway.etags)
+    out = {"batch": None, "batch_report": {}}
+    with telemetry.tracing(trace), cancellation(job.update):
+        if multi:
+            out["batch"] = batch_analyze_viral_seo(job, engines, api_keys_list, queries, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, report=out["batch_report"], slices=slices)
+            out["results"], out["debug"] = next(iter(out["batch"].values()))
+        else:
+            out["results"], out["debug"] = analyze_viral_seo(job, engines, api_keys_list, query, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, adaptive=adaptive, stability_threshold=stability_threshold, slices=slices)
+    if multi:
+        out["trace"] = finish_trace(trace, [out["batch_report"].get('timings')] + [d.get('timings') for _, d in out["batch"].values()], out["batch_report"],
+                                    results=sum(len(r) for r, _ in out["batch"].values()), mode=mode_research, slices=slices)
+    else:
+        out["trace"] = finish_trace(trace, [out["debug"].get('timings')], out["debug"], results=len(out["results"]), mode=mode_research, slices=slices)
+    return out
 
 # ==========================================
 # 6. SIDEBAR
@@ -702,14 +543,30 @@ with st.sidebar:
         if api_keys_list: st.markdown(f'<div class="key-status status-ok">✅ {len(api_keys_list)} YT Key Ready.</div>', unsafe_allow_html=True)
         else: st.warning("⚠️ Masukkan YT Key dulu.")
 
+        # Estimasi sisa kuota per key (reset tengah malam waktu Pasifik)
+        for k in get_gateway().scheduler.snapshot(api_keys_list):
+            status = "⏸️ cooldown" if k['cooling_down'] else f"{k['headroom']:,} unit"
+            st.markdown(f"<div class='key-count'>Key #{k['key_line']}: {status}</div>", unsafe_allow_html=True)
+
+        c_stats = get_metadata_cache().stats()
+        st.caption(f"🗄️ Cache metadata: {c_stats['hits']:,} hit / {c_stats['stale']:,} refresh / {c_stats['misses']:,} miss ({c_stats['hit_rate']}%)")
+        r_stats = get_result_cache().stats()
+        if r_stats['entries']:
+            st.caption(f"⚡ Cache hasil: {r_stats['entries']} scan ({r_stats['mb']} MB) | {r_stats['hits']:,} hit / {r_stats['misses']:,} miss")
+        j_stats = get_job_runner().stats()
+        if j_stats['running'] or j_stats['queued']:
+            st.caption(f"🧵 Job: {j_stats['running']} jalan / {j_stats['queued']} antri (maks {j_stats['workers']} paralel, semua sesi)")
+        e_stats = get_gateway().etags.stats()
+        if e_stats['conditional']:
+            st.caption(f"🏷️ ETag: {e_stats['not_modified']:,} dari {e_stats['conditional']:,} request kondisional dijawab 304 ({e_stats['bytes_saved'] / 1024:,.0f} KB tidak di-download ulang)")
+
     with st.expander("🚀 Mode Scan", expanded=True):
-        scan_mode = st.radio("Kekuatan:", ("🌱 Hemat", "⚖️ Sedang", "🔥 Agresif", "☠️ BRUTAL"), index=st.session_state['scan_mode_idx'], key="widget_scan_mode", on_change=auto_save)
-        if "Hemat" in scan_mode: target_limit = 50
-        elif "Sedang" in scan_mode: target_limit = 150
-        elif "Agresif" in scan_mode: target_limit = 500
-        else:
-            target_limit = 2000
+        scan_mode = st.radio("Kekuatan:", tuple(scan.SCAN_LIMITS), index=st.session_state['scan_mode_idx'], key="widget_scan_mode", on_change=auto_save)
+        target_limit = scan.SCAN_LIMITS[scan_mode]
+        if "BRUTAL" in scan_mode:
             st.markdown('<div class="brutal-warning">⚠️ AWAS: Boros Kuota!</div>', unsafe_allow_html=True)
+        time_slices = st.slider("Time Slicing (sub-window):", 1, MAX_TIME_SLICES, initial_config["saved_time_slices"], key="widget_time_slices", on_change=auto_save,
+                                help="Rentang umur video dipecah jadi beberapa sub-window yang di-search paralel, jadi sample bisa lewat batas ±500 hasil per query search. Kuota search per halaman tetap sama.")
 
     st.divider()
     st.subheader("⏳ Filter Durasi (Range)")
@@ -736,6 +593,7 @@ with st.sidebar:
         max_subs = st.number_input("Maks. Subs", 0, value=initial_config["saved_max_subs"], step=10000, key="widget_max_subs", on_change=auto_save)
         min_views = st.number_input("Min. Views", 0, value=initial_config["saved_min_views"], step=500, key="widget_min_views", on_change=auto_save)
         days_back = st.slider("Umur Video", 1, 30, initial_config["saved_days_back"], key="widget_days_back", on_change=auto_save)
+        spy_ttl_hours = st.number_input("Cache Spy (jam)", 1, 720, initial_config["saved_spy_ttl_hours"], key="widget_spy_ttl", on_change=auto_save, help="Hasil Channel Spy yang lebih muda dari ini dipakai ulang tanpa kuota.")
 
     st.divider()
     with st.expander("🕒 Riwayat Pencarian", expanded=True):
@@ -750,8 +608,8 @@ with st.sidebar:
                 with c1:
                     st.markdown(f"<div class='hist-item'><span class='hist-mode'>{item['mode']}</span>{item['query']}</div>", unsafe_allow_html=True)
                 with c2:
-                    if st.button("❌", key=f"del_h_{i}"):
-                        delete_search_log(index=i)
+                    if st.button("❌", key=f"del_h_{item['id']}"):
+                        delete_search_log(log_id=item['id'])
                         st.rerun()
         else:
             st.caption("Belum ada riwayat.")
@@ -769,50 +627,123 @@ tab1, tab2 = st.tabs(["🕵️  Cari & Spy Metadata", "⚖️  Analisa Keyword V
 
 with tab1:
     c1, c2 = st.columns([3, 1])
-    with c1: keyword_vid = st.text_input("Topik Video:", placeholder="Kosongkan untuk scan global berdasarkan filter...")
+    with c1:
+        multi_scan = st.toggle("📚 Multi Keyword", key="scan_multi", help="Scan banyak keyword sekaligus; detail video & channel yang sama cukup diambil sekali.")
+        if multi_scan:
+            scan_keywords = split_keywords(st.text_area("Topik Video (satu per baris):", placeholder="lofi music\nrelaxing piano\nrain sounds", key="scan_keywords"))
+            keyword_vid = ", ".join(scan_keywords)
+        else:
+            keyword_vid = st.text_input("Topik Video:", placeholder="Kosongkan untuk scan global berdasarkan filter...")
     with c2: 
         st.write("")
         st.write("")
         if st.button("🔎 Scan Data", type="primary", use_container_width=True):
             save_search_log(keyword_vid, "Metadata")
-            
-            for key in list(st.session_state.keys()):
-                if key.startswith("spy_data_") or key.startswith("meta_"): del st.session_state[key]
-            
-            data, total = search_viral_videos_fast(
-                api_keys_list, 
-                keyword_vid, 
-                max_subs, 
-                min_views, 
-                days_back, 
-                target_limit, 
-                min_total_seconds,
-                max_total_seconds
-            )
-            st.session_state['search_results'] = data
-            st.session_state['total_scanned'] = total
-            download_history = load_history()
+            submit_job('scan_job', "scan", "Scan", scan_job, get_engines(), list(api_keys_list), multi_scan, keyword_vid, scan_keywords if multi_scan else [], scan_mode,
+                       max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, time_slices)
+
+    # Hasil job scan diambil di rerun pertama setelah job selesai; selama
+    # masih jalan, progress + tabel live tampil di sini
+    scan_out = take_job_result('scan_job', "Scan", live_cols=['Judul Video', 'Views', 'Durasi', 'Engagement', 'Subs'])
+    if scan_out:
+        for key in list(st.session_state.keys()):
+            if key.startswith("spy_data_") or key.startswith("meta_") or key in ("editor_page", "spy_report", "scan_kw_filter"): del st.session_state[key]
+        st.session_state['scan_trace'] = scan_out['trace']
+        st.session_state['scan_report'] = scan_out['report']
+        st.session_state['search_results'] = scan_out['data']
+        st.session_state['total_scanned'] = scan_out['total']
 
     if st.session_state['search_results'] is not None:
-        data = st.session_state['search_results']
+        render_started = time.perf_counter()
+        df = st.session_state['search_results']
         total = st.session_state['total_scanned']
-        if data:
-            df = pd.DataFrame(data).sort_values(by='Durasi Detik', ascending=False)
+        if len(df):
             st.success(f"✅ Ditemukan {len(df)} video potensial (Sample: {total}).")
-            st.dataframe(df[['Judul Video', 'Views', 'Durasi', 'Engagement', 'Subs']], use_container_width=True, hide_index=True)
+            scan_report = st.session_state.get('scan_report', {})
+            if scan_report.get('cached_age') is not None:
+                st.caption(f"⚡ Dari data scan bersama (umur {format_age(scan_report['cached_age'])}): filter diterapkan ulang secara lokal, {reuse_note(scan_report)}")
+            if scan_report:
+                st.caption(prefilter_note(scan_report))
+                if 'plan' in scan_report or scan_report.get('refiltered'): st.caption(plan_note(scan_report))
+            telemetry_slot = st.container()
+            table_cols = ['Judul Video', 'Views', 'Durasi', 'Engagement', 'Subs']
+            if 'Keyword' in df.columns:
+                # Hasil multi keyword: satu baris per video, bisa difilter per keyword
+                st.caption(f"📚 Multi Keyword: {scan_report.get('queries', 0)} keyword | {scan_report.get('video_ids_total', 0)} ID video → {scan_report.get('video_ids_unique', 0)} unik, {scan_report.get('channel_ids_total', 0)} ID channel → {scan_report.get('channel_ids_unique', 0)} unik (detail & channel diambil sekali)")
+                kw_options = list(dict.fromkeys(k for ks in df['Keyword'].unique() for k in ks.split(results.KEYWORD_SEP)))
+                kw_filter = st.selectbox("Filter keyword:", ["Semua"] + kw_options, key="scan_kw_filter")
+                if kw_filter != "Semua": df = df[results.keyword_mask(df, kw_filter)]
+                table_cols.append('Keyword')
+            table_event = st.dataframe(df[table_cols], use_container_width=True, hide_index=True, on_select="rerun", selection_mode="multi-row", key="result_table")
+
+            # BULK EXPORT: baris terpilih (atau semua kalau tidak ada yang
+            # dipilih) ditulis satu per satu ke ZIP saat tombol diklik
+            selected_rows = table_event.selection.rows if table_event else []
+            export_df = df.iloc[selected_rows] if selected_rows else df
+            edits_snapshot = {i: dict(e) for i, e in st.session_state.get('meta_edits', {}).items()}
+            spy_snapshot = {i: st.session_state.get(f"spy_data_{i}") for i in export_df.index}
+            zip_gateway, zip_cache = get_gateway(), get_metadata_cache()
+            def build_zip(export_df=export_df, edits=edits_snapshot, spies=spy_snapshot, keys=list(api_keys_list)):
+                # Jalan di thread download_button: teks diambil di sini per chunk, bukan lewat session_state
+                rows = results.iter_with_text(zip_gateway, zip_cache, keys, export_df)
+                return write_export_zip((meta_for(r, edits.get(i, {})), spies.get(i)) for i, r in rows)
+            zip_label = f"📦 Export ZIP ({len(export_df)} dipilih)" if selected_rows else f"📦 Export ZIP (semua {len(df)} video)"
+            st.download_button(zip_label, build_zip, f"export_metadata_{clean_filename(keyword_vid) or 'scan'}.zip", "application/zip",
+                               key="dl_zip_bulk", on_click=mark_many_as_downloaded, args=(list(zip(export_df['VideoId'], export_df['Judul Video'])),))
             
             st.markdown("---")
             st.subheader("📝 Metadata Editor & Spy Report")
 
-            for idx, row in df.iterrows():
+            # BATCH SPY: semua channel unik di hasil yang belum punya data spy,
+            # sekali jalan (50 channel per call, request paralel). Yang masih
+            # ada di spy cache (umur <= TTL) tidak makan kuota.
+            force_spy = st.toggle("🔄 Paksa refresh (abaikan cache spy)", key="spy_force")
+            spy_targets = list(dict.fromkeys(cid for idx, cid in df['ChannelId'].items() if force_spy or not st.session_state.get(f"spy_data_{idx}")))
+            if spy_targets:
+                if st.button(f"🕵️ Spy Semua Channel ({len(spy_targets)} channel)", key="btn_spy_all"):
+                    spy_status = st.empty()
+                    spy_report = {}
+                    with st.spinner("Mengintip semua channel..."):
+                        spy_results = execute_batch_spy(api_keys_list, spy_targets, on_status=spy_status.write, report=spy_report, ttl=spy_ttl_hours * 3600, force=force_spy)
+                    for idx, cid in df['ChannelId'].items():
+                        if cid in spy_results and (force_spy or not st.session_state.get(f"spy_data_{idx}")):
+                            st.session_state[f"spy_data_{idx}"] = spy_results[cid]
+                    st.session_state['spy_report'] = spy_report
+                    st.rerun()
+            spy_report = st.session_state.get('spy_report')
+            if spy_report:
+                st.caption(f"🕵️ Batch Spy: {spy_report['channels']} channel | {spy_report['from_cache']} dari cache, {spy_report['via_playlist']} via uploads playlist, {spy_report['via_search']} via search")
+
+            # PAGINASI: hanya baris di halaman aktif yang dibuatkan widget,
+            # jadi waktu rerun tidak ikut membengkak di mode BRUTAL
+            c_size, c_page, c_info = st.columns([1, 1, 2])
+            with c_size:
+                page_size = st.selectbox("Baris per halaman:", EDITOR_PAGE_SIZES, key="editor_page_size")
+            n_pages = max(1, -(-len(df) // page_size))
+            if st.session_state.get('editor_page', 1) > n_pages: st.session_state['editor_page'] = 1
+            with c_page:
+                page = st.number_input(f"Halaman (1-{n_pages}):", min_value=1, max_value=n_pages, step=1, key="editor_page")
+            page_df = df.iloc[(page - 1) * page_size:page * page_size]
+            page_df = results.with_text(page_df, load_scan_text(api_keys_list, page_df['VideoId'].tolist()))
+            with c_info:
+                st.write("")
+                st.caption(f"Menampilkan {(page - 1) * page_size + 1}-{(page - 1) * page_size + len(page_df)} dari {len(df)} video")
+
+            download_history = load_download_history(page_df['VideoId'].tolist())
+
+            # Isi data spy dari cache bersama (gratis) untuk baris di halaman ini
+            unspied = {idx: cid for idx, cid in page_df['ChannelId'].items() if f"spy_data_{idx}" not in st.session_state}
+            if unspied:
+                cached_spies = load_cached_spies(list(set(unspied.values())), spy_ttl_hours * 3600)
+                for idx, cid in unspied.items():
+                    if cid in cached_spies: st.session_state[f"spy_data_{idx}"] = cached_spies[cid]
+
+            for idx, row in page_df.iterrows():
                 k_title, k_chan, k_link = f"meta_title_{idx}", f"meta_chan_{idx}", f"meta_link_{idx}"
                 k_tags, k_desc, k_spy = f"meta_tags_{idx}", f"meta_desc_{idx}", f"spy_data_{idx}"
 
-                if k_title not in st.session_state: st.session_state[k_title] = row['Judul Video']
-                if k_chan not in st.session_state: st.session_state[k_chan] = row['Channel']
-                if k_link not in st.session_state: st.session_state[k_link] = row['Link']
-                if k_tags not in st.session_state: st.session_state[k_tags] = ", ".join(row['Tags List'])
-                if k_desc not in st.session_state: st.session_state[k_desc] = row['Deskripsi']
+                for field, value in get_meta(idx, row).items():
+                    if f"meta_{field}_{idx}" not in st.session_state: st.session_state[f"meta_{field}_{idx}"] = value
 
                 vid_id = row['VideoId']
                 is_downloaded = vid_id in download_history
@@ -825,8 +756,6 @@ with tab1:
                         st.info(f"📌 Downloaded: {download_history[vid_id]['date']}")
 
                     spy_placeholder = st.empty()
-                    spy_txt_formatted = "Data Spy belum diambil."
-                    json_data_export = {}
 
                     if k_spy in st.session_state:
                         spy = st.session_state[k_spy]
@@ -855,60 +784,20 @@ with tab1:
                                 <ul class="spy-list">{reg_list_ui}</ul>
                             </div>
                             """, unsafe_allow_html=True)
-                            
-                            live_txt_list = [f"{i['title']} ({i['duration_text']} - {i['views']:,} views)" for i in spy['top_live_list']]
-                            reg_txt_list = [f"{i['title']} ({i['duration_text']} - {i['views']:,} views)" for i in spy['top_reg_list']]
-                            
-                            spy_txt_formatted = f"""
-CHANNEL_METADATA_START
-CHANNEL_NAME: {st.session_state[k_chan]}
-CHANNEL_AGE_YEARS: {spy['channel_age']}
-CHANNEL_CREATED_DATE: {spy['channel_created']}
-TOTAL_SUBSCRIBERS: {spy['subscriber_count']}
-TOTAL_VIEWS_GLOBAL: {spy['total_views_all']}
-TOTAL_VIDEO_GLOBAL: {spy['total_video_count']}
-CHANNEL_METADATA_END
-
-CHANNEL_DETAILS_START
-CHANNEL_KEYWORDS:
-{spy['channel_keywords']}
-
-CHANNEL_DESCRIPTION:
-{spy['channel_desc']}
-CHANNEL_DETAILS_END
-
-SPLIT_STATS_START
-TOTAL_VIDEO_LIVE: {spy['live_count']}
-TOTAL_VIDEO_REGULER: {spy['reguler_count']}
-SPLIT_STATS_END
-
-CONTENT_PERFORMANCE_START
-TOP_3_LIVE_LIST:
-{json.dumps(live_txt_list, indent=2, ensure_ascii=False)}
-
-TOP_3_REGULER_LIST:
-{json.dumps(reg_txt_list, indent=2, ensure_ascii=False)}
-CONTENT_PERFORMANCE_END
-"""
-                            tags_list_final = [t.strip() for t in st.session_state[k_tags].split(',')]
-                            json_data_export = {
-                                "video_metadata": {
-                                    "title": st.session_state[k_title],
-                                    "channel_name": st.session_state[k_chan],
-                                    "url": st.session_state[k_link],
-                                    "keywords_konten": tags_list_final,
-                                    "description_konten": st.session_state[k_desc]
-                                },
-                                "channel_intel": spy
-                            }
                         else:
                             spy_placeholder.error("Gagal Spy.")
+                        c_fetched, c_refresh = st.columns([3, 1])
+                        if spy: c_fetched.caption(f"🕒 Data spy diambil: {spy.get('fetched_at', '-')}")
+                        if c_refresh.button("🔄 Refresh Spy", key=f"btn_spy_refresh_{idx}", use_container_width=True):
+                            with st.spinner("Mengintip data..."):
+                                spy_result = execute_channel_spy(api_keys_list, row['ChannelId'], ttl=spy_ttl_hours * 3600, force=True)
+                                for j, cid in df['ChannelId'].items():
+                                    if cid == row['ChannelId']: st.session_state[f"spy_data_{j}"] = spy_result
+                                st.rerun()
                     else:
                         if spy_placeholder.button("🕵️ Analisa Channel Ini", key=f"btn_spy_{idx}"):
                             with st.spinner("Mengintip data..."):
-                                key_idx = st.session_state['current_key_index']
-                                key_to_use = api_keys_list[key_idx].strip()
-                                spy_result = execute_channel_spy(key_to_use, row['ChannelId'])
+                                spy_result = execute_channel_spy(api_keys_list, row['ChannelId'], ttl=spy_ttl_hours * 3600)
                                 st.session_state[k_spy] = spy_result
                                 st.rerun()
 
@@ -918,27 +807,31 @@ CONTENT_PERFORMANCE_END
                         st.link_button("▶️ Tonton di YouTube", row['Link'], use_container_width=True)
                         st.write("")
                         
-                        safe_chan = clean_filename(st.session_state[k_chan])
-                        safe_title = clean_filename(st.session_state[k_title])
-                        fname_base = f"{safe_chan} - {safe_title}"[:100]
+                        # Payload export baru dibangun saat tombol diklik (callable),
+                        # dari snapshot nilai editor & data spy baris ini
+                        meta = {field: st.session_state[f"meta_{field}_{idx}"] for field in META_FIELDS}
+                        spy_ok = st.session_state.get(k_spy) or None
+                        fname_base = export_basename(meta)
 
-                        txt_final = f"JUDUL KONTEN:\n{st.session_state[k_title]}\n\nNAMA CHANNEL:\n{st.session_state[k_chan]}\n\nLINK VIDEO:\n{st.session_state[k_link]}\n\nKEYWORDS KONTEN:\n{st.session_state[k_tags]}\n\nDESKRIPSI KONTEN:\n{st.session_state[k_desc]}\n\n{spy_txt_formatted}"
-                        
-                        st.download_button("📥 Download .TXT (Human)", txt_final, f"{fname_base}.txt", "text/plain", use_container_width=True, key=f"dl_txt_{idx}", on_click=mark_as_downloaded, args=(vid_id, row['Judul Video']))
+                        st.download_button("📥 Download .TXT (Human)", lambda meta=meta, spy=spy_ok: export_txt(meta, spy), f"{fname_base}.txt", "text/plain", use_container_width=True, key=f"dl_txt_{idx}", on_click=mark_as_downloaded, args=(vid_id, row['Judul Video']))
 
-                        if json_data_export:
-                            json_str = json.dumps(json_data_export, indent=4, ensure_ascii=False)
-                            st.download_button("🤖 Download .JSON (AI)", json_str, f"{fname_base}.json", "application/json", use_container_width=True, key=f"dl_json_{idx}")
+                        if spy_ok:
+                            st.download_button("🤖 Download .JSON (AI)", lambda meta=meta, spy=spy_ok: export_json(meta, spy), f"{fname_base}.json", "application/json", use_container_width=True, key=f"dl_json_{idx}")
                     
                     with col_data:
-                        st.text_input("📌 Judul:", key=k_title)
+                        st.text_input("📌 Judul:", key=k_title, on_change=remember_meta, args=(idx, "title"))
                         c_a, c_b = st.columns(2)
-                        with c_a: st.text_input("👤 Nama Channel:", key=k_chan)
-                        with c_b: st.text_input("🔗 Link Video:", key=k_link)
-                        st.text_area("🏷️ KEYWORDS KONTEN:", height=100, key=k_tags)
-                        st.text_area("📄 DESKRIPSI KONTEN:", height=200, key=k_desc)
+                        with c_a: st.text_input("👤 Nama Channel:", key=k_chan, on_change=remember_meta, args=(idx, "chan"))
+                        with c_b: st.text_input("🔗 Link Video:", key=k_link, on_change=remember_meta, args=(idx, "link"))
+                        st.text_area("🏷️ KEYWORDS KONTEN:", height=100, key=k_tags, on_change=remember_meta, args=(idx, "tags"))
+                        st.text_area("📄 DESKRIPSI KONTEN:", height=200, key=k_desc, on_change=remember_meta, args=(idx, "desc"))
         else:
+            if st.session_state.get('scan_report', {}).get('keys_exhausted'): st.error("❌ SEMUA API KEY HABIS!")
             st.error("Hasil 0. Coba ubah filter.")
+            telemetry_slot = st.container()
+        scan_trace = flush_trace('scan_trace', render_started)
+        if scan_trace:
+            with telemetry_slot: render_telemetry(scan_trace)
 
 # ==========================================
 # TAB 2: ANALISA SEO VIRAL (PURE STATS)
@@ -952,7 +845,12 @@ with tab2:
     
     col_input, col_act = st.columns([3, 1])
     with col_input:
-        seo_query = st.text_input("Masukkan Judul Video Kamu:", placeholder="Contoh: Cara Menghasilkan Uang Dari Internet")
+        multi_seo = st.toggle("📚 Multi Keyword", key="seo_multi", help="Analisa banyak seed keyword sekaligus; detail video & channel yang sama cukup diambil sekali.")
+        if multi_seo:
+            seo_queries = split_keywords(st.text_area("Masukkan Seed Keyword (satu per baris):", placeholder="cara menghasilkan uang\nbisnis online\nide usaha", key="seo_queries"))
+            seo_query = ", ".join(seo_queries)
+        else:
+            seo_query = st.text_input("Masukkan Judul Video Kamu:", placeholder="Contoh: Cara Menghasilkan Uang Dari Internet")
         
         c_len, c_ai = st.columns([2, 1])
         with c_len:
@@ -962,7 +860,8 @@ with tab2:
                 default=["1 Kata", "2 Kata"]
             )
         with c_ai:
-            st.write("") 
+            adaptive_seo = st.toggle("⚡ Mode Adaptif", value=False, help="Berhenti paging saat ranking keyword top-20 sudah stabil (hemat kuota search).")
+            stability_threshold = st.slider("Ambang Stabil (korelasi ranking)", 0.50, 1.00, 0.90, 0.05, disabled=not adaptive_seo or multi_seo)
     
     with col_act:
         st.write("")
@@ -970,37 +869,56 @@ with tab2:
         st.write("") 
         if st.button("🚀 Analisa & Filter", type="primary", use_container_width=True):
             if seo_query and selected_lengths:
-                
-                # --- STATE WIPER ---
-                if 'seo_results' in st.session_state: del st.session_state['seo_results']
-                if 'debug_info' in st.session_state: del st.session_state['debug_info']
-                st.session_state['seo_results'] = None
-                
-                status_text = f"🔍 Sedang menganalisa topik: '{seo_query}'..."
-                with st.spinner(status_text):
-                    save_search_log(seo_query, "Viral")
-
-                    mode_now = "Hemat" if "Hemat" in st.session_state.widget_scan_mode else "Maksimal"
-                    days_now = st.session_state.widget_days_back
-                    max_s = st.session_state.widget_max_subs
-                    min_v = st.session_state.widget_min_views
-                    min_sec = (st.session_state.widget_jam * 3600) + (st.session_state.widget_menit * 60)
-                    
-                    res_seo, debug_info = analyze_viral_seo(api_keys_list, seo_query, days_now, max_s, min_v, min_sec, mode_now, selected_lengths)
-                    
-                    st.session_state['seo_results'] = res_seo
-                    st.session_state['debug_info'] = debug_info
+                save_search_log(seo_query, "Viral")
+
+                mode_now = st.session_state.widget_scan_mode
+                days_now = st.session_state.widget_days_back
+                max_s = st.session_state.widget_max_subs
+                min_v = st.session_state.widget_min_views
+                min_sec = (st.session_state.widget_jam * 3600) + (st.session_state.widget_menit * 60)
+                submit_job('seo_job', "seo", "Analisa", seo_job, get_engines(), list(api_keys_list), multi_seo, seo_query, seo_queries if multi_seo else [],
+                           days_now, max_s, min_v, min_sec, mode_now, list(selected_lengths), adaptive_seo, stability_threshold, st.session_state.widget_time_slices)
             elif not selected_lengths:
                 st.warning("Pilih minimal satu jenis panjang kata kunci.")
             else:
                 st.warning("Isi judul dulu.")
 
+    seo_out = take_job_result('seo_job', "Analisa")
+    if seo_out:
+        # --- STATE WIPER ---
+        for key in ('seo_batch', 'seo_batch_report', 'seo_batch_pick'): st.session_state.pop(key, None)
+        if seo_out['batch'] is not None:
+            st.session_state['seo_batch'] = seo_out['batch']
+            st.session_state['seo_batch_report'] = seo_out['batch_report']
+        st.session_state['seo_results'] = seo_out['results']
+        st.session_state['debug_info'] = seo_out['debug']
+        st.session_state['seo_trace'] = seo_out['trace']
+
+    render_started = time.perf_counter()
+    seo_batch = st.session_state.get('seo_batch')
+    if seo_batch and st.session_state['seo_results'] is not None:
+        batch_report = st.session_state.get('seo_batch_report', {})
+        if batch_report.get('cached_age') is not None:
+            st.caption(f"⚡ Dari cache hasil bersama (umur {format_age(batch_report['cached_age'])}), tanpa kuota API.")
+        st.caption(f"📚 Multi Keyword: {batch_report.get('queries', 0)} keyword, {batch_report.get('search_pages', 0)} halaman search | {batch_report.get('video_ids_total', 0)} ID video → {batch_report.get('video_ids_unique', 0)} unik, {batch_report.get('channel_ids_total', 0)} ID channel → {batch_report.get('channel_ids_unique', 0)} unik (detail & channel diambil sekali)")
+        st.caption(prefilter_note(batch_report))
+        c_pick, c_all = st.columns([3, 1])
+        with c_pick:
+            seo_query = st.selectbox("Tampilkan hasil keyword:", list(seo_batch), key="seo_batch_pick", format_func=lambda q: f"{q} ({len(seo_batch[q][0])} kata kunci)")
+        st.session_state['seo_results'], st.session_state['debug_info'] = seo_batch[seo_query]
+        with c_all:
+            st.write("")
+            all_rows = [{"Seed": q, **r} for q, (res, _) in seo_batch.items() for r in res]
+            if all_rows:
+                df_all = pd.DataFrame(all_rows)[['Seed', 'Jenis', 'Kata Kunci', 'Skor Viral', 'Rata-rata Views', 'Muncul di Video', 'Engagement Score']]
+                st.download_button("📥 CSV Semua Keyword", df_all.to_csv(index=False).encode('utf-8'), "analisa_viral_multi.csv", "text/csv", use_container_width=True)
+
     if st.session_state['seo_results'] is not None:
-        results = st.session_state['seo_results']
+        seo_rows = st.session_state['seo_results']
         d_info = st.session_state['debug_info']
         
-        if len(results) > 0:
-            df_seo = pd.DataFrame(results).sort_values(by="Skor Viral", ascending=False).reset_index(drop=True)
+        if len(seo_rows) > 0:
+            df_seo = pd.DataFrame(seo_rows).sort_values(by="Skor Viral", ascending=False).reset_index(drop=True)
             
             best_kw = df_seo.iloc[0]['Kata Kunci']
             avg_comp_views = int(df_seo['Rata-rata Views'].mean())
@@ -1010,7 +928,19 @@ with tab2:
                 st.warning("⚠️ **INFO:** Filter 'Max Subs' terlalu ketat. Sistem otomatis mengabaikannya agar hasil tetap muncul.")
             
             # Indikator API Key yang digunakan
-            st.caption(f"ℹ️ Menggunakan API: YouTube (Baris {d_info.get('yt_key_line', 1)})")
+            if d_info.get('cached_age') is not None:
+                reuse = "cache hasil bersama" if d_info.get('adaptive') else "data scan bersama, filter diterapkan ulang secara lokal"
+                st.caption(f"⚡ Dari {reuse} (umur {format_age(d_info['cached_age'])}), {reuse_note(d_info)}")
+            elif not seo_batch:
+                st.caption(f"ℹ️ Menggunakan API: YouTube (Baris {d_info.get('yt_key_line', 1)})")
+                st.caption(prefilter_note(d_info))
+            if not seo_batch and not d_info.get('adaptive'):
+                st.caption(plan_note(d_info))
+            if d_info.get('adaptive'):
+                if d_info.get('pages_saved'):
+                    st.caption(f"⚡ Mode Adaptif: ranking stabil (korelasi {d_info.get('rank_correlation')}) setelah {d_info.get('pages_fetched')} dari {d_info.get('pages_planned')} halaman. Hemat hingga {d_info.get('pages_saved')} halaman / ±{d_info.get('quota_saved'):,} unit kuota.")
+                else:
+                    st.caption(f"⚡ Mode Adaptif: ranking belum stabil, semua {d_info.get('pages_fetched')} halaman dipakai.")
 
             # METRICS
             m1, m2, m3, m4 = st.columns(4)
@@ -1050,12 +980,19 @@ with tab2:
         
         else:
             st.error("❌ Hasil 0 Video.")
+            # Planner "subs dulu": kandidat dari channel besar gugur di filter
+            # subs sebelum durasi & views-nya sempat dicek
+            unchecked = d_info.get('blocked_subs_unchecked', 0)
+            partial_note = " (dari kandidat yang lolos subs)" if unchecked else ""
+            subs_note = f" ({unchecked} di antaranya diblok sebelum durasi & views dicek)" if unchecked else ""
             st.markdown(f"""
             **Diagnosa:**
             - Ditemukan: {d_info.get('total_found_search',0)} video awal.
-            - Blokir Durasi: {d_info.get('blocked_duration',0)}
-            - Blokir Views: {d_info.get('blocked_views',0)}
-            - Blokir Subs: {d_info.get('blocked_subs',0)}
+            - Blokir Durasi: {d_info.get('blocked_duration',0)}{partial_note} (pre-filter: videoDuration={d_info.get('duration_bucket', 'any')}, {d_info.get('detail_ids_skipped', 0)} video cache tidak di-refresh)
+            - Blokir Views: {d_info.get('blocked_views',0)}{partial_note}
+            - Blokir Subs: {d_info.get('blocked_subs',0)}{subs_note}
             
             **Saran:** Coba ubah 'Umur Video' menjadi lebih lama (Misal 30 Hari) atau ganti Judul.
             """)
+        seo_trace = flush_trace('seo_trace', render_started)
+        if seo_trace: render_telemetry(seo_trace)
@@ -0,0 +1,177 @@
+# Benchmark engine statistik keyword: versi loop lama vs versi kolomnar.
+# Jalankan: python benchmarks/bench_keywords.py [jumlah_video] [ulang]
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ytintel.keywords import aggregate_keywords
+
+# ==========================================
+# REFERENSI: IMPLEMENTASI LOOP LAMA (app.py V28.1)
+# ==========================================
+def legacy_backfill_one_word_keywords(tag_stats, min_freq=3):
+    existing_1_word = set()
+    for k, v in tag_stats.items():
+        if v['len'] == 1:
+            existing_1_word.add(k)
+
+    stopwords = {'and', 'the', 'with', 'for', 'you', 'from', 'in', 'on', 'at', 'to', 'of', 'by', 'my', 'is', 'a', 'it', 'video', 'videos', 'lyric', 'lyrics', 'official', 'hd', '4k', 'mv'}
+
+    new_entries = {}
+
+    for k, v in tag_stats.items():
+        # Only process if parent meets frequency criteria
+        if (v['len'] == 2 or v['len'] == 3) and v['count'] >= min_freq: 
+            words = k.split()
+            for w in words:
+                w_clean = w.strip()
+                if len(w_clean) > 2 and w_clean not in stopwords and w_clean not in existing_1_word:
+                    if w_clean in new_entries:
+                        avg_v_new = v['total_views'] // v['count']
+                        avg_v_old = new_entries[w_clean]['total_views'] // new_entries[w_clean]['count']
+                        if avg_v_new > avg_v_old:
+                            new_entries[w_clean] = {
+                                'count': v['count'], 
+                                'total_views': v['total_views'], 
+                                'total_likes': v['total_likes'], 
+                                'len': 1 
+                            }
+                    else:
+                        new_entries[w_clean] = {
+                            'count': v['count'], 
+                            'total_views': v['total_views'], 
+                            'total_likes': v['total_likes'], 
+                            'len': 1
+                        }
+                    
+    final_stats = tag_stats.copy()
+    final_stats.update(new_entries)
+    return final_stats
+
+def legacy_aggregate_keywords(items_to_process, target_counts):
+    tag_stats = {} 
+
+    for item in items_to_process:
+        views = int(item['statistics'].get('viewCount', 0))
+        likes = int(item['statistics'].get('likeCount', 0))
+        tags = item['snippet'].get('tags', [])
+        title_words = re.findall(r'\w+', item['snippet']['title'].lower())
+        
+        all_keywords = tags + [w for w in title_words if len(w) > 3]
+        
+        for tag in all_keywords:
+            tag_clean = tag.lower().strip()
+            
+            technical_junk = ['hd', '4k', '1080p', 'hq', 'official video', 'lyric video', 'official audio']
+            if any(junk in tag_clean for junk in technical_junk): continue
+
+            word_len = len(tag_clean.split())
+            
+            is_valid_len = False
+            if word_len == 1 and 1 in target_counts: is_valid_len = True
+            elif word_len == 2 and 2 in target_counts: is_valid_len = True
+            elif word_len >= 3 and 3 in target_counts: is_valid_len = True
+            
+            if not is_valid_len: continue
+
+            if tag_clean not in tag_stats:
+                tag_stats[tag_clean] = {'count': 0, 'total_views': 0, 'total_likes': 0, 'len': word_len}
+            
+            tag_stats[tag_clean]['count'] += 1
+            tag_stats[tag_clean]['total_views'] += views
+            tag_stats[tag_clean]['total_likes'] += likes
+
+    # === 1. FILTER FREKUENSI (MIN 3 VIDEO) ===
+    tag_stats = {k: v for k, v in tag_stats.items() if v['count'] >= 3}
+
+    # === 2. BACKFILL ===
+    tag_stats = legacy_backfill_one_word_keywords(tag_stats, min_freq=3)
+
+    results = []
+    # Stopwords minimal
+    stopwords = ['and', 'the', 'with', 'for', 'you', 'from', 'in', 'on', 'at', 'to', 'of', 'by', 'my', 'is', 'a', 'it', 'video', 'videos', 'lyric', 'lyrics', 'official', 'hd', '4k']
+    
+    for tag, data in tag_stats.items():
+        if tag in stopwords: continue
+        
+        freq = data['count']
+        avg_views = data['total_views'] / freq
+        avg_likes = data['total_likes'] / freq
+        
+        score_view = min((avg_views / 50000) * 40, 40)
+        score_freq = min(freq * 10, 30)
+        score_eng = min((avg_likes / (avg_views+1) * 100) * 10, 30)
+        final_score = score_view + score_freq + score_eng
+        
+        cat_text = "1 Kata"
+        if data['len'] == 2: cat_text = "2 Kata"
+        elif data['len'] >= 3: cat_text = "3+ Kata"
+
+        results.append({
+            "Jenis": cat_text,
+            "Kata Kunci": tag,
+            "Muncul di Video": freq,
+            "Rata-rata Views": int(avg_views),
+            "Engagement Score": round(score_eng, 1),
+            "Skor Viral": round(final_score, 1),
+            "word_count_raw": data['len']
+        })
+        
+    return results
+
+# ==========================================
+# DATA SINTETIS
+# ==========================================
+WORDS = ("cara uang internet bisnis online musik relax sleep rain piano jazz lofi study focus meditation "
+         "nature ocean forest night city drive game tutorial resep masak kopi vlog travel bali jakarta "
+         "live stream podcast horror cerita official lyric video hd 4k mv the and for with").split()
+
+
+def make_items(n_videos, seed=7, max_tags=60):
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n_videos):
+        tags = [" ".join(rnd.sample(WORDS, rnd.choice([1, 1, 2, 2, 3, 4]))) for _ in range(rnd.randint(0, max_tags))]
+        if rnd.random() < 0.3: tags.append("Official Video HD")
+        if rnd.random() < 0.3: tags.append("  Lofi Beats  ")
+        items.append({
+            "id": f"v{i}",
+            "snippet": {"title": " ".join(rnd.sample(WORDS, 8)).title(), "tags": tags},
+            "statistics": {"viewCount": str(int(rnd.paretovariate(1.1) * 1000)), "likeCount": str(rnd.randint(0, 20000))},
+        })
+    return items
+
+
+def bench(fn, items, target_counts, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn(items, target_counts)
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main():
+    n_videos = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    items = make_items(n_videos)
+    n_tags = sum(len(it["snippet"]["tags"]) for it in items)
+    print(f"{n_videos} video, {n_tags} tag")
+
+    for target_counts in ([1], [1, 2], [1, 2, 3]):
+        t_old, old = bench(legacy_aggregate_keywords, items, target_counts, repeat)
+        t_new, new = bench(aggregate_keywords, items, target_counts, repeat)
+        status = "OK" if old == new else "BEDA!"
+        print(f"target_counts={target_counts}: loop {t_old*1000:.1f} ms | kolomnar {t_new*1000:.1f} ms | "
+              f"{t_old / t_new:.1f}x | {len(new)} keyword | hasil {status}")
+        if old != new:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
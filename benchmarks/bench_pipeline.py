@@ -0,0 +1,221 @@
+# Benchmark pipeline scan (Tab 1) & analisa SEO (Tab 2) tanpa Streamlit,
+# tanpa API key dan tanpa kuota: request dijawab stand-in client lokal
+# (benchmarks/fake_youtube.py) dari data sintetis atau fixture rekaman.
+#
+# Jalankan:
+#   python benchmarks/bench_pipeline.py
+#   python benchmarks/bench_pipeline.py --modes Hemat Sedang --latency 0.05
+#   python benchmarks/bench_pipeline.py --fixture rekaman.json --json hasil.jsonl
+#
+# Per mode (Hemat/Sedang/Agresif/BRUTAL) dan per pipeline dilaporkan: wall
+# time, peak memory (tracemalloc), jumlah call & unit kuota per tahap, untuk
+# run cold (cache kosong), warm (cache metadata terisi) dan stale (statistik
+# cache kedaluwarsa -> refresh lewat If-None-Match, data tidak berubah = 304).
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_youtube import FakeYouTube, FakeClientPool
+from ytintel.api import YouTubeGateway
+from ytintel.cache import EtagCache, MetadataCache
+from ytintel.keywords import aggregate_keywords, keyword_stats_frame, backfill_one_word_keywords
+from ytintel.quota import QUOTA_COST, ApiKeyScheduler
+from ytintel.results import to_frame
+from ytintel.scan import SCAN_LIMITS, build_video_row, iter_viral_videos, parse_duration
+from ytintel.seo import analyze_viral_seo
+
+# Mode pendek -> label mode di UI (ukuran scan dari SCAN_LIMITS, SEO dari analyze_viral_seo)
+MODES = {"Hemat": "🌱 Hemat", "Sedang": "⚖️ Sedang", "Agresif": "🔥 Agresif", "BRUTAL": "☠️ BRUTAL"}
+STAGE_OF = {"search.list": "search", "videos.list": "details", "channels.list": "channels", "playlistItems.list": "playlist"}
+API_KEYS = ["BENCH-KEY-1", "BENCH-KEY-2"]
+
+
+class Workspace:
+    # Gateway + cache + state kuota di direktori sementara, supaya run
+    # benchmark tidak menyentuh file milik aplikasi
+    def __init__(self, client):
+        self.dir = tempfile.mkdtemp(prefix="ytintel-bench-")
+        self.client = client
+        self.cache = MetadataCache(os.path.join(self.dir, "cache.db"))
+        self.etags = EtagCache(os.path.join(self.dir, "cache.db"))
+        self.gateway = YouTubeGateway(pool=FakeClientPool(client), scheduler=ApiKeyScheduler(os.path.join(self.dir, "quota.json")), etags=self.etags)
+
+    def expire_statistics(self):
+        with self.cache._lock:
+            for table in ("videos", "channels"): self.cache._conn.execute(f"UPDATE {table} SET volatile_at=0")
+            self.cache._conn.commit()
+
+    def close(self):
+        self.gateway._executor.shutdown(wait=True)
+        self.cache._conn.close()
+        self.etags._conn.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def run_scan(ws, size, args):
+    report = {}
+    rows = []
+    for page_rows, _ in iter_viral_videos(ws.gateway, ws.cache, API_KEYS, args.keyword, args.max_subs, args.min_views, args.days, SCAN_LIMITS[MODES[size]], args.min_sec, args.max_sec, report=report, slices=args.slices):
+        rows.extend(page_rows)
+    return len(rows), report
+
+
+def run_seo(ws, size, args):
+    results, debug = analyze_viral_seo(ws.gateway, ws.cache, API_KEYS, args.keyword, args.days, args.max_subs, args.min_views, args.min_sec, MODES[size], ["1 Kata", "2 Kata", "3+ Kata"], slices=args.slices)
+    return len(results), debug
+
+
+def measure(ws, fn, size, args, trace):
+    ws.client.calls.clear()
+    ws.client.not_modified = 0
+    ws.client.bytes = 0
+    if trace: tracemalloc.start()
+    t = time.perf_counter()
+    n_out, report = fn(ws, size, args)
+    wall = time.perf_counter() - t
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    calls = Counter(STAGE_OF.get(e, e) for e in ws.client.calls)
+    quota = Counter()
+    for e in ws.client.calls: quota[STAGE_OF.get(e, e)] += QUOTA_COST.get(e, 1)
+    return {
+        "wall_s": round(wall, 4),
+        "peak_mb": round(peak / 2**20, 2),
+        "results": n_out,
+        "calls": dict(calls),
+        "quota": dict(quota),
+        "quota_total": sum(quota.values()),
+        "not_modified": ws.client.not_modified,
+        "payload_kb": round(ws.client.bytes / 1024, 1),
+        "stage_s": {k: round(v, 4) for k, v in report.get("timings", {}).items()},
+    }
+
+
+def bench_pipeline(name, fn, client, size, args):
+    # Wall time diukur tanpa tracemalloc (overhead-nya besar); peak memory
+    # diambil dari run terpisah dengan workspace baru yang identik
+    out = {}
+    ws = Workspace(client)
+    try:
+        out["cold"] = measure(ws, fn, size, args, trace=False)
+        out["warm"] = measure(ws, fn, size, args, trace=False)
+        ws.expire_statistics()
+        out["stale"] = measure(ws, fn, size, args, trace=False)
+    finally:
+        ws.close()
+    ws = Workspace(client)
+    try:
+        out["cold"]["peak_mb"] = measure(ws, fn, size, args, trace=True)["peak_mb"]
+        out["warm"]["peak_mb"] = measure(ws, fn, size, args, trace=True)["peak_mb"]
+        ws.expire_statistics()
+        out["stale"]["peak_mb"] = measure(ws, fn, size, args, trace=True)["peak_mb"]
+    finally:
+        ws.close()
+    return out
+
+
+def bench_micro(client, repeat):
+    # Hot path murni (tanpa I/O): parse_duration & backfill 1 kata
+    durations = [v["contentDetails"]["duration"] for v in client.vdb.values()]
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for d in durations: parse_duration(d)
+        best = min(best, time.perf_counter() - t)
+    out = {"parse_duration_us": round(best / len(durations) * 1e6, 3)}
+
+    items = list(client.vdb.values())
+    frame = keyword_stats_frame(items, [1, 2, 3])
+    tag_stats = {r.kw: {"count": r.count, "total_views": r.total_views, "total_likes": r.total_likes, "len": r.len} for r in frame.itertuples(index=False)}
+    for name, fn in (("backfill_one_word_ms", lambda: backfill_one_word_keywords(tag_stats)),
+                     ("aggregate_keywords_ms", lambda: aggregate_keywords(items, [1, 2, 3]))):
+        best = float("inf")
+        for _ in range(repeat):
+            t = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t)
+        out[name] = round(best * 1000, 2)
+
+    # Memori hasil scan ukuran BRUTAL: list dict per baris vs frame bertipe
+    subs_map = {cid: int(c["statistics"].get("subscriberCount", 0)) for cid, c in client.cdb.items()}
+    for name, build in (("scan_rows_kb", lambda: [build_video_row(it, subs_map) for it in items[:2000]]),
+                        ("scan_frame_kb", lambda: to_frame([build_video_row(it, subs_map) for it in items[:2000]]))):
+        tracemalloc.start()
+        kept = build()
+        out[name] = round(tracemalloc.get_traced_memory()[0] / 1024, 1)
+        tracemalloc.stop()
+        del kept
+    return out
+
+
+def fmt_stages(m):
+    return " ".join(f"{k}={m['calls'][k]}c/{m['quota'][k]}u" for k in sorted(m["calls"])) or "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline scan & SEO dengan client YouTube lokal")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--pipelines", nargs="+", default=["scan", "seo"], choices=["scan", "seo"])
+    parser.add_argument("--fixture", help="JSON rekaman {videos: [...], channels: [...]}")
+    parser.add_argument("--save-fixture", help="simpan data sintetis ke file fixture lalu keluar")
+    parser.add_argument("--videos", type=int, default=4000)
+    parser.add_argument("--channels", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cap", type=int, default=0, help="batas hasil search per query (0 = tanpa batas)")
+    parser.add_argument("--slices", type=int, default=1, help="jumlah sub-window waktu search (time slicing)")
+    parser.add_argument("--latency", type=float, default=0.0, help="detik per request API")
+    parser.add_argument("--ignore-fields", action="store_true", help="client mengabaikan fields= (pembanding payload penuh)")
+    parser.add_argument("--keyword", default="musik relax")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--max-subs", type=int, default=0)
+    parser.add_argument("--min-views", type=int, default=1000)
+    parser.add_argument("--min-sec", type=int, default=0)
+    parser.add_argument("--max-sec", type=int, default=24 * 3600)
+    parser.add_argument("--repeat", type=int, default=3, help="ulangan micro-benchmark")
+    parser.add_argument("--json", help="tulis hasil sebagai JSON lines ke file ini")
+    args = parser.parse_args()
+
+    if args.fixture:
+        client = FakeYouTube.from_fixture(args.fixture, cap=args.cap, latency=args.latency, honor_fields=not args.ignore_fields)
+    else:
+        client = FakeYouTube.synthetic(args.videos, args.channels, seed=args.seed, cap=args.cap, latency=args.latency, honor_fields=not args.ignore_fields)
+    if args.save_fixture:
+        client.save_fixture(args.save_fixture)
+        print(f"fixture disimpan: {args.save_fixture} ({len(client.vdb)} video, {len(client.cdb)} channel)")
+        return
+
+    print(f"data: {len(client.vdb)} video, {len(client.cdb)} channel | latency {args.latency*1000:.0f} ms/request")
+    records = []
+    pipelines = {"scan": run_scan, "seo": run_seo}
+    for size in args.modes:
+        for name in args.pipelines:
+            res = bench_pipeline(name, pipelines[name], client, size, args)
+            for phase in ("cold", "warm", "stale"):
+                m = res[phase]
+                stages = " ".join(f"{k}={v*1000:.0f}ms" for k, v in m["stage_s"].items())
+                print(f"{name:4} {size:8} {phase}: {m['wall_s']*1000:8.1f} ms | peak {m['peak_mb']:6.2f} MB | "
+                      f"{m['results']:5} hasil | kuota {m['quota_total']:5}u [{fmt_stages(m)}] 304={m['not_modified']} | {m['payload_kb']:8.1f} KB | {stages}")
+                records.append({"pipeline": name, "mode": size, "phase": phase, **m})
+
+    micro = bench_micro(client, args.repeat)
+    print("micro: " + " | ".join(f"{k}={v}" for k, v in micro.items()))
+    records.append({"pipeline": "micro", **micro})
+
+    if args.json:
+        with open(args.json, "a") as f:
+            for r in records: f.write(json.dumps(r) + "\n")
+
+
+if __name__ == "__main__":
+    main()
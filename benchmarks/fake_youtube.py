@@ -0,0 +1,270 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+# ==========================================
+# STAND-IN CLIENT YOUTUBE (UNTUK BENCHMARK)
+# ==========================================
+# Meniru bentuk respons search/videos/channels/playlistItems .list(...).execute()
+# dari googleapiclient, tanpa jaringan & tanpa kuota. Data bisa sintetis
+# (seeded) atau dari fixture JSON: {"videos": [...], "channels": [...]} dengan
+# item berbentuk sama seperti hasil videos.list / channels.list.
+# Respons membawa "etag"; request dengan header If-None-Match yang cocok
+# dijawab HttpError 304 seperti API asli. Parameter fields= (partial response)
+# diterapkan, dan tiap respons di-encode/decode JSON seperti lewat jaringan
+# supaya ukuran payload (client.bytes) & waktu decode ikut terukur.
+
+WORDS = "cara uang internet bisnis online musik relax sleep rain piano jazz lofi study focus meditation nature ocean forest night city drive game tutorial resep masak kopi vlog travel bali jakarta live stream podcast horror cerita".split()
+DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+DURATION_BUCKETS = {"short": (0, 239), "medium": (240, 1200), "long": (1201, 10**9)}
+
+
+def to_iso_duration(sec):
+    h, m, s = sec // 3600, (sec % 3600) // 60, sec % 60
+    out = "PT"
+    if h: out += f"{h}H"
+    if m: out += f"{m}M"
+    if s or out == "PT": out += f"{s}S"
+    return out
+
+
+def thumbnails(base):
+    # Bentuk thumbnails asli: 5 ukuran (search/videos.list mengirim semuanya)
+    sizes = {"default": (120, 90), "medium": (320, 180), "high": (480, 360), "standard": (640, 480), "maxres": (1280, 720)}
+    names = {"default": "default", "medium": "mqdefault", "high": "hqdefault", "standard": "sddefault", "maxres": "maxresdefault"}
+    return {k: {"url": f"{base}/{names[k]}.jpg", "width": w, "height": h} for k, (w, h) in sizes.items()}
+
+
+def duration_seconds(pt):
+    h, m, s = DURATION_RE.match(pt).groups()
+    return int(h or 0) * 3600 + int(m or 0) * 60 + int(s or 0)
+
+
+def parse_fields(mask):
+    # "a,b/c,d(e,f/g)" -> {"a": None, "b": {"c": None}, "d": {"e": None, "f": {"g": None}}}
+    pos = 0
+
+    def parse_list():
+        nonlocal pos
+        tree = {}
+        while pos < len(mask) and mask[pos] != ")":
+            path = []
+            while True:
+                start = pos
+                while pos < len(mask) and mask[pos] not in ",/()": pos += 1
+                path.append(mask[start:pos])
+                if pos < len(mask) and mask[pos] == "/":
+                    pos += 1
+                    continue
+                break
+            sub = None
+            if pos < len(mask) and mask[pos] == "(":
+                pos += 1
+                sub = parse_list()
+                pos += 1
+            for name in reversed(path[1:]): sub = {name: sub}
+            tree[path[0]] = merge_fields(tree.get(path[0], {}), sub) if path[0] in tree else sub
+            if pos < len(mask) and mask[pos] == ",": pos += 1
+        return tree
+
+    return parse_list()
+
+
+def merge_fields(a, b):
+    if a is None or b is None: return None
+    out = dict(a)
+    for k, v in b.items(): out[k] = merge_fields(out[k], v) if k in out else v
+    return out
+
+
+def apply_fields(obj, tree):
+    # Field yang tidak ada / kosong tidak ikut dikirim, sama seperti API asli
+    if tree is None: return obj
+    if isinstance(obj, list): return [apply_fields(x, tree) for x in obj]
+    if not isinstance(obj, dict): return obj
+    out = {}
+    for k, sub in tree.items():
+        if k not in obj: continue
+        v = apply_fields(obj[k], sub)
+        if v != {}: out[k] = v
+    return out
+
+
+class FakeRequest:
+    def __init__(self, client, endpoint, fn, params):
+        self.client, self.endpoint, self.fn = client, endpoint, fn
+        self.fields = params.get("fields")
+        self.uri = f"https://fake.youtube/{endpoint.replace('.', '/')}?" + urlencode({k: v for k, v in params.items() if v is not None})
+        self.headers = {}
+
+    def execute(self, **kwargs):
+        if self.client.latency: time.sleep(self.client.latency)
+        res = self.fn()
+        res["etag"] = hashlib.md5(json.dumps(res, sort_keys=True).encode("utf-8")).hexdigest()
+        if self.fields and self.client.honor_fields: res = apply_fields(res, parse_fields(self.fields))
+        with self.client._lock:
+            self.client.calls.append(self.endpoint)
+            if self.headers.get("If-None-Match") and self.headers["If-None-Match"] == res.get("etag"):
+                self.client.not_modified += 1
+                raise HttpError(httplib2.Response({"status": 304}), b"")
+        payload = json.dumps(res).encode("utf-8")
+        with self.client._lock:
+            self.client.bytes += len(payload)
+        return json.loads(payload)
+
+
+class FakeResource:
+    def __init__(self, client, name):
+        self.client, self.name = client, name
+
+    def list(self, **kwargs):
+        handler = getattr(self.client, "_" + self.name)
+        return FakeRequest(self.client, self.name + ".list", lambda: handler(**kwargs), kwargs)
+
+
+class FakeYouTube:
+    def __init__(self, videos, channels, cap=0, latency=0.0, honor_fields=True):
+        # cap = batas total hasil search (YouTube asli ~500), 0 = tanpa batas
+        # latency = detik per request, untuk meniru round-trip jaringan
+        # honor_fields=False: abaikan fields= (pembanding payload penuh)
+        self.vdb = {v["id"]: v for v in videos}
+        self.cdb = {c["id"]: c for c in channels}
+        self.cap = cap
+        self.latency = latency
+        self.honor_fields = honor_fields
+        self.calls = []
+        self.not_modified = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self.by_views = sorted(self.vdb.values(), key=lambda v: -int(v["statistics"].get("viewCount", 0)))
+        self.by_channel = {}
+        for v in sorted(self.vdb.values(), key=lambda v: v["snippet"]["publishedAt"], reverse=True):
+            self.by_channel.setdefault(v["snippet"]["channelId"], []).append(v)
+
+    # --- data ---
+    @classmethod
+    def synthetic(cls, n_videos=4000, n_channels=400, seed=1, **kwargs):
+        rnd = random.Random(seed)
+        now = datetime.now(timezone.utc)
+        channels = []
+        for c in range(n_channels):
+            cid = f"UC{c:022d}"
+            desc = "desc " * rnd.randint(1, 50)
+            channels.append({
+                "kind": "youtube#channel", "id": cid,
+                "snippet": {"title": f"Channel {c}", "description": desc, "customUrl": f"@channel{c}", "publishedAt": "2015-01-01T00:00:00Z",
+                            "thumbnails": thumbnails(f"https://yt3.ggpht.com/{cid}"), "localized": {"title": f"Channel {c}", "description": desc}, "country": "ID"},
+                "statistics": {"subscriberCount": str(rnd.randint(10, 5_000_000)), "hiddenSubscriberCount": rnd.random() < 0.05,
+                               "viewCount": str(rnd.randint(1000, 10**9)), "videoCount": str(rnd.randint(1, 3000))},
+                "brandingSettings": {"channel": {"title": f"Channel {c}", "description": desc, "keywords": "music \"lofi beats\" relax", "country": "ID"},
+                                     "image": {"bannerExternalUrl": f"https://yt3.googleusercontent.com/{cid}-banner"}},
+                "contentDetails": {"relatedPlaylists": {"likes": "", "uploads": "UU" + cid[2:]}},
+            })
+        videos = []
+        for v in range(n_videos):
+            vid = f"v{v:010d}"
+            ch = rnd.choice(channels)
+            tags = [" ".join(rnd.sample(WORDS, rnd.choice([1, 1, 2, 2, 3]))) for _ in range(rnd.randint(0, 25))]
+            if rnd.random() < 0.2: tags.append("Official Video HD")
+            sec = rnd.choice([rnd.randint(10, 239), rnd.randint(240, 1200), rnd.randint(1201, 12 * 3600)])
+            title = " ".join(rnd.sample(WORDS, 5)).title() + " &amp; more"
+            desc = "lorem " * rnd.randint(5, 200)
+            videos.append({
+                "kind": "youtube#video", "id": vid,
+                "snippet": {"title": title, "channelId": ch["id"], "channelTitle": ch["snippet"]["title"],
+                            "description": desc, "tags": tags,
+                            "publishedAt": (now - timedelta(days=rnd.random() * 40)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                            "thumbnails": thumbnails(f"https://i.ytimg.com/vi/{vid}"), "liveBroadcastContent": "none",
+                            "categoryId": "10", "defaultAudioLanguage": "id", "localized": {"title": title, "description": desc}},
+                "statistics": {"viewCount": str(int(rnd.paretovariate(1.2) * 1000)), "likeCount": str(rnd.randint(0, 5000)), "favoriteCount": "0", "commentCount": str(rnd.randint(0, 500))},
+                "contentDetails": {"duration": to_iso_duration(sec), "dimension": "2d", "definition": "hd", "caption": "false",
+                                   "licensedContent": True, "contentRating": {}, "projection": "rectangular"},
+            })
+        return cls(videos, channels, **kwargs)
+
+    @classmethod
+    def from_fixture(cls, path, **kwargs):
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(data["videos"], data["channels"], **kwargs)
+
+    def save_fixture(self, path):
+        with open(path, "w") as f:
+            json.dump({"videos": list(self.vdb.values()), "channels": list(self.cdb.values())}, f)
+
+    # --- resource API ---
+    def search(self): return FakeResource(self, "search")
+    def videos(self): return FakeResource(self, "videos")
+    def channels(self): return FakeResource(self, "channels")
+    def playlistItems(self): return FakeResource(self, "playlistItems")
+
+    def _search(self, part="snippet", q=None, publishedAfter=None, publishedBefore=None, maxResults=5, pageToken=None, channelId=None, videoDuration=None, **kwargs):
+        res = self.by_channel.get(channelId, []) if channelId else self.by_views
+        if channelId: res = sorted(res, key=lambda v: -int(v["statistics"].get("viewCount", 0)))
+        if publishedAfter: res = [v for v in res if v["snippet"]["publishedAt"] >= publishedAfter[:19]]
+        if publishedBefore: res = [v for v in res if v["snippet"]["publishedAt"] < publishedBefore[:19]]
+        if videoDuration and videoDuration != "any":
+            lo, hi = DURATION_BUCKETS[videoDuration]
+            res = [v for v in res if lo <= duration_seconds(v["contentDetails"]["duration"]) <= hi]
+        total = len(res)
+        if self.cap: res = res[:self.cap]
+        off = int(pageToken or 0)
+        items = []
+        for v in res[off:off + maxResults]:
+            it = {"kind": "youtube#searchResult", "etag": v["id"][::-1], "id": {"kind": "youtube#video", "videoId": v["id"]}}
+            if "snippet" in part:
+                it["snippet"] = {k: v["snippet"][k] for k in ("publishedAt", "channelId", "title", "description", "thumbnails", "channelTitle", "liveBroadcastContent")}
+                it["snippet"]["description"] = it["snippet"]["description"][:160]
+                it["snippet"]["thumbnails"] = {k: t for k, t in it["snippet"]["thumbnails"].items() if k in ("default", "medium", "high")}
+                it["snippet"]["publishTime"] = v["snippet"]["publishedAt"]
+            items.append(it)
+        out = {"kind": "youtube#searchListResponse", "regionCode": "ID", "pageInfo": {"totalResults": total, "resultsPerPage": maxResults}, "items": items}
+        if off + maxResults < len(res): out["nextPageToken"] = str(off + maxResults)
+        return out
+
+    def _videos(self, part="", id="", **kwargs):
+        parts = part.split(",")
+        items = []
+        for vid in id.split(","):
+            v = self.vdb.get(vid)
+            if v: items.append(json.loads(json.dumps({"id": vid, **{p: v[p] for p in parts if p in v}})))
+        return {"kind": "youtube#videoListResponse", "items": items}
+
+    def _channels(self, part="", id="", **kwargs):
+        parts = part.split(",")
+        items = []
+        for cid in id.split(","):
+            c = self.cdb.get(cid)
+            if c: items.append(json.loads(json.dumps({"id": cid, **{p: c[p] for p in parts if p in c}})))
+        return {"kind": "youtube#channelListResponse", "items": items}
+
+    def _playlistItems(self, part="", playlistId="", maxResults=5, pageToken=None, **kwargs):
+        vids = self.by_channel.get("UC" + playlistId[2:], [])
+        off = int(pageToken or 0)
+        out = {
+            "kind": "youtube#playlistItemListResponse",
+            "items": [{"kind": "youtube#playlistItem", "id": "PL" + v["id"], "contentDetails": {"videoId": v["id"], "videoPublishedAt": v["snippet"]["publishedAt"]}} for v in vids[off:off + maxResults]],
+            "pageInfo": {"totalResults": len(vids)},
+        }
+        if off + maxResults < len(vids): out["nextPageToken"] = str(off + maxResults)
+        return out
+
+
+class FakeClientPool:
+    # Pengganti YouTubeClientPool: semua key memakai client lokal yang sama
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, api_key):
+        return self.client
+
+    def by_index(self, api_keys_list, idx):
+        return self.client
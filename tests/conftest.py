@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fake_youtube import FakeYouTube, FakeClientPool
+from ytintel.api import YouTubeGateway
+from ytintel.cache import EtagCache, MetadataCache
+from ytintel.quota import ApiKeyScheduler
+
+# ==========================================
+# FIXTURE: GATEWAY + CACHE DI ATAS FAKE YOUTUBE
+# ==========================================
+# Request dijawab stand-in client benchmark (tanpa jaringan & kuota); cache
+# metadata, ETag dan state kuota ditulis ke tmp_path.
+API_KEYS = ["TEST-KEY-1", "TEST-KEY-2"]
+
+
+class Workspace:
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self.keys = API_KEYS
+        self._caches = []
+        self.cache = self.new_cache()
+        self.etags = EtagCache(os.path.join(path, "etag.db"))
+        self.gateway = YouTubeGateway(pool=FakeClientPool(client), scheduler=ApiKeyScheduler(os.path.join(path, "quota.json")), etags=self.etags)
+
+    def new_cache(self):
+        # Cache metadata kosong (pembanding run "segar")
+        cache = MetadataCache(os.path.join(self.path, f"cache{len(self._caches)}.db"))
+        self._caches.append(cache)
+        return cache
+
+    def calls(self):
+        # Jumlah request API sejak pemanggilan terakhir
+        n = len(self.client.calls)
+        self.client.calls.clear()
+        return n
+
+    def close(self):
+        self.gateway._executor.shutdown(wait=True)
+        self.gateway.scheduler.flush()
+        for cache in self._caches: cache._conn.close()
+        self.etags._conn.close()
+
+
+@pytest.fixture
+def ws(tmp_path):
+    workspace = Workspace(FakeYouTube.synthetic(n_videos=1500, n_channels=150, seed=3), str(tmp_path))
+    yield workspace
+    workspace.close()
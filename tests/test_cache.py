@@ -0,0 +1,70 @@
+import pytest
+
+from ytintel import cache as cache_mod
+from ytintel.cache import MetadataCache
+
+# ==========================================
+# METADATA CACHE: TTL STATIC/VOLATILE, SWEEP & LRU
+# ==========================================
+def video(vid, views=100):
+    return {"id": vid, "snippet": {"title": f"Judul {vid}"}, "contentDetails": {"duration": "PT10M"}, "statistics": {"viewCount": str(views)}}
+
+
+def ids_in(cache, kind="videos"):
+    return {row[0] for row in cache._conn.execute(f"SELECT id FROM {kind}")}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_fresh_stale_missing_by_part_ttl(path):
+    MetadataCache(path).store("videos", [video("a")])
+    fresh, stale, missing = MetadataCache(path).lookup("videos", ["a", "b"])
+    assert list(fresh) == ["a"] and not stale and missing == ["b"]
+    # Statistik basi: snippet tetap dipakai, cuma volatile yang di-refresh
+    fresh, stale, missing = MetadataCache(path, volatile_ttl=-1).lookup("videos", ["a"])
+    assert not fresh and stale["a"]["snippet"]["title"] == "Judul a" and "statistics" not in stale["a"]
+    fresh, stale, missing = MetadataCache(path, static_ttl=-1).lookup("videos", ["a"])
+    assert missing == ["a"]
+
+
+def test_statistics_refresh_keeps_static_part(path):
+    cache = MetadataCache(path)
+    cache.store("videos", [video("a")])
+    cache.store("videos", [{"id": "a", "statistics": {"viewCount": "999"}}])
+    fresh, _, _ = cache.lookup("videos", ["a"])
+    assert fresh["a"]["statistics"]["viewCount"] == "999" and fresh["a"]["snippet"]["title"] == "Judul a"
+
+
+def test_lookup_of_recent_rows_does_not_write(path):
+    cache = MetadataCache(path)
+    cache.store("videos", [video(v) for v in "abc"])
+    before = cache._conn.total_changes
+    for _ in range(10): cache.lookup("videos", list("abc"))
+    assert cache._conn.total_changes == before
+
+
+def test_ttl_sweep_runs_every_n_stores(path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "EVICT_EVERY", 2)
+    cache = MetadataCache(path)
+    cache.store("videos", [video("old")])
+    cache._conn.execute("UPDATE videos SET static_at=0 WHERE id='old'")
+    cache._conn.commit()
+    cache.store("videos", [video("new")])
+    assert ids_in(cache) == {"new"}
+    assert cache._rows["videos"] == 1
+
+
+def test_lru_eviction_uses_pending_touches(path):
+    cache = MetadataCache(path, max_entries=3)
+    cache.store("videos", [video(v) for v in "abc"])
+    for i, vid in enumerate("abc"):
+        cache._conn.execute("UPDATE videos SET accessed=? WHERE id=?", (i + 1, vid))
+    cache._conn.commit()
+    # "a" dibaca (waktu akses tertunda di memori), lalu store baru lewat batas
+    cache.lookup("videos", ["a"])
+    cache.store("videos", [video("d")])
+    assert ids_in(cache) == {"a", "c", "d"}
+    assert cache._rows["videos"] == 3
@@ -0,0 +1,48 @@
+import zipfile
+
+import pandas as pd
+
+from ytintel import results
+from ytintel.enrich import fetch_videos
+from ytintel.export import write_export_zip
+from ytintel.store import AppStore
+
+# ==========================================
+# EXPORT ZIP: TEKS PER CHUNK, HISTORY SEKALI TULIS
+# ==========================================
+def test_iter_with_text_loads_text_per_chunk(ws, monkeypatch):
+    ids = list(ws.client.vdb)[:120]
+    fetch_videos(ws.gateway, ws.cache, ws.keys, ids)
+    df = pd.DataFrame({"VideoId": ids, "Judul Video": ids}, index=range(10, 130))
+    sizes = []
+    load_text = results.load_text
+    monkeypatch.setattr(results, "load_text", lambda gw, cache, keys, video_ids: sizes.append(len(video_ids)) or load_text(gw, cache, keys, video_ids))
+
+    rows = results.iter_with_text(ws.gateway, ws.cache, ws.keys, df, chunk=50)
+    first_idx, first = next(rows)
+    # Chunk berikutnya baru diambil saat baris-barisnya dibutuhkan
+    assert sizes == [50]
+    rest = list(rows)
+    assert sizes == [50, 50, 20]
+    assert [first_idx] + [i for i, _ in rest] == list(df.index)
+    assert first["Deskripsi"] == ws.client.vdb[ids[0]]["snippet"]["description"]
+    assert first["Tags List"] == ws.client.vdb[ids[0]]["snippet"]["tags"]
+
+
+def test_zip_from_chunked_rows(ws, tmp_path):
+    ids = list(ws.client.vdb)[:60]
+    fetch_videos(ws.gateway, ws.cache, ws.keys, ids)
+    df = pd.DataFrame({"VideoId": ids})
+    meta = lambda row: {"title": row["VideoId"], "chan": "Chan", "link": "", "tags": ", ".join(row["Tags List"]), "desc": row["Deskripsi"]}
+    with open(tmp_path / "out.zip", "w+b") as f:
+        write_export_zip(((meta(r), None) for _, r in results.iter_with_text(ws.gateway, ws.cache, ws.keys, df)), f)
+        names = zipfile.ZipFile(f).namelist()
+    assert len(names) == 60
+
+
+def test_mark_many_downloaded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = AppStore("app.db")
+    store.mark_many_downloaded([(f"v{i}", f"Judul {i}") for i in range(100)])
+    history = store.download_history(["v0", "v99", "x"])
+    assert history.keys() == {"v0", "v99"} and history["v99"]["title"] == "Judul 99"
@@ -0,0 +1,43 @@
+from ytintel import telemetry
+
+# ==========================================
+# GATEWAY: IF-NONE-MATCH / 304 DARI ETAG CACHE
+# ==========================================
+def videos_request(ids):
+    return lambda yt: yt.videos().list(part="snippet,statistics", id=",".join(ids))
+
+
+def spent(ws):
+    return sum(row["spent"] for row in ws.gateway.scheduler.snapshot(ws.keys))
+
+
+def test_unchanged_response_is_served_from_etag_cache(ws):
+    ids = list(ws.client.vdb)[:3]
+    first, _ = ws.gateway.call(ws.keys, "videos.list", videos_request(ids))
+    trace = telemetry.ScanTrace("test", etags=ws.etags)
+    with telemetry.tracing(trace):
+        second, idx = ws.gateway.call(ws.keys, "videos.list", videos_request(ids))
+    assert second == first and idx is not None
+    assert ws.client.not_modified == 1
+    assert ws.etags.stats()["not_modified"] == 1
+    assert trace.endpoints["videos.list"]["not_modified"] == 1
+    # 304 tetap makan kuota
+    assert spent(ws) == 2
+
+
+def test_changed_response_replaces_cached_body(ws):
+    vid = list(ws.client.vdb)[0]
+    ws.gateway.call(ws.keys, "videos.list", videos_request([vid]))
+    ws.client.vdb[vid]["statistics"]["viewCount"] = "123456789"
+    res, _ = ws.gateway.call(ws.keys, "videos.list", videos_request([vid]))
+    assert res["items"][0]["statistics"]["viewCount"] == "123456789"
+    assert ws.client.not_modified == 0
+    again, _ = ws.gateway.call(ws.keys, "videos.list", videos_request([vid]))
+    assert again == res and ws.client.not_modified == 1
+
+
+def test_search_is_never_conditional(ws):
+    search = lambda yt: yt.search().list(part="snippet", q="musik", maxResults=5)
+    for _ in range(2): ws.gateway.call(ws.keys, "search.list", search)
+    assert ws.client.not_modified == 0
+    assert ws.etags.stats()["conditional"] == 0
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from ytintel.api import cancellation
+from ytintel.enrich import chunked, fetch_videos
+from ytintel.jobs import JobRunner, CANCELLED, DONE, FAILED
+
+# ==========================================
+# JOB RUNNER: STATUS & PEMBATALAN
+# ==========================================
+def wait(job, timeout=10):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline: time.sleep(0.01)
+    return job.status
+
+
+def test_done_and_failed_jobs():
+    runner = JobRunner(max_workers=1)
+    assert wait(runner.submit("t", "", lambda job, x: x * 2, 21)) == DONE
+    failed = runner.submit("t", "", lambda job: 1 / 0)
+    assert wait(failed) == FAILED and "ZeroDivisionError" in failed.error
+
+
+def test_cancel_queued_job_never_runs():
+    runner = JobRunner(max_workers=1)
+    gate = threading.Event()
+    ran = []
+    blocker = runner.submit("t", "", lambda job: gate.wait(5))
+    queued = runner.submit("t", "", lambda job: ran.append(1))
+    runner.cancel(queued.id)
+    assert queued.status == CANCELLED
+    gate.set()
+    assert wait(blocker) == DONE and wait(queued) == CANCELLED and not ran
+
+
+def test_cancel_running_job_at_update():
+    runner = JobRunner(max_workers=1)
+
+    def loop(job):
+        while True:
+            job.update(message="jalan")
+            time.sleep(0.01)
+
+    job = runner.submit("t", "", loop)
+    while job.status != "running": time.sleep(0.01)
+    runner.cancel(job.id)
+    assert wait(job) == CANCELLED
+
+
+def test_cancel_during_enrichment_fan_out(ws):
+    # Batal di tengah call_many: chunk yang belum jalan tidak di-request
+    ws.client.latency = 0.05
+    ids = list(ws.client.vdb)
+    started = threading.Event()
+
+    def enrich(job):
+        with cancellation(job.update):
+            started.set()
+            return fetch_videos(ws.gateway, ws.cache, ws.keys, ids)
+
+    runner = JobRunner(max_workers=1)
+    job = runner.submit("t", "", enrich)
+    started.wait(5)
+    time.sleep(0.08)
+    runner.cancel(job.id)
+    assert wait(job) == CANCELLED
+    time.sleep(0.2)
+    assert len(ws.client.calls) < len(chunked(ids))
@@ -0,0 +1,35 @@
+import pytest
+
+from bench_keywords import legacy_aggregate_keywords, legacy_backfill_one_word_keywords, make_items
+from ytintel.keywords import aggregate_keywords, backfill_one_word_keywords
+
+# ==========================================
+# AGREGASI KEYWORD KOLOMNAR == LOOP LAMA
+# ==========================================
+# Referensi loop lama ada di benchmarks/bench_keywords.py
+
+
+@pytest.mark.parametrize("target_counts", [[1], [2], [3], [1, 2], [1, 2, 3]])
+@pytest.mark.parametrize("seed", [1, 7])
+def test_aggregate_matches_legacy_loop(target_counts, seed):
+    items = make_items(300, seed=seed, max_tags=30)
+    assert aggregate_keywords(items, target_counts) == legacy_aggregate_keywords(items, target_counts)
+
+
+def test_aggregate_edge_cases():
+    assert aggregate_keywords([], [1, 2, 3]) == legacy_aggregate_keywords([], [1, 2, 3]) == []
+    # Tanpa tags, views/likes kosong, tag cuma spasi
+    items = [{"id": f"v{i}", "snippet": {"title": "Lagu Santai Malam Hari"}, "statistics": {}} for i in range(3)]
+    items += [{"id": "w", "snippet": {"title": "x", "tags": ["   ", "Lagu"]}, "statistics": {"viewCount": "10"}}]
+    assert aggregate_keywords(items, [1, 2, 3]) == legacy_aggregate_keywords(items, [1, 2, 3])
+
+
+def test_backfill_matches_legacy():
+    stats = {
+        "lofi beats": {'count': 5, 'total_views': 5000, 'total_likes': 50, 'len': 2},
+        "lofi study music": {'count': 4, 'total_views': 8000, 'total_likes': 10, 'len': 3},
+        "the official mv": {'count': 9, 'total_views': 900, 'total_likes': 9, 'len': 3},
+        "rare pair": {'count': 2, 'total_views': 10**6, 'total_likes': 0, 'len': 2},
+        "study": {'count': 3, 'total_views': 30, 'total_likes': 3, 'len': 1},
+    }
+    assert backfill_one_word_keywords(dict(stats)) == legacy_backfill_one_word_keywords(dict(stats))
@@ -0,0 +1,14 @@
+from ytintel import cli, scan, seo
+
+
+# ==========================================
+# LABEL MODE: UI, CLI & TARGET FETCH SEO
+# ==========================================
+def test_cli_modes_use_app_labels():
+    assert list(cli.MODES.values()) == list(scan.SCAN_LIMITS)
+
+
+def test_every_mode_has_its_own_seo_target():
+    targets = [seo.research_target_count(label) for label in scan.SCAN_LIMITS]
+    assert targets == sorted(targets)
+    assert len(set(targets)) == len(targets)
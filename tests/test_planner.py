@@ -0,0 +1,73 @@
+import pytest
+
+from ytintel import planner, seo
+from ytintel.enrich import fetch_channel_stats, fetch_videos
+
+# ==========================================
+# QUERY PLANNER: PILIHAN URUTAN & ENRICHMENT
+# ==========================================
+N_CANDIDATES = 200
+
+
+def candidates(ws, n=N_CANDIDATES):
+    superset = planner.new_superset()
+    planner.add_candidates(superset, [{'id': {'videoId': v['id']}, 'snippet': {'channelId': v['snippet']['channelId']}} for v in ws.client.by_views[:n]])
+    return superset
+
+
+def test_single_allowed_order_skips_estimation(ws):
+    superset = candidates(ws)
+    order, costs = planner.plan_order(ws.cache, superset, superset['order'], lambda it: True, lambda subs: True, allowed=(planner.VIDEOS_FIRST,))
+    assert order == planner.VIDEOS_FIRST and costs == {}
+
+
+def test_cached_details_with_selective_video_filter_pick_videos_first(ws):
+    superset = candidates(ws)
+    fetch_videos(ws.gateway, ws.cache, ws.keys, superset['order'])
+    order, costs = planner.plan_order(ws.cache, superset, superset['order'], lambda it: False, lambda subs: True, default=planner.CHANNELS_FIRST)
+    assert order == planner.VIDEOS_FIRST
+    assert costs[planner.VIDEOS_FIRST] == 0 < costs[planner.CHANNELS_FIRST]
+
+
+def test_cached_channels_with_selective_subs_filter_pick_channels_first(ws):
+    superset = candidates(ws)
+    fetch_channel_stats(ws.gateway, ws.cache, ws.keys, list(set(superset['channel_of'].values())))
+    order, costs = planner.plan_order(ws.cache, superset, superset['order'], lambda it: True, lambda subs: False, default=planner.VIDEOS_FIRST)
+    assert order == planner.CHANNELS_FIRST
+    assert costs[planner.CHANNELS_FIRST] == 0 < costs[planner.VIDEOS_FIRST]
+
+
+def test_channels_first_skips_details_of_blocked_channels(ws):
+    superset = candidates(ws)
+    max_subs = 500000
+    passed = planner.enrich(ws.gateway, ws.cache, ws.keys, superset, superset['order'], planner.CHANNELS_FIRST,
+                            lambda it: True, lambda subs: subs <= max_subs, seo.slim_item)
+    blocked = [vid for vid in superset['order'] if superset['subs'].get(superset['channel_of'][vid], 0) > max_subs]
+    assert blocked and passed
+    assert superset['videos_checked'] == set(passed)
+    assert not superset['videos_checked'] & set(blocked)
+    assert superset['seen']['channels'] == [len(passed), N_CANDIDATES]
+
+
+def test_videos_first_fetches_channels_only_for_passing_videos(ws):
+    superset = candidates(ws)
+    min_views = 5000
+    video_ok = lambda it: int(it['statistics'].get('viewCount', 0)) >= min_views
+    passed = planner.enrich(ws.gateway, ws.cache, ws.keys, superset, superset['order'], planner.VIDEOS_FIRST, video_ok, lambda subs: True, seo.slim_item)
+    assert superset['videos_checked'] == set(superset['order'])
+    assert superset['channels_checked'] == {superset['channel_of'][vid] for vid in passed}
+    assert planner.skipped(superset) == (0, len(set(superset['channel_of'].values()) - superset['channels_checked']))
+
+
+@pytest.mark.parametrize("max_subs,min_views", [(100000, 50000), (2000000, 1000), (500, 0)])
+def test_seo_funnel_adds_up_in_either_order(ws, monkeypatch, max_subs, min_views):
+    # Kandidat yang gugur di tahap pertama tetap terhitung di salah satu counter
+    funnels = {}
+    for order in (planner.VIDEOS_FIRST, planner.CHANNELS_FIRST):
+        monkeypatch.setattr(planner, "plan_order", lambda *args, order=order, **kwargs: (order, {}))
+        superset = seo.search_candidates(ws.gateway, ws.new_cache(), ws.keys, "musik", 30, max_subs, min_views, 300, "⚖️ Sedang")
+        _, debug = seo.refilter(superset, max_subs, min_views, 300, [])
+        assert debug['blocked_duration'] + debug['blocked_views'] + debug['blocked_subs'] + debug['passed_final'] == debug['total_found_search']
+        funnels[order] = (debug['passed_final'], debug['blocked_subs_unchecked'])
+    assert funnels[planner.VIDEOS_FIRST][0] == funnels[planner.CHANNELS_FIRST][0]
+    assert funnels[planner.VIDEOS_FIRST][1] == 0
@@ -0,0 +1,80 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from ytintel import quota
+from ytintel.quota import ApiKeyScheduler, key_fingerprint, next_quota_reset, pacific_day
+
+# ==========================================
+# KEY SCHEDULER: DELTA DI MEMORI, FLUSH, RESET HARIAN
+# ==========================================
+KEY = "TEST-KEY-1"
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    # Flush & sync cuma saat diminta test (bukan karena waktu)
+    monkeypatch.setattr(quota, "FLUSH_INTERVAL", 3600)
+    monkeypatch.setattr(quota, "SYNC_INTERVAL", 0)
+    return str(tmp_path / "quota.json")
+
+
+def disk_spent(path, api_key=KEY):
+    with open(path) as f:
+        return json.load(f)["keys"][key_fingerprint(api_key)]["spent"]
+
+
+def test_charge_stays_in_memory_until_flush(state_file):
+    sched = ApiKeyScheduler(state_file)
+    for _ in range(5): sched.charge(KEY, 100)
+    assert sched.headroom(KEY) == quota.DAILY_QUOTA - 500
+    assert not os.path.exists(state_file)
+    sched.flush()
+    assert disk_spent(state_file) == 500
+
+
+def test_two_processes_add_their_deltas(state_file):
+    a, b = ApiKeyScheduler(state_file), ApiKeyScheduler(state_file)
+    a.charge(KEY, 100)
+    b.charge(KEY, 300)
+    a.flush()
+    b.flush()
+    a.charge(KEY, 1)
+    a.flush()
+    assert disk_spent(state_file) == 401
+    assert a.headroom(KEY) == quota.DAILY_QUOTA - 401
+
+
+def test_quota_error_cools_key_down_until_reset(state_file):
+    sched = ApiKeyScheduler(state_file)
+    sched.penalize(KEY, 403, "quotaExceeded")
+    assert sched.headroom(KEY) == 0
+    assert sched.pick([KEY, "TEST-KEY-2"]) == 1
+    assert disk_spent(state_file) == quota.DAILY_QUOTA
+
+
+def test_pacific_day_boundary():
+    assert pacific_day(datetime(2026, 1, 15, 7, 59, tzinfo=timezone.utc)) == "2026-01-14"
+    assert pacific_day(datetime(2026, 1, 15, 8, 0, tzinfo=timezone.utc)) == "2026-01-15"
+    assert next_quota_reset(datetime(2026, 1, 15, 7, 59, tzinfo=timezone.utc)) == datetime(2026, 1, 15, 8, 0, tzinfo=timezone.utc).timestamp()
+
+
+def test_day_rollover_drops_yesterdays_deltas(state_file, monkeypatch):
+    day = {"now": "2026-01-14"}
+    monkeypatch.setattr(quota, "pacific_day", lambda now=None: day["now"])
+    sched = ApiKeyScheduler(state_file)
+    sched.charge(KEY, 900)
+    # Delta kemarin yang sedang ditulis flush() saat tengah malam lewat
+    sched._inflight = {key_fingerprint(KEY): {"spent": 5000}}
+    day["now"] = "2026-01-15"
+    assert sched.headroom(KEY) == quota.DAILY_QUOTA
+    # Proses lain menulis spend hari ini -> rebase tidak membawa delta kemarin
+    other = ApiKeyScheduler(state_file)
+    other.charge(KEY, 100)
+    other.flush()
+    os.utime(state_file, (os.path.getmtime(state_file) + 5,) * 2)
+    assert sched.headroom(KEY) == quota.DAILY_QUOTA - 100
+    sched.flush()
+    assert disk_spent(state_file) == 100
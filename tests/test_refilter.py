@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from ytintel import planner, scan, seo
+
+# ==========================================
+# REFILTER SUPERSET == SCAN ULANG DENGAN FILTER BARU
+# ==========================================
+# Superset dibangun dengan filter A, lalu dilengkapi + di-refilter dengan
+# filter B; hasilnya harus sama dengan scan segar (cache kosong) pakai B.
+# Durasi tetap di kategori videoDuration yang sama (kunci cache hasil).
+SCAN_FILTERS = [
+    # (max_subs, min_views, min_sec, max_sec): A -> B
+    ((2000000, 50000, 300, 3600), (0, 1000, 300, 3600)),
+    ((0, 1000, 300, 3600), (2000000, 50000, 300, 3600)),
+    ((100000, 0, 300, 3600), (4000000, 0, 300, 3600)),
+]
+SEO_FILTERS = [
+    # (max_subs, min_views, min_sec): A -> B
+    ((2000000, 50000, 300), (0, 1000, 300)),
+    ((0, 1000, 300), (2000000, 50000, 300)),
+    ((500, 0, 300), (3000000, 0, 300)),
+]
+LENGTHS = ["1 Kata", "3+ Kata"]
+
+
+def comparable(rows):
+    # Tags & deskripsi tidak ikut frame hasil (diambil belakangan)
+    return sorted(json.dumps({k: v for k, v in r.items() if k not in ("Tags List", "Deskripsi")}, sort_keys=True) for r in rows)
+
+
+def scan_rows(ws, cache, filters, superset=None):
+    max_subs, min_views, min_sec, max_sec = filters
+    pages = scan.iter_viral_videos(ws.gateway, cache, ws.keys, "musik", max_subs, min_views, 30, 500, min_sec, max_sec, report={}, superset=superset)
+    return [row for rows, _ in pages for row in rows]
+
+
+@pytest.mark.parametrize("built,wanted", SCAN_FILTERS)
+def test_scan_refilter_matches_fresh_scan(ws, built, wanted):
+    superset = planner.new_superset()
+    scan_rows(ws, ws.cache, built, superset)
+    ws.calls()
+    completed, _ = scan.complete_superset(ws.gateway, ws.cache, ws.keys, superset, *wanted)
+    rows, _ = scan.select_rows(completed, completed['order'], *wanted)
+    assert comparable(rows) == comparable(scan_rows(ws, ws.new_cache(), wanted))
+
+
+def test_scan_refilter_tighter_filter_needs_no_api(ws):
+    superset = planner.new_superset()
+    scan_rows(ws, ws.cache, (0, 1000, 300, 3600), superset)
+    ws.calls()
+    completed, fetched = scan.complete_superset(ws.gateway, ws.cache, ws.keys, superset, 2000000, 50000, 300, 3600)
+    assert fetched == 0 and ws.calls() == 0
+    assert completed is superset
+
+
+def test_complete_superset_does_not_touch_cached_superset(ws):
+    superset = planner.new_superset()
+    scan_rows(ws, ws.cache, (100000, 50000, 300, 3600), superset)
+    checked = set(superset['videos_checked'])
+    completed, fetched = scan.complete_superset(ws.gateway, ws.cache, ws.keys, superset, 0, 0, 300, 3600)
+    assert fetched > 0
+    assert superset['videos_checked'] == checked
+    assert completed['videos_checked'] > checked
+
+
+@pytest.mark.parametrize("built,wanted", SEO_FILTERS)
+def test_seo_refilter_matches_fresh_analysis(ws, built, wanted):
+    superset = seo.search_candidates(ws.gateway, ws.cache, ws.keys, "musik", 30, *built, "⚖️ Sedang")
+    completed, _ = seo.complete_superset(ws.gateway, ws.cache, ws.keys, superset, *wanted)
+    got, got_debug = seo.refilter(completed, *wanted, LENGTHS)
+    fresh, fresh_debug = seo.analyze_viral_seo(ws.gateway, ws.new_cache(), ws.keys, "musik", 30, *wanted, "⚖️ Sedang", LENGTHS)
+    assert json.dumps(got) == json.dumps(fresh)
+    assert got_debug['auto_rescued'] == fresh_debug['auto_rescued']
+
+
+def test_seo_refilter_reports_its_own_run(ws):
+    superset = seo.search_candidates(ws.gateway, ws.cache, ws.keys, "musik", 30, 100000, 50000, 300, "⚖️ Sedang")
+    top_up = {'timings': {}}
+    completed, top_up['topped_up'] = seo.complete_superset(ws.gateway, ws.cache, ws.keys, superset, 0, 0, 300, report=top_up)
+    _, debug = seo.refilter(completed, 0, 0, 300, LENGTHS, top_up=top_up)
+    assert debug['refiltered'] and debug['topped_up'] == top_up['topped_up'] > 0
+    assert debug['plan_order'] is None
+    assert 'search' not in debug['timings'] and 'filters' in debug['timings']
@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+
+import pytest
+
+from ytintel.store import AppStore, LEGACY_SETTINGS_FILE, LEGACY_HISTORY_FILE, LEGACY_SEARCH_LOG_FILE
+
+# ==========================================
+# MIGRASI JSON LAMA -> SQLITE
+# ==========================================
+LOG = [{"query": f"kata {i}", "mode": "Metadata", "time": "01/01 10:00"} for i in range(5)]
+
+
+@pytest.fixture
+def legacy_dir(tmp_path, monkeypatch):
+    # File JSON lama dibaca relatif ke direktori kerja, seperti di aplikasi
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_legacy():
+    files = [LEGACY_SETTINGS_FILE, LEGACY_HISTORY_FILE, LEGACY_SEARCH_LOG_FILE]
+    with open(LEGACY_SETTINGS_FILE, "w") as f: json.dump({"saved_max_subs": 5000}, f)
+    with open(LEGACY_HISTORY_FILE, "w") as f: json.dump({"abc": {"title": "Judul", "date": "2024-01-01 10:00:00"}}, f)
+    with open(LEGACY_SEARCH_LOG_FILE, "w") as f: json.dump(LOG, f)
+    return files
+
+
+def test_migrates_once_and_renames_files(legacy_dir):
+    files = write_legacy()
+    store = AppStore("app.db")
+    assert store.load_settings({})["saved_max_subs"] == 5000
+    assert store.download_history(["abc", "xyz"]) == {"abc": {"title": "Judul", "date": "2024-01-01 10:00:00"}}
+    assert [x["query"] for x in store.search_log()] == [x["query"] for x in LOG]
+    assert all(os.path.exists(p + ".migrated") and not os.path.exists(p) for p in files)
+    # Start berikutnya tidak memigrasi ulang walau file lama muncul lagi
+    write_legacy()
+    assert len(AppStore("app.db").search_log()) == len(LOG)
+
+
+def test_concurrent_startup_migrates_once(legacy_dir, monkeypatch):
+    # Dua proses start bersamaan (koneksi & lock sendiri-sendiri), keduanya
+    # sudah lewat cek marker sebelum ada yang menulis: cuma satu yang migrasi
+    write_legacy()
+    barrier = threading.Barrier(2)
+    read_legacy = AppStore._read_legacy
+
+    def racing_read(self, path, default):
+        if path == LEGACY_SETTINGS_FILE: barrier.wait(timeout=10)
+        return read_legacy(self, path, default)
+
+    monkeypatch.setattr(AppStore, "_read_legacy", racing_read)
+    stores, errors = [], []
+
+    def start():
+        try: stores.append(AppStore("app.db"))
+        except Exception as e: errors.append(e)
+
+    threads = [threading.Thread(target=start) for _ in range(2)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert not errors
+    assert len(stores[0].search_log(limit=100)) == len(LOG)
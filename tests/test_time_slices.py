@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+
+from ytintel import scan
+from ytintel.filters import time_windows
+
+# ==========================================
+# TIME SLICING: BUDGET HALAMAN PER SUB-WINDOW
+# ==========================================
+class RoundGateway:
+    # Stand-in gateway untuk search_rounds: request = (cursor, token), tiap
+    # cursor selalu punya halaman berikutnya yang penuh
+    def __init__(self):
+        self.requested = []
+
+    def call_many(self, api_keys_list, endpoint, requests):
+        self.requested.extend(key for key, _ in requests)
+        return [{'items': [{'id': {'videoId': f"{key}-{token}-{i}"}} for i in range(scan.PAGE_SIZE)], 'nextPageToken': f"{token or 0}+"} for key, token in requests]
+
+
+def run_rounds(keys, target_count):
+    gateway = RoundGateway()
+    for _ in scan.search_rounds(gateway, ["K"], lambda key, token: (key, token), keys, target_count, group=lambda key: 0): pass
+    return gateway.requested
+
+
+@pytest.mark.parametrize("slices,target", [(12, 50), (12, 500), (6, 1500), (3, 200)])
+def test_every_window_searched_when_budget_allows(slices, target):
+    windows = time_windows(30, slices, pages=scan.page_count(target))
+    assert len(windows) == min(slices, scan.page_count(target))
+    requested = run_rounds(list(range(len(windows))), target)
+    assert set(requested) == set(range(len(windows)))
+    assert len(requested) == scan.page_count(target)
+
+
+def test_small_budget_goes_to_newest_windows_first():
+    # Budget lebih kecil dari jumlah cursor: sub-window terbaru didahulukan
+    assert run_rounds(list(range(12)), 150) == [11, 10, 9]
+
+
+def test_extra_pages_spread_round_robin():
+    requested = run_rounds(list(range(4)), 50 * 6)
+    assert requested == [3, 2, 1, 0, 3, 2]
+
+
+def test_single_page_target_keeps_whole_window():
+    now = datetime(2026, 1, 15, 12, 0)
+    assert time_windows(30, 12, now=now, pages=1) == time_windows(30, 1, now=now)
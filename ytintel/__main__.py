@@ -0,0 +1,5 @@
+import sys
+
+from ytintel.cli import main
+
+sys.exit(main())
@@ -0,0 +1,273 @@
+import contextvars
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import httplib2
+import requests
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from ytintel.cache import EtagCache
+from ytintel.quota import QUOTA_COST, ApiKeyScheduler, http_error_reason
+from ytintel.telemetry import current_trace
+
+# ==========================================
+# YOUTUBE CLIENT POOL
+# ==========================================
+DISCOVERY_FILE = "youtube_v3_discovery.json"
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest"
+HTTP_TIMEOUT = 30
+
+
+def load_discovery_document(path=DISCOVERY_FILE):
+    # Urutan: file lokal -> dokumen statis bawaan library -> download
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except:
+            pass
+
+    content = discovery_cache.get_static_doc("youtube", "v3")
+    if not content:
+        try:
+            res = requests.get(DISCOVERY_URL, timeout=HTTP_TIMEOUT)
+            res.raise_for_status()
+            content = res.text
+        except:
+            return None
+
+    try:
+        doc = json.loads(content)
+    except:
+        return None
+    try:
+        with open(path, "w") as f:
+            f.write(content)
+    except:
+        pass
+    return doc
+
+
+class YouTubeClientPool:
+    # Satu client per API key per proses. Discovery document cukup di-parse
+    # sekali, dan koneksi HTTP disimpan per thread (httplib2.Http tidak
+    # thread-safe) supaya keep-alive tetap jalan antar request.
+
+    def __init__(self, discovery_file=DISCOVERY_FILE, timeout=HTTP_TIMEOUT):
+        self.discovery_file = discovery_file
+        self.timeout = timeout
+        self._discovery = None
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = httplib2.Http(timeout=self.timeout)
+            self._local.http = http
+        return http
+
+    def _request_builder(self, _http, *args, **kwargs):
+        # Abaikan http milik Resource, pakai koneksi warm milik thread ini
+        return HttpRequest(self._http(), *args, **kwargs)
+
+    def _build(self, api_key):
+        if self._discovery is None:
+            self._discovery = load_discovery_document(self.discovery_file)
+        if self._discovery:
+            return build_from_document(
+                self._discovery,
+                developerKey=api_key,
+                http=self._http(),
+                requestBuilder=self._request_builder
+            )
+        return build('youtube', 'v3', developerKey=api_key, http=self._http(), requestBuilder=self._request_builder)
+
+    def get(self, api_key):
+        api_key = api_key.strip()
+        client = self._clients.get(api_key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    client = self._build(api_key)
+                    self._clients[api_key] = client
+        return client
+
+    def by_index(self, api_keys_list, idx):
+        if idx >= len(api_keys_list): idx = 0
+        return self.get(api_keys_list[idx])
+
+
+# ==========================================
+# GATEWAY (POOL + SCHEDULER)
+# ==========================================
+ROTATE_STATUS = (403, 429, 500, 503)
+MAX_WORKERS = 8
+PER_KEY_CONCURRENCY = 4
+# Endpoint lookup per ID: respons sama persis antar scan -> layak If-None-Match
+CONDITIONAL_ENDPOINTS = ("videos.list", "channels.list", "playlistItems.list")
+
+
+_cancel_check = contextvars.ContextVar("ytintel_cancel_check", default=None)
+
+
+@contextmanager
+def cancellation(check):
+    # with cancellation(check): ... -> gateway memanggil check() sebelum tiap
+    # request dan di antara chunk call_many (thread worker ikut mewarisi lewat
+    # contextvars). Exception dari check (misal jobs.JobCancelled) menghentikan
+    # fan-out; chunk yang belum jalan dibatalkan, jadi tidak makan kuota lagi.
+    token = _cancel_check.set(check)
+    try:
+        yield
+    finally:
+        _cancel_check.reset(token)
+
+
+def check_cancelled():
+    check = _cancel_check.get()
+    if check: check()
+
+
+def request_fingerprint(uri):
+    # Identitas request tanpa API key (key beda, request tetap sama)
+    parts = urlsplit(uri)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if k != "key"])
+    return hashlib.sha256(f"{parts.path}?{query}".encode("utf-8")).hexdigest()
+
+
+class YouTubeGateway:
+    # Satu pintu untuk semua request API: pilih key lewat scheduler,
+    # ambil client warm dari pool, catat biaya unit, rotasi saat 403/429/5xx.
+    # Batch request (videos/channels per 50 ID) bisa dikirim paralel lewat
+    # call_many, dibatasi jumlah request in-flight per key.
+    # Request ke CONDITIONAL_ENDPOINTS dikirim dengan If-None-Match (ETag dari
+    # respons sebelumnya); 304 dijawab dari EtagCache.
+    # Kalau ada ScanTrace aktif (telemetry.tracing), tiap request dicatat ke sana.
+
+    def __init__(self, pool=None, scheduler=None, max_workers=MAX_WORKERS, per_key_limit=PER_KEY_CONCURRENCY, etags=None):
+        self.pool = pool or YouTubeClientPool()
+        self.scheduler = scheduler or ApiKeyScheduler()
+        self.etags = etags if etags is not None else EtagCache()
+        self.per_key_limit = per_key_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-api")
+        self._inflight = {}
+        self._cond = threading.Condition()
+
+    def _acquire(self, api_keys_list, cost, tried):
+        # Key dengan slot penuh dilewati dulu supaya beban tersebar ke key lain;
+        # kalau semua key yang layak sedang penuh, tunggu sampai ada slot kosong.
+        with self._cond:
+            while True:
+                busy = {i for i, k in enumerate(api_keys_list) if self._inflight.get(k, 0) >= self.per_key_limit}
+                idx = self.scheduler.pick(api_keys_list, cost, exclude=tried | busy)
+                if idx is not None:
+                    key = api_keys_list[idx]
+                    self._inflight[key] = self._inflight.get(key, 0) + 1
+                    return idx
+                if not busy or self.scheduler.pick(api_keys_list, cost, exclude=tried) is None:
+                    return None
+                self._cond.wait()
+
+    def _release(self, api_key):
+        with self._cond:
+            self._inflight[api_key] -= 1
+            self._cond.notify_all()
+
+    def call(self, api_keys_list, endpoint, make_request):
+        # Return (response, key_idx). (None, None) = semua key habis/cooldown.
+        # HttpError selain status rotasi tetap di-raise ke pemanggil.
+        cost = QUOTA_COST.get(endpoint, 1)
+        trace = current_trace()
+        tried = set()
+        while True:
+            check_cancelled()
+            idx = self._acquire(api_keys_list, cost, tried)
+            if idx is None:
+                if trace: trace.on_call(endpoint, None, cost, "exhausted")
+                return None, None
+            api_key = api_keys_list[idx]
+            fingerprint, cached = None, None
+            try:
+                request = make_request(self.pool.get(api_key))
+                fingerprint, cached = self._conditional(endpoint, request)
+                res = request.execute()
+            except HttpError as e:
+                if e.resp.status == 304 and cached:
+                    # Tidak berubah sejak respons terakhir (tetap dihitung kuotanya)
+                    self.scheduler.charge(api_key, cost)
+                    self.etags.not_modified(fingerprint, cached[1])
+                    if trace: trace.on_call(endpoint, idx, cost, "not_modified")
+                    return json.loads(cached[1]), idx
+                if e.resp.status in ROTATE_STATUS:
+                    self.scheduler.penalize(api_key, e.resp.status, http_error_reason(e))
+                    if trace: trace.on_call(endpoint, idx, cost, "rotated")
+                    tried.add(idx)
+                    continue
+                self.scheduler.charge(api_key, cost)
+                if trace: trace.on_call(endpoint, idx, cost, "error")
+                raise
+            finally:
+                self._release(api_key)
+            self.scheduler.charge(api_key, cost)
+            if trace: trace.on_call(endpoint, idx, cost, "ok")
+            if fingerprint and isinstance(res, dict): self.etags.put(fingerprint, res.get('etag'), res)
+            return res, idx
+
+    def _conditional(self, endpoint, request):
+        # Return (fingerprint, (etag, body) / None). Request tanpa URI
+        # (client stand-in) dilewati.
+        uri = getattr(request, "uri", None)
+        if endpoint not in CONDITIONAL_ENDPOINTS or not uri or self.etags is None:
+            return None, None
+        fingerprint = request_fingerprint(uri)
+        cached = self.etags.get(fingerprint)
+        if cached: request.headers["If-None-Match"] = cached[0]
+        return fingerprint, cached
+
+    def submit(self, api_keys_list, endpoint, make_request):
+        # call() di background (misal prefetch halaman search berikutnya).
+        # Future.result() -> (response, key_idx), HttpError ikut di-raise.
+        return self._executor.submit(contextvars.copy_context().run, self.call, api_keys_list, endpoint, make_request)
+
+    def _call_quiet(self, api_keys_list, endpoint, make_request):
+        try:
+            res, _ = self.call(api_keys_list, endpoint, make_request)
+            return res
+        except Exception:
+            return None
+
+    def call_many(self, api_keys_list, endpoint, make_requests, on_progress=None):
+        # Fan-out paralel, hasil dikembalikan sesuai urutan input.
+        # Chunk yang gagal (error / semua key habis) bernilai None.
+        results = [None] * len(make_requests)
+        if not make_requests:
+            return results
+        check_cancelled()
+        futures = {
+            self._executor.submit(contextvars.copy_context().run, self._call_quiet, api_keys_list, endpoint, fn): i
+            for i, fn in enumerate(make_requests)
+        }
+        done = 0
+        try:
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+                done += 1
+                if on_progress: on_progress(done, len(make_requests))
+                check_cancelled()
+        except BaseException:
+            for fut in futures: fut.cancel()
+            raise
+        finally:
+            self.scheduler.flush()
+        return results
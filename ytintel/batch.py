@@ -0,0 +1,158 @@
+import time
+
+from ytintel import scan, seo
+from ytintel.enrich import fetch_videos, fetch_channel_stats, subscriber_count
+from ytintel.filters import duration_bucket, time_windows
+from ytintel.scan import parse_duration, add_timing
+
+# ==========================================
+# MULTI KEYWORD (SEARCH BARENG, ENRICH SEKALI)
+# ==========================================
+# Semua query di-paginate paralel (halaman ke-n semua query dalam satu
+# call_many), lalu ID video & channel dari semua query digabung jadi satu set
+# unik. videos.list / channels.list cuma dijalankan sekali atas set itu, baru
+# hasilnya dipecah lagi per keyword dengan filter yang sama seperti run tunggal.
+
+
+def unique_queries(queries):
+    return list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+
+
+def paginate_queries(gateway, api_keys_list, make_request, queries, windows, target_count, report=None, on_status=None):
+    # make_request(query, window, token) -> lambda untuk search.list; window =
+    # (publishedAfter, publishedBefore) dari filters.time_windows. Tiap query
+    # di-search per sub-window (semua cursor paralel per ronde, berbagi target
+    # per query). Return {query: [search item]} yang sudah di-dedup per video;
+    # cursor berhenti kalau target query tercapai, tidak ada halaman
+    # berikutnya, atau request-nya gagal.
+    report = report if report is not None else {}
+    keys = [(q, w) for q in queries for w in windows]
+    items = {q: [] for q in queries}
+    for done, _ in scan.search_rounds(gateway, api_keys_list, lambda key, token: make_request(key[0], key[1], token), keys, target_count, report, on_status, group=lambda key: key[0]):
+        for (q, _), res in done:
+            if res is None: continue
+            report['search_pages'] = report.get('search_pages', 0) + 1
+            items[q].extend(res.get('items', []))
+    return {q: scan.unique_items(found) for q, found in items.items()}
+
+
+def share_report(report, per_query_ids, unique_ids, kind):
+    report[f'{kind}_ids_total'] = sum(len(ids) for ids in per_query_ids)
+    report[f'{kind}_ids_unique'] = len(unique_ids)
+
+
+def fetch_subs_map(gateway, cache, api_keys_list, channel_ids):
+    subs_map = {}
+    for cid, stats in fetch_channel_stats(gateway, cache, api_keys_list, channel_ids).items():
+        try: subs_map[cid] = subscriber_count(stats)
+        except: pass
+    return subs_map
+
+
+def batch_scan(gateway, cache, api_keys_list, keywords, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=None, on_status=None, slices=1):
+    # Versi multi keyword dari scan.iter_viral_videos. Return {keyword: rows}
+    # (urutan sesuai input). Keyword kosong = scan global '*'.
+    queries = list(dict.fromkeys((k.strip() or "*") for k in keywords)) or ["*"]
+    report = report if report is not None else {}
+    report.update({'queries': len(queries), 'duration_bucket': duration_bucket(min_total_seconds, max_total_seconds), 'search_pages': 0,
+                   'detail_ids_skipped': 0, 'detail_calls_saved': 0, 'keys_exhausted': False, 'timings': {}})
+    windows = time_windows(days_back, slices, pages=scan.page_count(target_limit))
+    report['time_slices'] = len(windows)
+    keep_duration = lambda it: min_total_seconds <= parse_duration(it['contentDetails']['duration']) <= max_total_seconds
+
+    found = paginate_queries(gateway, api_keys_list, lambda q, w, t: scan.search_request(q, w[0], report['duration_bucket'], t, w[1]), queries, windows, target_limit, report, on_status)
+    report['total_scanned'] = sum(len(found[q]) for q in queries)
+    if report['search_pages'] == 0:
+        report['keys_exhausted'] = True
+        return {q: [] for q in queries}
+
+    if on_status: on_status("Cek subscriber channel...")
+    started = time.perf_counter()
+    per_query_chans = [set(item['snippet']['channelId'] for item in found[q]) for q in queries]
+    all_chans = set().union(*per_query_chans)
+    share_report(report, per_query_chans, all_chans, 'channel')
+    subs_map = fetch_subs_map(gateway, cache, api_keys_list, list(all_chans))
+    add_timing(report, 'channels', started)
+
+    ids_by_query = {}
+    for q in queries:
+        items = found[q]
+        ids = [v['id']['videoId'] for v in items if subs_map.get(v['snippet']['channelId'], 0) < max_subs] if max_subs > 0 else [v['id']['videoId'] for v in items]
+        ids_by_query[q] = ids[:scan.MAX_IDS_CHECKED]
+    all_ids = list(dict.fromkeys(vid for ids in ids_by_query.values() for vid in ids))
+    share_report(report, ids_by_query.values(), all_ids, 'video')
+
+    if on_status: on_status(f"Detail {len(all_ids)} video unik...")
+    started = time.perf_counter()
+    items_map = fetch_videos(gateway, cache, api_keys_list, all_ids, keep=keep_duration, report=report) if all_ids else {}
+    add_timing(report, 'details', started)
+
+    started = time.perf_counter()
+    rows = {q: scan.filter_rows(ids_by_query[q], items_map, subs_map, min_views, min_total_seconds, max_total_seconds) for q in queries}
+    add_timing(report, 'rows', started)
+    return rows
+
+
+def merge_scan_rows(rows_by_keyword):
+    # Gabung hasil per keyword jadi satu daftar unik per video; kolom
+    # "Keyword" berisi semua keyword yang menemukan video itu.
+    merged = {}
+    for keyword, rows in rows_by_keyword.items():
+        for r in rows:
+            if r['VideoId'] in merged:
+                merged[r['VideoId']]['Keyword'].append(keyword)
+            else:
+                merged[r['VideoId']] = {**r, 'Keyword': [keyword]}
+    return list(merged.values())
+
+
+def batch_analyze_viral_seo(gateway, metadata_cache, api_keys_list, queries, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, report=None, on_status=None, slices=1):
+    # Versi multi keyword dari seo.analyze_viral_seo (tanpa mode adaptif).
+    # Return {query: (results, debug_stats)}; debug per query sama formatnya
+    # dengan run tunggal, statistik enrichment bersama masuk ke report.
+    queries = unique_queries(queries)
+    report = report if report is not None else {}
+    report.update({'queries': len(queries), 'search_pages': 0, 'detail_ids_skipped': 0, 'detail_calls_saved': 0, 'timings': {}})
+    target_counts = seo.length_targets(length_filters)
+    target_fetch_count = seo.research_target_count(mode_research)
+    debug = {q: seo.new_debug_stats(min_duration_sec) for q in queries}
+    for d in debug.values(): d['pages_planned'] = scan.page_count(target_fetch_count)
+    if not queries: return {}
+
+    bucket = duration_bucket(min_duration_sec)
+    windows = time_windows(days_back, slices, pages=scan.page_count(target_fetch_count))
+    report['time_slices'] = len(windows)
+    keep_duration = lambda it: parse_duration(it['contentDetails']['duration']) >= min_duration_sec
+
+    found = paginate_queries(gateway, api_keys_list, lambda q, w, t: seo.search_request(q, w[0], bucket, t, w[1]), queries, windows, target_fetch_count, report, on_status)
+    ids_by_query = {q: [item['id']['videoId'] for item in found[q]] for q in queries}
+    for q in queries:
+        debug[q]['total_found_search'] = len(ids_by_query[q])
+        debug[q]['pages_fetched'] = -(-len(ids_by_query[q]) // 50)
+    all_ids = list(dict.fromkeys(vid for ids in ids_by_query.values() for vid in ids))
+    share_report(report, ids_by_query.values(), all_ids, 'video')
+
+    # DETAILS FETCHING SEKALI UNTUK SEMUA QUERY
+    if on_status: on_status(f"Detail {len(all_ids)} video unik...")
+    started = time.perf_counter()
+    items_map = fetch_videos(gateway, metadata_cache, api_keys_list, all_ids, keep=keep_duration, report=report) if all_ids else {}
+    stage1 = {q: seo.filter_video_stage1(items_map, ids_by_query[q], min_duration_sec, min_views, debug[q]) for q in queries}
+    add_timing(report, 'details', started)
+
+    # CHANNEL FETCHING SEKALI UNTUK SEMUA QUERY
+    if on_status: on_status("Cek subscriber channel...")
+    started = time.perf_counter()
+    per_query_chans = [set(item['snippet']['channelId'] for item in stage1[q]) for q in queries]
+    all_chans = set().union(*per_query_chans)
+    share_report(report, per_query_chans, all_chans, 'channel')
+    subs_map = fetch_subs_map(gateway, metadata_cache, api_keys_list, list(all_chans)) if all_chans else {}
+    add_timing(report, 'channels', started)
+
+    out = {}
+    for q in queries:
+        if not stage1[q]:
+            out[q] = ([], debug[q])
+            continue
+        items_to_process = seo.apply_subs_filter(stage1[q], subs_map, max_subs, debug[q])
+        out[q] = (seo.finalize_analysis(items_to_process, target_counts, debug[q]), debug[q])
+    return out
@@ -0,0 +1,375 @@
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# ==========================================
+# METADATA CACHE (SQLITE)
+# ==========================================
+CACHE_FILE = "metadata_cache.db"
+STATIC_TTL = 7 * 24 * 3600      # judul, durasi, tanggal upload, tags
+VOLATILE_TTL = 6 * 3600         # views, likes, subscriber
+MAX_ENTRIES = 200000            # per tabel, lewat dari ini -> LRU eviction
+ACCESS_RESOLUTION = 3600        # `accessed` cuma di-update kalau sudah lebih tua dari ini
+TOUCH_BATCH = 1000              # update `accessed` yang tertunda ditulis sekaligus
+EVICT_EVERY = 50                # sweep TTL + hitung ulang baris tiap N store()
+
+# Part API yang dianggap "immutable" vs "volatile" per jenis resource
+PARTS = {
+    "videos": {"static": ("snippet", "contentDetails"), "volatile": ("statistics",)},
+    "channels": {"static": ("snippet", "brandingSettings", "contentDetails"), "volatile": ("statistics",)},
+}
+
+
+class MetadataCache:
+    # Cache item API per videoId/channelId. Bagian static & volatile punya
+    # timestamp sendiri, jadi views basi bisa di-refresh tanpa fetch ulang
+    # snippet. Aman dipakai dari banyak thread/sesi (satu koneksi + lock).
+    # Baca tidak langsung menulis: waktu akses (untuk LRU) dikumpulkan di
+    # memori dan ditulis bareng store() berikutnya atau per TOUCH_BATCH.
+
+    def __init__(self, path=CACHE_FILE, static_ttl=STATIC_TTL, volatile_ttl=VOLATILE_TTL, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.static_ttl = static_ttl
+        self.volatile_ttl = volatile_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for table in PARTS:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id TEXT PRIMARY KEY,
+                    static TEXT, static_at REAL,
+                    volatile TEXT, volatile_at REAL,
+                    accessed REAL
+                )""")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_static_at ON {table}(static_at)")
+        self._conn.commit()
+        self.counters = {t: {"hits": 0, "misses": 0, "stale": 0} for t in PARTS}
+        self._touched = {t: {} for t in PARTS}      # id -> waktu akses yang belum ditulis
+        self._rows = {t: self._conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in PARTS}
+        self._stores = {t: 0 for t in PARTS}
+
+    def lookup(self, kind, ids, static_parts=None, count=True):
+        # Return (fresh, stale, missing):
+        #   fresh   = {id: item}  -> langsung pakai
+        #   stale   = {id: item}  -> bagian static masih valid, volatile basi
+        #   missing = [id]        -> harus fetch penuh
+        # count=False: tidak ikut statistik hit/miss (baca ulang teks dsb.)
+        now = time.time()
+        rows = {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                q = f"SELECT id, static, static_at, volatile, volatile_at, accessed FROM {kind} WHERE id IN ({','.join('?' * len(chunk))})"
+                for row in self._conn.execute(q, chunk):
+                    rows[row[0]] = row
+            touched = self._touched[kind]
+            for vid, row in rows.items():
+                if now - (row[5] or 0) > ACCESS_RESOLUTION: touched[vid] = now
+            if len(touched) >= TOUCH_BATCH:
+                self._write_touched(kind)
+                self._conn.commit()
+
+        needed_static = static_parts if static_parts is not None else PARTS[kind]["static"]
+        fresh, stale, missing = {}, {}, []
+        for vid in dict.fromkeys(ids):
+            row = rows.get(vid)
+            if row is None:
+                missing.append(vid)
+                continue
+            static = json.loads(row[1]) if row[1] else {}
+            if needed_static and (now - (row[2] or 0) > self.static_ttl or any(p not in static for p in needed_static)):
+                missing.append(vid)
+                continue
+            item = {"id": vid, **static}
+            if row[3] and now - (row[4] or 0) <= self.volatile_ttl:
+                item.update(json.loads(row[3]))
+                fresh[vid] = item
+            else:
+                stale[vid] = item
+
+        if not count: return fresh, stale, missing
+        with self._lock:
+            c = self.counters[kind]
+            c["hits"] += len(fresh)
+            c["stale"] += len(stale)
+            c["misses"] += len(missing)
+        return fresh, stale, missing
+
+    def store(self, kind, items):
+        # Simpan item API (hasil videos.list / channels.list). Part yang tidak
+        # ikut di-request tidak menimpa data lama.
+        if not items: return
+        now = time.time()
+        static_keys, volatile_keys = PARTS[kind]["static"], PARTS[kind]["volatile"]
+        with self._lock:
+            existing = {}
+            ids = [it["id"] for it in items]
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                q = f"SELECT id, static, static_at, volatile, volatile_at FROM {kind} WHERE id IN ({','.join('?' * len(chunk))})"
+                for row in self._conn.execute(q, chunk):
+                    existing[row[0]] = row
+
+            rows = []
+            for it in items:
+                old = existing.get(it["id"])
+                static = {k: it[k] for k in static_keys if k in it}
+                volatile = {k: it[k] for k in volatile_keys if k in it}
+                if static:
+                    if old and old[1]:
+                        static = {**json.loads(old[1]), **static}
+                    static_json, static_at = json.dumps(static), now
+                else:
+                    static_json, static_at = (old[1], old[2]) if old else (None, None)
+                if volatile:
+                    volatile_json, volatile_at = json.dumps(volatile), now
+                else:
+                    volatile_json, volatile_at = (old[3], old[4]) if old else (None, None)
+                rows.append((it["id"], static_json, static_at, volatile_json, volatile_at, now))
+                self._touched[kind].pop(it["id"], None)
+
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {kind} (id, static, static_at, volatile, volatile_at, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._rows[kind] += len(set(ids) - set(existing))
+            self._write_touched(kind)
+            self._evict(kind, now)
+            self._conn.commit()
+
+    def _write_touched(self, kind):
+        touched = self._touched[kind]
+        if not touched: return
+        self._conn.executemany(f"UPDATE {kind} SET accessed=? WHERE id=?", [(t, i) for i, t in touched.items()])
+        touched.clear()
+
+    def _evict(self, kind, now):
+        # 1. Tiap EVICT_EVERY store: buang entry yang bagian static-nya sudah
+        #    lewat TTL, lalu hitung ulang jumlah baris (proses lain ikut menulis)
+        self._stores[kind] += 1
+        if self._stores[kind] % EVICT_EVERY == 0:
+            self._conn.execute(f"DELETE FROM {kind} WHERE static_at < ?", (now - self.static_ttl,))
+            self._rows[kind] = self._conn.execute(f"SELECT COUNT(*) FROM {kind}").fetchone()[0]
+        # 2. Kalau kebanyakan, buang yang paling lama tidak diakses (LRU)
+        if self._rows[kind] > self.max_entries:
+            cur = self._conn.execute(
+                f"DELETE FROM {kind} WHERE id IN (SELECT id FROM {kind} ORDER BY accessed ASC LIMIT ?)",
+                (self._rows[kind] - self.max_entries,)
+            )
+            self._rows[kind] -= max(cur.rowcount, 0)
+
+    def stats(self):
+        total = {"hits": 0, "misses": 0, "stale": 0}
+        for c in self.counters.values():
+            for k in total: total[k] += c[k]
+        lookups = sum(total.values())
+        total["hit_rate"] = round(total["hits"] / lookups * 100, 1) if lookups else 0.0
+        return total
+
+
+# ==========================================
+# SPY CACHE (HASIL CHANNEL SPY PER CHANNEL ID)
+# ==========================================
+SPY_TTL = 24 * 3600
+SPY_MAX_AGE = 30 * 24 * 3600    # lewat dari ini dihapus, apa pun TTL-nya
+
+
+class SpyCache:
+    # Laporan Channel Spy per channelId, dipakai bersama semua sesi di satu
+    # deployment (file SQLite yang sama dengan cache metadata). Yang disimpan
+    # hanya hasil sukses; TTL dicek saat lookup supaya bisa diatur dari UI.
+
+    def __init__(self, path=CACHE_FILE, ttl=SPY_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS spy (
+                id TEXT PRIMARY KEY,
+                data TEXT,
+                fetched_at REAL
+            )""")
+        self._conn.commit()
+
+    def lookup(self, channel_ids, ttl=None):
+        # Return {channelId: spy_data} yang umurnya masih <= ttl
+        ttl = self.ttl if ttl is None else ttl
+        channel_ids = list(channel_ids)
+        found = {}
+        with self._lock:
+            for i in range(0, len(channel_ids), 500):
+                chunk = channel_ids[i:i+500]
+                q = f"SELECT id, data FROM spy WHERE id IN ({','.join('?' * len(chunk))}) AND fetched_at >= ?"
+                for cid, data in self._conn.execute(q, chunk + [time.time() - ttl]):
+                    found[cid] = json.loads(data)
+        return found
+
+    def store(self, spies):
+        # spies: {channelId: spy_data}; None (gagal) tidak disimpan
+        now = time.time()
+        rows = [(cid, json.dumps(data), now) for cid, data in spies.items() if data]
+        if not rows: return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO spy (id, data, fetched_at) VALUES (?, ?, ?)", rows)
+            self._conn.execute("DELETE FROM spy WHERE fetched_at < ?", (now - SPY_MAX_AGE,))
+            self._conn.commit()
+
+
+# ==========================================
+# ETAG CACHE (CONDITIONAL REQUEST / 304)
+# ==========================================
+ETAG_TTL = STATIC_TTL
+ETAG_MAX_ENTRIES = 50000
+
+
+class EtagCache:
+    # Body respons terakhir + ETag-nya per request (URL tanpa API key, di-hash).
+    # Gateway mengirim If-None-Match; kalau API menjawab 304, body dari sini
+    # yang dipakai tanpa download & tanpa parse ulang payload dari server.
+
+    def __init__(self, path=CACHE_FILE, ttl=ETAG_TTL, max_entries=ETAG_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS etags (
+                id TEXT PRIMARY KEY,
+                etag TEXT,
+                body TEXT,
+                stored_at REAL
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_etags_stored ON etags(stored_at)")
+        self._conn.commit()
+        self.counters = {"conditional": 0, "not_modified": 0, "bytes_saved": 0}
+
+    def get(self, request_id):
+        # Return (etag, body_json) atau None
+        with self._lock:
+            row = self._conn.execute("SELECT etag, body FROM etags WHERE id=? AND stored_at >= ?", (request_id, time.time() - self.ttl)).fetchone()
+            if row: self.counters["conditional"] += 1
+        return row
+
+    def put(self, request_id, etag, body):
+        if not etag: return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO etags (id, etag, body, stored_at) VALUES (?, ?, ?, ?)", (request_id, etag, json.dumps(body), now))
+            self._conn.execute("DELETE FROM etags WHERE stored_at < ?", (now - self.ttl,))
+            count = self._conn.execute("SELECT COUNT(*) FROM etags").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute("DELETE FROM etags WHERE id IN (SELECT id FROM etags ORDER BY stored_at ASC LIMIT ?)", (count - self.max_entries,))
+            self._conn.commit()
+
+    def not_modified(self, request_id, body):
+        # 304: body lama masih berlaku, umurnya diperpanjang
+        with self._lock:
+            self._conn.execute("UPDATE etags SET stored_at=? WHERE id=?", (time.time(), request_id))
+            self._conn.commit()
+            self.counters["not_modified"] += 1
+            self.counters["bytes_saved"] += len(body)
+
+    def stats(self):
+        with self._lock:
+            c = dict(self.counters)
+        c["hit_rate"] = round(c["not_modified"] / c["conditional"] * 100, 1) if c["conditional"] else 0.0
+        return c
+
+
+# ==========================================
+# RESULT CACHE (HASIL SCAN/ANALISA, MEMORI PROSES)
+# ==========================================
+RESULT_TTL = 600
+RESULT_MAX_BYTES = 256 * 2**20
+
+
+def normalize_query(query):
+    # "  Lofi   MUSIC " == "lofi music"; kosong = scan global "*"
+    return " ".join(query.lower().split()) or "*"
+
+
+def result_key(kind, query, window, **filters):
+    # Kunci hasil: jenis pipeline + query ternormalisasi + window waktu yang
+    # sudah dibulatkan (filters.window_start) + filter. API key sengaja tidak
+    # ikut: hasil sama siapa pun yang membayar kuotanya.
+    if isinstance(query, (list, tuple)):
+        query = tuple(sorted(set(normalize_query(q) for q in query)))
+    else:
+        query = normalize_query(query)
+    return (kind, query, window, tuple(sorted(filters.items())))
+
+
+def approx_size(value):
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sum(approx_size(v) for v in value) + 64
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class ResultCache:
+    # Hasil akhir scan Tab 1 / analisa Tab 2 per result_key, dipakai bersama
+    # semua sesi dalam satu proses. Kedaluwarsa setelah ttl; kalau total
+    # ukurannya lewat max_bytes, entry yang paling lama tidak dipakai dibuang.
+    # Nilai yang disimpan dianggap read-only oleh pemakainya.
+
+    def __init__(self, ttl=RESULT_TTL, max_bytes=RESULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (stored_at, size, value)
+        self._bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "evicted": 0}
+
+    def get(self, key):
+        # Return (value, umur detik) atau None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry[2], now - entry[0]
+
+    def put(self, key, value):
+        size = approx_size(value)
+        if size > self.max_bytes: return
+        now = time.time()
+        with self._lock:
+            if key in self._entries: self._drop(key)
+            self._entries[key] = (now, size, value)
+            self._bytes += size
+            for k in [k for k, e in self._entries.items() if now - e[0] > self.ttl]:
+                self._drop(k)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.counters["evicted"] += 1
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries), "mb": round(self._bytes / 2**20, 1)}
@@ -0,0 +1,201 @@
+import argparse
+import os
+import sys
+
+# ==========================================
+# CLI (BATCH / CRON, TANPA STREAMLIT)
+# ==========================================
+# Contoh:
+#   python -m ytintel scan -k "lofi music" --mode sedang --out hasil.csv
+#   python -m ytintel seo --keywords-file seeds.txt --mode agresif --out keyword.parquet
+#   python -m ytintel seo --keywords-file seeds.txt --batch --out keyword.csv
+#   python -m ytintel spy --channels-file channels.txt --out spy.json
+#
+# API key: --keys-file, env YTINTEL_API_KEYS (pisah baris/koma), atau key yang
+# tersimpan di settings aplikasi (app_data.db). Cache metadata, spy cache dan
+# state kuota memakai file yang sama dengan aplikasi di direktori kerja.
+# Modul berat (pandas, googleapiclient) baru di-import saat command jalan,
+# jadi `--help` tetap cepat.
+MODES = {
+    "hemat": "🌱 Hemat",
+    "sedang": "⚖️ Sedang",
+    "agresif": "🔥 Agresif",
+    "brutal": "☠️ BRUTAL",
+}
+LENGTH_LABELS = {"1": "1 Kata", "2": "2 Kata", "3": "3+ Kata"}
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def load_api_keys(args):
+    if args.keys_file:
+        return read_lines(args.keys_file)
+    raw = os.environ.get("YTINTEL_API_KEYS", "")
+    if not raw.strip():
+        from ytintel.store import AppStore
+        raw = AppStore().load_settings({"saved_api_keys": ""})["saved_api_keys"]
+    return [k.strip() for k in raw.replace(",", "\n").split("\n") if k.strip()]
+
+
+def load_keywords(args):
+    keywords = list(args.keyword or [])
+    if args.keywords_file: keywords += read_lines(args.keywords_file)
+    return keywords
+
+
+def log(args, text):
+    if not args.quiet: print(text, file=sys.stderr, flush=True)
+
+
+    # Format dari ekstensi: .parquet (butuh pyarrow, lihat requirements-dev.txt) / .json / .jsonl / lainnya CSV
+    # Format dari ekstensi: .parquet / .json / .jsonl / lainnya CSV
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        df.to_parquet(path, index=False)
+    elif ext == ".json":
+        df.to_json(path, orient="records", force_ascii=False, indent=2)
+    elif ext == ".jsonl":
+        df.to_json(path, orient="records", force_ascii=False, lines=True)
+    else:
+        for col in df.columns:
+            if df[col].map(lambda v: isinstance(v, list)).any():
+                df[col] = df[col].map(lambda v: ", ".join(map(str, v)) if isinstance(v, list) else v)
+        df.to_csv(path, index=False)
+    return len(df)
+
+
+def engines():
+    from ytintel.api import YouTubeGateway
+    from ytintel.cache import MetadataCache
+    return YouTubeGateway(), MetadataCache()
+
+
+def cmd_scan(args, api_keys_list, keywords):
+    from ytintel.scan import SCAN_LIMITS, iter_viral_videos
+    gateway, cache = engines()
+    target_limit = args.limit or SCAN_LIMITS[MODES[args.mode]]
+    max_sec = args.max_sec if args.max_sec is not None else 999999
+    rows = []
+    if args.batch:
+        from ytintel.batch import batch_scan
+        report = {}
+        found = batch_scan(gateway, cache, api_keys_list, keywords, args.max_subs, args.min_views, args.days, target_limit, args.min_sec, max_sec, report=report, on_status=lambda t: log(args, f"[scan] {t}"), slices=args.slices)
+        if report.get('keys_exhausted'): log(args, "[scan] semua API key habis")
+        for keyword, kw_rows in found.items():
+            rows.extend({"Keyword": keyword, **r} for r in kw_rows)
+            log(args, f"[scan] {keyword}: {len(kw_rows)} video lolos filter")
+        log(args, f"[scan] {report.get('video_ids_total', 0)} ID video -> {report.get('video_ids_unique', 0)} unik, {report.get('channel_ids_total', 0)} ID channel -> {report.get('channel_ids_unique', 0)} unik")
+        return rows
+    for keyword in keywords:
+        report = {}
+        progress = lambda scanned, target, key_idx, kw=keyword: log(args, f"[scan] {kw or '*'}: {scanned}/{target} ({'key #%d' % (key_idx + 1) if key_idx is not None else 'time-sliced'})")
+        found = 0
+        for page_rows, _ in iter_viral_videos(gateway, cache, api_keys_list, keyword, args.max_subs, args.min_views, args.days, target_limit, args.min_sec, max_sec, report=report, on_progress=progress, slices=args.slices):
+            rows.extend({"Keyword": keyword, **r} for r in page_rows)
+            found += len(page_rows)
+        if report.get('keys_exhausted'):
+            log(args, "[scan] semua API key habis")
+            break
+        log(args, f"[scan] {keyword or '*'}: {found} video lolos filter")
+    return rows
+
+
+def cmd_seo(args, api_keys_list, keywords):
+    from ytintel.seo import analyze_viral_seo
+    gateway, cache = engines()
+    lengths = [LENGTH_LABELS[x] for x in args.lengths]
+    rows = []
+    if args.batch:
+        from ytintel.batch import batch_analyze_viral_seo
+        report = {}
+        found = batch_analyze_viral_seo(gateway, cache, api_keys_list, keywords, args.days, args.max_subs, args.min_views, args.min_sec, MODES[args.mode], lengths, report=report, on_status=lambda t: log(args, f"[seo] {t}"), slices=args.slices)
+        for keyword, (results, debug) in found.items():
+            rows.extend({"Keyword": keyword, **{k: v for k, v in r.items() if k != "word_count_raw"}} for r in results)
+            log(args, f"[seo] {keyword}: {len(results)} keyword dari {debug['total_videos_processed']} video")
+        log(args, f"[seo] {report.get('video_ids_total', 0)} ID video -> {report.get('video_ids_unique', 0)} unik, {report.get('channel_ids_total', 0)} ID channel -> {report.get('channel_ids_unique', 0)} unik")
+        return rows
+    for keyword in keywords:
+        results, debug = analyze_viral_seo(gateway, cache, api_keys_list, keyword, args.days, args.max_subs, args.min_views, args.min_sec, MODES[args.mode], lengths, adaptive=args.adaptive, slices=args.slices)
+        rows.extend({"Keyword": keyword, **{k: v for k, v in r.items() if k != "word_count_raw"}} for r in results)
+        log(args, f"[seo] {keyword}: {len(results)} keyword dari {debug['total_videos_processed']} video ({debug['pages_fetched']} halaman search)")
+    return rows
+
+
+def cmd_spy(args, api_keys_list, channel_ids):
+    from ytintel.cache import SpyCache
+    from ytintel.spy import batch_channel_spy
+    gateway, cache = engines()
+    report = {}
+    results = batch_channel_spy(gateway, cache, api_keys_list, channel_ids, on_status=lambda t: log(args, f"[spy] {t}"), report=report,
+                                spy_cache=SpyCache(), ttl=args.spy_ttl * 3600, force=args.force)
+    log(args, f"[spy] {report['channels']} channel: {report['from_cache']} dari cache, {report['via_playlist']} playlist, {report['via_search']} search")
+    return [{"ChannelId": cid, **(spy or {"error": "Gagal Spy"})} for cid, spy in results.items()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m ytintel", description="YouTube Intel tanpa browser: scan video, analisa keyword & channel spy.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p, targets="keyword"):
+        p.add_argument("--keys-file", help="file API key (satu per baris)")
+        if targets == "keyword":
+            p.add_argument("-k", "--keyword", action="append", help="keyword (boleh berulang)")
+            p.add_argument("--keywords-file", help="file keyword (satu per baris, # = komentar)")
+            p.add_argument("--mode", choices=list(MODES), default="sedang")
+            p.add_argument("--days", type=int, default=30, help="umur video maksimal (hari)")
+            p.add_argument("--max-subs", type=int, default=0, help="0 = filter subs mati")
+            p.add_argument("--min-views", type=int, default=1000)
+            p.add_argument("--min-sec", type=int, default=0, help="durasi minimal (detik)")
+            p.add_argument("--batch", action="store_true", help="search semua keyword bareng, detail video & channel diambil sekali")
+            p.add_argument("--slices", type=int, default=1, help="pecah window umur jadi N sub-window yang di-search paralel (maks 12)")
+        p.add_argument("--out", required=True, help="file output .csv / .parquet / .json / .jsonl")
+        p.add_argument("-q", "--quiet", action="store_true")
+
+    p_scan = sub.add_parser("scan", help="scan video viral (Tab 1)")
+    common(p_scan)
+    p_scan.add_argument("--max-sec", type=int, help="durasi maksimal (detik)")
+    p_scan.add_argument("--limit", type=int, help="jumlah sample search (default sesuai mode)")
+
+    p_seo = sub.add_parser("seo", help="analisa keyword viral (Tab 2)")
+    common(p_seo)
+    p_seo.add_argument("--lengths", nargs="+", choices=list(LENGTH_LABELS), default=list(LENGTH_LABELS), help="panjang keyword: 1 2 3")
+    p_seo.add_argument("--adaptive", action="store_true", help="stop paging saat ranking stabil")
+
+    p_spy = sub.add_parser("spy", help="channel spy batch")
+    common(p_spy, targets="channel")
+    p_spy.add_argument("-c", "--channel", action="append", help="channel ID (boleh berulang)")
+    p_spy.add_argument("--channels-file", help="file channel ID (satu per baris)")
+    p_spy.add_argument("--spy-ttl", type=int, default=24, help="umur cache spy (jam)")
+    p_spy.add_argument("--force", action="store_true", help="abaikan cache spy")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    api_keys_list = load_api_keys(args)
+    if not api_keys_list:
+        print("Tidak ada API key (--keys-file / YTINTEL_API_KEYS).", file=sys.stderr)
+        return 2
+
+    if args.command == "spy":
+        targets = list(args.channel or []) + (read_lines(args.channels_file) if args.channels_file else [])
+        if not targets:
+            print("Tidak ada channel ID (-c / --channels-file).", file=sys.stderr)
+            return 2
+        rows = cmd_spy(args, api_keys_list, targets)
+    else:
+        targets = load_keywords(args)
+        if args.command == "scan" and not targets: targets = [""]
+        if not targets:
+            print("Tidak ada keyword (-k / --keywords-file).", file=sys.stderr)
+            return 2
+        rows = cmd_scan(args, api_keys_list, targets) if args.command == "scan" else cmd_seo(args, api_keys_list, targets)
+
+    n = write_table(rows, args.out)
+    log(args, f"{n} baris -> {args.out}")
+    return 0
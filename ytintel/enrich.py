@@ -0,0 +1,112 @@
+# ==========================================
+# ENRICHMENT (VIDEOS & CHANNELS LOOKUP)
+# ==========================================
+VIDEO_PARTS = "snippet,statistics,contentDetails"
+CHANNEL_PARTS = "snippet,statistics,brandingSettings,contentDetails"
+CHANNEL_STATS_PARTS = "statistics"
+
+# FIELD MASK (fields=): hanya field yang dibaca aplikasi yang ikut di-download.
+# Hasil videos.list / channels.list masuk cache metadata bersama, jadi mask-nya
+# gabungan kebutuhan semua pemakai (scan Tab 1, SEO Tab 2, spy, filter lokal):
+#   scan  -> title, channelTitle, channelId, description, tags, thumbnail high,
+#            viewCount/likeCount/commentCount, duration
+#   SEO   -> title, tags, channelId, viewCount/likeCount, duration
+#   spy   -> title, duration, viewCount (+ liveStreamingDetails)
+# "etag" tetap diminta supaya If-None-Match (gateway) tetap jalan.
+VIDEO_SNIPPET_FIELDS = "snippet(title,channelId,channelTitle,description,tags,publishedAt,thumbnails/high/url)"
+VIDEO_STATS_FIELDS = "statistics(viewCount,likeCount,commentCount)"
+VIDEO_FIELDS = f"etag,items(id,{VIDEO_SNIPPET_FIELDS},{VIDEO_STATS_FIELDS},contentDetails/duration)"
+VIDEO_REFRESH_FIELDS = f"etag,items(id,{VIDEO_STATS_FIELDS})"
+CHANNEL_FIELDS = "etag,items(id,snippet(title,description,publishedAt),statistics,brandingSettings/channel/keywords,contentDetails/relatedPlaylists/uploads)"
+CHANNEL_STATS_FIELDS = "etag,items(id,statistics)"
+
+
+def chunked(ids, size=50):
+    return [ids[i:i+size] for i in range(0, len(ids), size)]
+
+
+def response_items(responses, full_count=0, parts=""):
+    # Gabung items dari semua respons. Dengan field mask, part yang isinya
+    # kosong (misal channel tanpa keywords) tidak dikirim API sama sekali;
+    # untuk respons fetch penuh (full_count pertama) part itu diisi {} supaya
+    # cache tidak menganggapnya hilang dan fetch ulang terus.
+    items = []
+    for i, res in enumerate(responses):
+        if not res: continue
+        for it in res.get('items', []):
+            if i < full_count:
+                for p in parts.split(','): it.setdefault(p, {})
+            items.append(it)
+    return items
+
+
+def fetch_videos(gateway, cache, api_keys_list, video_ids, on_progress=None, keep=None, report=None):
+    # Return {videoId: item} seperti hasil videos.list. Yang masih segar
+    # diambil dari cache; yang cuma basi statistiknya di-refresh dengan
+    # part="statistics" saja; sisanya fetch penuh.
+    # keep(item): filter murah atas data static (misal durasi). Item cache
+    # yang pasti gagal tidak di-refresh, dikembalikan apa adanya.
+    fresh, stale, missing = cache.lookup("videos", video_ids)
+    stale_ids = list(stale)
+    if keep is not None:
+        refresh_ids = [vid for vid in stale_ids if keep(stale[vid])]
+        if report is not None:
+            skipped = len(stale_ids) - len(refresh_ids)
+            report['detail_ids_skipped'] = report.get('detail_ids_skipped', 0) + skipped
+            report['detail_calls_saved'] = report.get('detail_calls_saved', 0) + len(chunked(stale_ids)) - len(chunked(refresh_ids))
+        stale_ids = refresh_ids
+
+    reqs = [lambda yt, c=c: yt.videos().list(part=VIDEO_PARTS, id=','.join(c), fields=VIDEO_FIELDS) for c in chunked(missing)]
+    reqs += [lambda yt, c=c: yt.videos().list(part="statistics", id=','.join(c), fields=VIDEO_REFRESH_FIELDS) for c in chunked(stale_ids)]
+    responses = gateway.call_many(api_keys_list, "videos.list", reqs, on_progress=on_progress)
+
+    fetched = response_items(responses, len(chunked(missing)), VIDEO_PARTS)
+    cache.store("videos", fetched)
+
+    items = dict(fresh)
+    # Kalau refresh statistik gagal, data basi tetap lebih baik daripada hilang
+    items.update(stale)
+    for it in fetched:
+        items[it['id']] = {**stale[it['id']], **it} if it['id'] in stale else it
+    return items
+
+
+def fetch_channels(gateway, cache, api_keys_list, channel_ids, on_progress=None, refresh=False):
+    # Return {channelId: item} lengkap (snippet, branding, uploads playlist,
+    # statistik). Sama seperti fetch_videos: statistik basi di-refresh saja.
+    # refresh=True: abaikan cache, fetch penuh semua ID.
+    fresh, stale, missing = cache.lookup("channels", channel_ids) if not refresh else ({}, {}, list(dict.fromkeys(channel_ids)))
+    reqs = [lambda yt, c=c: yt.channels().list(part=CHANNEL_PARTS, id=','.join(c), fields=CHANNEL_FIELDS) for c in chunked(missing)]
+    reqs += [lambda yt, c=c: yt.channels().list(part=CHANNEL_STATS_PARTS, id=','.join(c), fields=CHANNEL_STATS_FIELDS) for c in chunked(list(stale))]
+    responses = gateway.call_many(api_keys_list, "channels.list", reqs, on_progress=on_progress)
+
+    fetched = response_items(responses, len(chunked(missing)), CHANNEL_PARTS)
+    cache.store("channels", fetched)
+
+    items = dict(fresh)
+    items.update(stale)
+    for it in fetched:
+        items[it['id']] = {**stale[it['id']], **it} if it['id'] in stale else it
+    return items
+
+
+def fetch_channel_stats(gateway, cache, api_keys_list, channel_ids):
+    # Return {channelId: statistics}
+    fresh, stale, missing = cache.lookup("channels", channel_ids, static_parts=())
+    to_fetch = missing + list(stale)
+    responses = gateway.call_many(api_keys_list, "channels.list", [
+        lambda yt, c=c: yt.channels().list(part=CHANNEL_STATS_PARTS, id=','.join(c), fields=CHANNEL_STATS_FIELDS) for c in chunked(to_fetch)
+    ])
+
+    fetched = response_items(responses)
+    cache.store("channels", fetched)
+
+    stats = {cid: it.get('statistics', {}) for cid, it in stale.items()}
+    stats.update({cid: it.get('statistics', {}) for cid, it in fresh.items()})
+    stats.update({it['id']: it.get('statistics', {}) for it in fetched})
+    return stats
+
+
+def subscriber_count(statistics):
+    if statistics.get('hiddenSubscriberCount'): return 0
+    return int(statistics.get('subscriberCount', 0))
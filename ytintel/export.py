@@ -0,0 +1,95 @@
+import html
+import json
+import re
+import tempfile
+import zipfile
+
+# ==========================================
+# EXPORT METADATA (TXT HUMAN / JSON AI / ZIP)
+# ==========================================
+# meta = {"title", "chan", "link", "tags", "desc"} (nilai dari Metadata Editor)
+# spy  = hasil execute_channel_spy, atau None kalau belum / gagal diambil
+FILENAME_RE = re.compile(r'[\\/*?:"<>|]')
+
+
+def clean_filename(text):
+    text = html.unescape(text)
+    cleaned = FILENAME_RE.sub("", text)
+    return cleaned.strip()
+
+
+def export_basename(meta):
+    return f"{clean_filename(meta['chan'])} - {clean_filename(meta['title'])}"[:100]
+
+
+def spy_txt(channel_name, spy):
+    if not spy:
+        return "Data Spy belum diambil."
+    live_txt_list = [f"{i['title']} ({i['duration_text']} - {i['views']:,} views)" for i in spy['top_live_list']]
+    reg_txt_list = [f"{i['title']} ({i['duration_text']} - {i['views']:,} views)" for i in spy['top_reg_list']]
+    return f"""
+CHANNEL_METADATA_START
+CHANNEL_NAME: {channel_name}
+CHANNEL_AGE_YEARS: {spy['channel_age']}
+CHANNEL_CREATED_DATE: {spy['channel_created']}
+TOTAL_SUBSCRIBERS: {spy['subscriber_count']}
+TOTAL_VIEWS_GLOBAL: {spy['total_views_all']}
+TOTAL_VIDEO_GLOBAL: {spy['total_video_count']}
+CHANNEL_METADATA_END
+
+CHANNEL_DETAILS_START
+CHANNEL_KEYWORDS:
+{spy['channel_keywords']}
+
+CHANNEL_DESCRIPTION:
+{spy['channel_desc']}
+CHANNEL_DETAILS_END
+
+SPLIT_STATS_START
+TOTAL_VIDEO_LIVE: {spy['live_count']}
+TOTAL_VIDEO_REGULER: {spy['reguler_count']}
+SPLIT_STATS_END
+
+CONTENT_PERFORMANCE_START
+TOP_3_LIVE_LIST:
+{json.dumps(live_txt_list, indent=2, ensure_ascii=False)}
+
+TOP_3_REGULER_LIST:
+{json.dumps(reg_txt_list, indent=2, ensure_ascii=False)}
+CONTENT_PERFORMANCE_END
+"""
+
+
+def export_txt(meta, spy=None):
+    return f"JUDUL KONTEN:\n{meta['title']}\n\nNAMA CHANNEL:\n{meta['chan']}\n\nLINK VIDEO:\n{meta['link']}\n\nKEYWORDS KONTEN:\n{meta['tags']}\n\nDESKRIPSI KONTEN:\n{meta['desc']}\n\n{spy_txt(meta['chan'], spy)}"
+
+
+def export_json(meta, spy):
+    # Format JSON hanya lengkap kalau data spy ada (sama seperti tombol di UI)
+    return json.dumps({
+        "video_metadata": {
+            "title": meta['title'],
+            "channel_name": meta['chan'],
+            "url": meta['link'],
+            "keywords_konten": [t.strip() for t in meta['tags'].split(',')],
+            "description_konten": meta['desc']
+        },
+        "channel_intel": spy
+    }, indent=4, ensure_ascii=False)
+
+
+def write_export_zip(entries, fileobj=None):
+    # entries: iterable (meta, spy). Tiap file ditulis & dibuang satu per satu
+    # ke ZIP di file sementara (bukan di RAM). Return file object di posisi 0.
+    fileobj = fileobj if fileobj is not None else tempfile.TemporaryFile()
+    used = {}
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+        for meta, spy in entries:
+            base = export_basename(meta) or "video"
+            used[base] = used.get(base, 0) + 1
+            if used[base] > 1: base = f"{base} ({used[base]})"
+            zf.writestr(f"{base}.txt", export_txt(meta, spy))
+            if spy:
+                zf.writestr(f"{base}.json", export_json(meta, spy))
+    fileobj.seek(0)
+    return fileobj
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+# ==========================================
+# FILTER HELPERS
+# ==========================================
+# Batas kategori videoDuration di search.list (detik):
+#   short  = < 4 menit, medium = 4-20 menit (inklusif), long = > 20 menit
+SHORT_MAX = 4 * 60
+LONG_MIN = 20 * 60
+
+
+def duration_bucket(min_sec, max_sec=None):
+    # Pilih videoDuration yang pasti mencakup seluruh range [min_sec, max_sec].
+    # Kalau range melintasi dua kategori, pakai "any" (filter detik tetap jalan).
+    if min_sec > LONG_MIN: return "long"
+    if max_sec is not None and max_sec < SHORT_MAX: return "short"
+    if min_sec >= SHORT_MAX and max_sec is not None and max_sec <= LONG_MIN: return "medium"
+    return "any"
+
+
+# publishedAfter dibulatkan ke bawah per WINDOW_BUCKET detik: scan dengan filter
+# yang sama dalam satu bucket memakai window yang sama persis, jadi hasilnya
+# bisa dipakai bersama (cache hasil scan) tanpa beda beberapa detik/menit.
+WINDOW_BUCKET = 600
+
+
+def floor_time(moment, bucket=WINDOW_BUCKET):
+    return datetime.fromtimestamp(moment.timestamp() // bucket * bucket)
+
+
+def iso_time(moment):
+    return moment.isoformat("T") + "Z"
+
+
+def window_start(days_back, now=None, bucket=WINDOW_BUCKET):
+    return iso_time(floor_time((now or datetime.now()) - timedelta(days=days_back), bucket))
+
+
+# Time-slicing: search.list berhenti memberi nextPageToken setelah beberapa
+# ratus hasil per query. Window umur video dipecah jadi beberapa sub-window
+# (publishedAfter, publishedBefore) yang masing-masing punya cursor sendiri.
+MAX_TIME_SLICES = 12
+
+
+def time_windows(days_back, slices=1, now=None, bucket=WINDOW_BUCKET, pages=None):
+    # Return [(publishedAfter, publishedBefore)] berurutan dari yang terlama.
+    # Batas dibulatkan ke bucket seperti window_start; sub-window terakhir
+    # terbuka (publishedBefore None). slices=1 -> [(window_start, None)].
+    # pages: jumlah halaman search yang ditargetkan; slices dibatasi segitu
+    # supaya tiap sub-window kebagian minimal satu request.
+    now = now or datetime.now()
+    start = floor_time(now - timedelta(days=days_back), bucket)
+    slices = max(1, min(slices, MAX_TIME_SLICES, pages or MAX_TIME_SLICES))
+    step = (now - start) / slices
+    bounds = [start] + [floor_time(start + step * i, bucket) for i in range(1, slices)]
+    bounds = sorted(set(bounds))
+    return [(iso_time(after), iso_time(before) if before else None) for after, before in zip(bounds, bounds[1:] + [None])]
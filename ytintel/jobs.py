@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# ==========================================
+# JOB RUNNER (SCAN & ANALISA DI BACKGROUND)
+# ==========================================
+# Scan panjang tidak dijalankan di thread script Streamlit: tombol cuma submit
+# job, UI polling status job tiap rerun dan mengambil hasilnya setelah selesai.
+# Rerun karena widget berubah tidak membatalkan scan, dan job dari banyak sesi
+# berbagi satu worker pool yang jumlah thread-nya dibatasi JOB_WORKERS.
+# Pembatalan kooperatif: fungsi job memanggil job.update(...) di titik aman
+# (per halaman search / per tahap), yang me-raise JobCancelled kalau diminta.
+# Di dalam api.cancellation(job.update) tiap request gateway & tiap chunk
+# call_many juga jadi titik pembatalan (enrichment tidak ditunggu sampai habis).
+JOB_WORKERS = int(os.environ.get("YTINTEL_JOB_WORKERS", "4"))
+JOB_TTL = 3600          # job selesai yang tidak pernah diambil dibuang setelah ini
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    # Status & progress ditulis thread worker dan dibaca thread script
+    # (atribut tunggal, tanpa lock); result baru diisi sebelum status DONE.
+
+    def __init__(self, kind, label=""):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label
+        self.status = QUEUED
+        self.progress = None        # 0..1, None = tidak diketahui
+        self.message = ""
+        self.partial = None         # hasil sementara (misal frame scan per halaman)
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == QUEUED: self.status, self.finished_at = CANCELLED, time.time()
+
+    def update(self, progress=None, message=None, partial=None):
+        # Dipanggil dari thread worker; sekaligus titik pembatalan
+        if self._cancel.is_set(): raise JobCancelled()
+        if progress is not None: self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None: self.message = message
+        if partial is not None: self.partial = partial
+
+    def elapsed(self):
+        if self.started_at is None: return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobRunner:
+    # Satu per proses. submit(kind, label, fn, *args) -> Job; fn(job, *args)
+    # jalan di worker pool, return value-nya jadi job.result.
+
+    def __init__(self, max_workers=JOB_WORKERS, ttl=JOB_TTL):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, label, fn, *args, **kwargs):
+        job = Job(kind, label)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job.status, job.finished_at = CANCELLED, time.time()
+            return
+        job.status, job.started_at = RUNNING, time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+        finally:
+            job.partial = None
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        if not job_id: return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job: job.cancel()
+        return job
+
+    def release(self, job_id):
+        # Hasil sudah diambil pemiliknya -> lepas dari memori runner
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def queue_position(self, job):
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if j.status == QUEUED and j.created_at < job.created_at)
+
+    def _prune(self):
+        now = time.time()
+        for job_id in [i for i, j in self._jobs.items() if j.finished and now - j.finished_at > self.ttl]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            statuses = [j.status for j in self._jobs.values()]
+        return {"running": statuses.count(RUNNING), "queued": statuses.count(QUEUED), "workers": self.max_workers}
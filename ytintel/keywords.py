@@ -0,0 +1,185 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# KEYWORD STATS ENGINE (KOLOMNAR / PANDAS)
+# ==========================================
+MIN_FREQ = 3
+TECHNICAL_JUNK = ('hd', '4k', '1080p', 'hq', 'official video', 'lyric video', 'official audio')
+JUNK_RE = re.compile('|'.join(re.escape(j) for j in TECHNICAL_JUNK))
+TITLE_WORD_RE = re.compile(r'\w+')
+
+# Stopwords minimal (hasil akhir) & stopwords untuk backfill 1 kata
+STOPWORDS = frozenset(['and', 'the', 'with', 'for', 'you', 'from', 'in', 'on', 'at', 'to', 'of', 'by', 'my', 'is', 'a', 'it', 'video', 'videos', 'lyric', 'lyrics', 'official', 'hd', '4k'])
+BACKFILL_STOPWORDS = STOPWORDS | {'mv'}
+
+STATS_COLUMNS = ['kw', 'count', 'total_views', 'total_likes', 'len']
+
+
+def explode_keywords(items):
+    # Satu entri per kemunculan keyword (tags + kata judul > 3 huruf).
+    # Duplikat dalam satu video tetap dihitung, sama seperti versi loop.
+    kws, per_item, views, likes = [], [], [], []
+    for item in items:
+        stats = item['statistics']
+        title_words = TITLE_WORD_RE.findall(item['snippet']['title'].lower())
+        all_keywords = item['snippet'].get('tags', []) + [w for w in title_words if len(w) > 3]
+        kws.extend(all_keywords)
+        per_item.append(len(all_keywords))
+        views.append(int(stats.get('viewCount', 0)))
+        likes.append(int(stats.get('likeCount', 0)))
+    per_item = np.asarray(per_item, dtype=np.int64)
+    return (
+        kws,
+        np.repeat(np.asarray(views, dtype=np.int64), per_item),
+        np.repeat(np.asarray(likes, dtype=np.int64), per_item),
+    )
+
+
+def keyword_stats_frame(items, target_counts, min_freq=MIN_FREQ):
+    # Agregasi count/views/likes per keyword, urut sesuai kemunculan pertama.
+    # Normalisasi, cek junk & hitung kata cukup sekali per string unik
+    # (factorize), lalu groupby via bincount di NumPy.
+    kws, views, likes = explode_keywords(items)
+    if not kws:
+        return pd.DataFrame({c: pd.Series(dtype=object if c == 'kw' else np.int64) for c in STATS_COLUMNS})
+
+    raw_codes, raw_uniques = pd.factorize(np.asarray(kws, dtype=object))
+    cleaned = [k.lower().strip() for k in raw_uniques]
+    clean_codes, clean_uniques = pd.factorize(np.asarray(cleaned, dtype=object))
+
+    # Keyword yang muncul < min_freq pasti dibuang, jadi cek junk & panjang
+    # kata cukup untuk kandidat yang lolos frekuensi saja
+    n = len(clean_uniques)
+    occ_codes = clean_codes[raw_codes]
+    count = np.bincount(occ_codes, minlength=n)
+    candidates = np.flatnonzero(count >= min_freq)
+
+    word_len = np.zeros(n, dtype=np.int64)
+    valid = np.zeros(n, dtype=bool)
+    for code in candidates.tolist():
+        kw = clean_uniques[code]
+        if JUNK_RE.search(kw): continue
+        wl = len(kw.split())
+        word_len[code] = wl
+        valid[code] = (wl == 1 and 1 in target_counts) or (wl == 2 and 2 in target_counts) or (wl >= 3 and 3 in target_counts)
+
+    keep = valid[occ_codes]
+    occ_codes = occ_codes[keep]
+    total_views = np.zeros(n, dtype=np.int64)
+    total_likes = np.zeros(n, dtype=np.int64)
+    np.add.at(total_views, occ_codes, views[keep])
+    np.add.at(total_likes, occ_codes, likes[keep])
+
+    return pd.DataFrame({
+        'kw': clean_uniques[valid],
+        'count': count[valid].astype(np.int64),
+        'total_views': total_views[valid],
+        'total_likes': total_likes[valid],
+        'len': word_len[valid],
+    })
+
+
+def backfill_one_word_frame(stats, min_freq=MIN_FREQ):
+    # Pecah keyword 2/3 kata jadi kata tunggal yang belum ada. Kalau satu kata
+    # muncul di beberapa parent, ambil parent dengan rata-rata views tertinggi
+    # (seri -> parent yang muncul duluan).
+    lens = stats['len'].to_numpy()
+    existing_1_word = set(stats['kw'].to_numpy()[lens == 1].tolist())
+    parent_mask = ((lens == 2) | (lens == 3)) & (stats['count'].to_numpy() >= min_freq)
+    if not parent_mask.any():
+        return stats
+
+    p_kw = stats['kw'].to_numpy()[parent_mask]
+    p_count = stats['count'].to_numpy()[parent_mask]
+    p_views = stats['total_views'].to_numpy()[parent_mask]
+    p_likes = stats['total_likes'].to_numpy()[parent_mask]
+
+    words, parent_idx = [], []
+    for i, kw in enumerate(p_kw.tolist()):
+        for w in kw.split():
+            w_clean = w.strip()
+            if len(w_clean) > 2 and w_clean not in BACKFILL_STOPWORDS and w_clean not in existing_1_word:
+                words.append(w_clean)
+                parent_idx.append(i)
+    if not words:
+        return stats
+
+    # Kode factorize = urutan kemunculan pertama; urutkan (avg desc, posisi asc)
+    # lalu ambil baris pertama per kata
+    parent_idx = np.asarray(parent_idx, dtype=np.int64)
+    codes, uniques = pd.factorize(np.asarray(words, dtype=object))
+    avg = (p_views // p_count)[parent_idx]
+    order = np.lexsort((np.arange(len(codes)), -avg))
+    _, first = np.unique(codes[order], return_index=True)
+    best = parent_idx[order[first]]
+
+    new_entries = pd.DataFrame({
+        'kw': uniques,
+        'count': p_count[best],
+        'total_views': p_views[best],
+        'total_likes': p_likes[best],
+        'len': np.ones(len(uniques), dtype=np.int64),
+    })
+    return pd.concat([stats, new_entries], ignore_index=True)
+
+
+def backfill_one_word_keywords(tag_stats, min_freq=MIN_FREQ):
+    # API dict lama: {keyword: {'count', 'total_views', 'total_likes', 'len'}}
+    frame = pd.DataFrame(
+        [(k, v['count'], v['total_views'], v['total_likes'], v['len']) for k, v in tag_stats.items()],
+        columns=STATS_COLUMNS
+    )
+    if frame.empty:
+        return dict(tag_stats)
+    filled = backfill_one_word_frame(frame, min_freq=min_freq)
+    final_stats = dict(tag_stats)
+    for row in filled.iloc[len(frame):].itertuples(index=False):
+        final_stats[row.kw] = {'count': int(row.count), 'total_views': int(row.total_views), 'total_likes': int(row.total_likes), 'len': 1}
+    return final_stats
+
+
+def score_keywords(stats):
+    stats = stats[~stats['kw'].isin(STOPWORDS)]
+    if stats.empty:
+        return []
+
+    freq = stats['count'].to_numpy(dtype=np.int64)
+    avg_views = stats['total_views'].to_numpy(dtype=np.int64) / freq
+    avg_likes = stats['total_likes'].to_numpy(dtype=np.int64) / freq
+
+    score_view = np.minimum((avg_views / 50000) * 40, 40)
+    score_freq = np.minimum(freq * 10, 30)
+    score_eng = np.minimum((avg_likes / (avg_views + 1) * 100) * 10, 30)
+    final_score = score_view + score_freq + score_eng
+
+    word_len = stats['len'].to_numpy()
+    cat_text = np.where(word_len == 1, "1 Kata", np.where(word_len == 2, "2 Kata", "3+ Kata"))
+
+    # round() Python (bukan np.round) supaya pembulatan identik dengan versi lama
+    return [
+        {
+            "Jenis": cat,
+            "Kata Kunci": kw,
+            "Muncul di Video": f,
+            "Rata-rata Views": int(av),
+            "Engagement Score": round(se, 1),
+            "Skor Viral": round(fs, 1),
+            "word_count_raw": wl
+        }
+        for cat, kw, f, av, se, fs, wl in zip(
+            cat_text.tolist(), stats['kw'].tolist(), freq.tolist(), avg_views.tolist(),
+            score_eng.tolist(), final_score.tolist(), word_len.tolist()
+        )
+    ]
+
+
+def aggregate_keywords(items_to_process, target_counts, min_freq=MIN_FREQ):
+    # === 1. AGREGASI + FILTER FREKUENSI (MIN 3 VIDEO) ===
+    stats = keyword_stats_frame(items_to_process, target_counts, min_freq=min_freq)
+    # === 2. BACKFILL ===
+    stats = backfill_one_word_frame(stats, min_freq=min_freq)
+    # === 3. SKOR ===
+    return score_keywords(stats)
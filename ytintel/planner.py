@@ -0,0 +1,187 @@
+import math
+
+from ytintel.enrich import fetch_videos, fetch_channel_stats, subscriber_count
+
+# ==========================================
+# QUERY PLANNER ENRICHMENT (URUTAN FILTER TERMURAH)
+# ==========================================
+# Kandidat hasil search butuh dua enrichment: detail video (videos.list ->
+# filter durasi & views) dan statistik channel (channels.list -> filter subs).
+# Keduanya 1 unit per 50 ID, yang masih segar di cache metadata gratis.
+# Planner mengestimasi selektivitas tiap filter dari cache metadata + kandidat
+# yang sudah di-enrich di scan yang sama, lalu memilih urutan dengan perkiraan
+# call paling sedikit: tahap kedua cuma untuk kandidat yang lolos tahap pertama.
+#
+# Semua data enrichment dikumpulkan di superset (new_superset). Kandidat yang
+# dilewati planner dilengkapi belakangan lewat complete() kalau filter yang
+# dilonggarkan ternyata butuh datanya, jadi superset tetap bisa di-refilter.
+CHANNELS_FIRST = "channels"
+VIDEOS_FIRST = "videos"
+PRIOR_PASS_RATE = 0.5       # tebakan awal selektivitas sebelum ada data sama sekali
+BATCH_SIZE = 50
+
+
+def new_superset():
+    return {
+        'order': [],                # videoId urut hasil search
+        'channel_of': {},           # videoId -> channelId (dari search)
+        'items': {},                # videoId -> item videos.list (ringkas)
+        'subs': {},                 # channelId -> subscriber
+        'videos_checked': set(),
+        'channels_checked': set(),
+        'seen': {'videos': [0, 0], 'channels': [0, 0]},     # [lolos, dicek] per filter
+    }
+
+
+def add_candidates(superset, items):
+    # items: hasil search (id/videoId + snippet/channelId). Return videoId baru.
+    new = []
+    for item in items:
+        vid = item['id']['videoId']
+        if vid in superset['channel_of']: continue
+        superset['channel_of'][vid] = item['snippet']['channelId']
+        superset['order'].append(vid)
+        new.append(vid)
+    return new
+
+
+def copy_superset(superset):
+    # Superset dari cache hasil bersifat read-only; yang mau dilengkapi di-copy
+    return {
+        **superset,
+        'items': dict(superset['items']),
+        'subs': dict(superset['subs']),
+        'videos_checked': set(superset['videos_checked']),
+        'channels_checked': set(superset['channels_checked']),
+        'seen': {k: list(v) for k, v in superset['seen'].items()},
+    }
+
+
+def skipped(superset):
+    # (detail video, channel) yang dilewati planner / belum pernah dibutuhkan
+    channels = set(superset['channel_of'].values())
+    return len(superset['order']) - len(superset['videos_checked']), len(channels - superset['channels_checked'])
+
+
+# ==========================================
+# FETCH KE SUPERSET
+# ==========================================
+def fetch_details(gateway, cache, api_keys_list, superset, video_ids, slim, keep=None, report=None):
+    video_ids = [vid for vid in dict.fromkeys(video_ids) if vid not in superset['videos_checked']]
+    if not video_ids: return
+    items_map = fetch_videos(gateway, cache, api_keys_list, video_ids, keep=keep, report=report)
+    for vid in video_ids:
+        if vid not in items_map: continue
+        try: superset['items'][vid] = slim(items_map[vid])
+        except: pass
+    superset['videos_checked'].update(video_ids)
+
+
+def fetch_subs(gateway, cache, api_keys_list, superset, channel_ids):
+    # Channel yang gagal diambil dianggap 0 subscriber (subs.get(cid, 0))
+    channel_ids = [cid for cid in dict.fromkeys(channel_ids) if cid not in superset['channels_checked']]
+    if not channel_ids: return
+    for cid, stats in fetch_channel_stats(gateway, cache, api_keys_list, channel_ids).items():
+        try: superset['subs'][cid] = subscriber_count(stats)
+        except: pass
+    superset['channels_checked'].update(channel_ids)
+
+
+# ==========================================
+# ESTIMASI & EKSEKUSI
+# ==========================================
+def pass_rate(seen, prior=PRIOR_PASS_RATE):
+    passed, total = seen
+    return passed / total if total else prior
+
+
+def expected_calls(probs):
+    # Perkiraan call untuk ID dengan peluang dibutuhkan probs
+    return math.ceil(round(sum(probs), 6) / BATCH_SIZE)
+
+
+def plan_order(cache, superset, video_ids, video_ok, subs_ok, keep=None, default=CHANNELS_FIRST, allowed=(CHANNELS_FIRST, VIDEOS_FIRST)):
+    # Return (urutan, {urutan: perkiraan call}) untuk enrichment video_ids.
+    # video_ok(item) / subs_ok(subs): filter saat ini. Peluang lolos per
+    # kandidat diambil dari data yang sudah ada (superset / cache metadata);
+    # yang belum ada datanya pakai selektivitas yang teramati di scan ini.
+    if len(allowed) == 1: return allowed[0], {}
+    channel_of = superset['channel_of']
+    vids = [vid for vid in video_ids if vid not in superset['videos_checked']]
+    cids = list(dict.fromkeys(channel_of[vid] for vid in video_ids if channel_of[vid] not in superset['channels_checked']))
+    v_fresh, v_stale, _ = cache.lookup("videos", vids, count=False)
+    c_fresh, _, _ = cache.lookup("channels", cids, static_parts=(), count=False)
+    rate_v = pass_rate(superset['seen']['videos'])
+    rate_s = pass_rate(superset['seen']['channels'])
+
+    def p_video(vid):
+        item = superset['items'].get(vid) or v_fresh.get(vid)
+        if item is not None: return 1.0 if video_ok(item) else 0.0
+        if vid in superset['videos_checked']: return 0.0
+        if vid in v_stale and keep is not None and not keep(v_stale[vid]): return 0.0
+        return rate_v
+
+    def p_subs(vid):
+        cid = channel_of[vid]
+        if cid in superset['channels_checked']: return 1.0 if subs_ok(superset['subs'].get(cid, 0)) else 0.0
+        if cid in c_fresh:
+            try: return 1.0 if subs_ok(subscriber_count(c_fresh[cid].get('statistics', {}))) else 0.0
+            except: pass
+        return rate_s
+
+    # Biaya satu tahap: ID yang belum segar di cache x peluang dibutuhkan
+    def video_cost(need):
+        return expected_calls(need(vid) for vid in vids if vid not in v_fresh)
+
+    def channel_cost(need):
+        by_channel = {}
+        for vid in video_ids: by_channel.setdefault(channel_of[vid], []).append(vid)
+        return expected_calls(1 - math.prod(1 - need(vid) for vid in by_channel[cid]) for cid in cids if cid not in c_fresh)
+
+    costs = {
+        CHANNELS_FIRST: channel_cost(lambda vid: 1.0) + video_cost(p_subs),
+        VIDEOS_FIRST: video_cost(lambda vid: 1.0) + channel_cost(p_video),
+    }
+    best = min(costs[o] for o in allowed)
+    order = default if costs[default] == best else next(o for o in allowed if costs[o] == best)
+    return order, costs
+
+
+def enrich(gateway, cache, api_keys_list, superset, video_ids, order, video_ok, subs_ok, slim, keep=None, report=None, limit=None):
+    # Tahap pertama untuk semua video_ids, tahap kedua cuma untuk yang lolos.
+    # limit: maksimal kandidat lolos subs yang di-cek detailnya (CHANNELS_FIRST).
+    # Return daftar kandidat yang lolos tahap pertama.
+    channel_of, seen = superset['channel_of'], superset['seen']
+    if order == CHANNELS_FIRST:
+        fetch_subs(gateway, cache, api_keys_list, superset, [channel_of[vid] for vid in video_ids])
+        passed = [vid for vid in video_ids if subs_ok(superset['subs'].get(channel_of[vid], 0))]
+        seen['channels'][0] += len(passed)
+        seen['channels'][1] += len(video_ids)
+        if limit is not None: passed = passed[:max(0, limit)]
+        fetch_details(gateway, cache, api_keys_list, superset, passed, slim, keep, report)
+        return passed
+
+    fetch_details(gateway, cache, api_keys_list, superset, video_ids, slim, keep, report)
+    known = [vid for vid in video_ids if vid in superset['items']]
+    passed = [vid for vid in known if video_ok(superset['items'][vid])]
+    seen['videos'][0] += len(passed)
+    seen['videos'][1] += len(known)
+    fetch_subs(gateway, cache, api_keys_list, superset, [channel_of[vid] for vid in passed])
+    return passed
+
+
+def complete(gateway, cache, api_keys_list, superset, missing, slim, keep=None, report=None):
+    # Lengkapi data yang dibutuhkan filter saat ini. missing(superset) ->
+    # (videoId butuh detail, channelId butuh subs); diulang sampai kosong.
+    # Return (superset, jumlah ID yang di-fetch); superset di-copy dulu
+    # sebelum diubah.
+    fetched = 0
+    while True:
+        need_videos, need_channels = missing(superset)
+        need_videos = [vid for vid in dict.fromkeys(need_videos) if vid not in superset['videos_checked']]
+        need_channels = [cid for cid in dict.fromkeys(need_channels) if cid not in superset['channels_checked']]
+        if not need_videos and not need_channels: return superset, fetched
+        if not fetched: superset = copy_superset(superset)
+        fetch_subs(gateway, cache, api_keys_list, superset, need_channels)
+        fetch_details(gateway, cache, api_keys_list, superset, need_videos, slim, keep, report)
+        fetched += len(need_videos) + len(need_channels)
@@ -0,0 +1,294 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+try:
+    from zoneinfo import ZoneInfo
+    PACIFIC = ZoneInfo("America/Los_Angeles")
+except Exception:
+    PACIFIC = timezone(timedelta(hours=-8))
+
+try:
+    import fcntl
+except ImportError:     # Windows: flush antar proses tanpa kunci file
+    fcntl = None
+
+# ==========================================
+# QUOTA & KEY SCHEDULER
+# ==========================================
+QUOTA_FILE = "quota_state.json"
+DAILY_QUOTA = 10000
+
+# Estimasi biaya unit per endpoint (YouTube Data API v3)
+QUOTA_COST = {
+    "search.list": 100,
+    "videos.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+}
+
+# 403 quota -> cooldown sampai reset, 429/5xx -> cooldown singkat
+RATE_LIMIT_COOLDOWN = 60
+SERVER_ERROR_COOLDOWN = 10
+
+# Unit terpakai dikumpulkan di memori; ditulis ke disk paling sering tiap
+# FLUSH_INTERVAL detik (plus di akhir tiap batch & saat proses keluar).
+# Perubahan dari proses lain dicek paling sering tiap SYNC_INTERVAL detik.
+FLUSH_INTERVAL = 2.0
+SYNC_INTERVAL = 1.0
+COUNTERS = ("spent", "calls", "errors")
+
+
+def key_fingerprint(api_key):
+    # API key asli tidak pernah ditulis ke disk
+    return hashlib.sha256(api_key.strip().encode("utf-8")).hexdigest()[:12]
+
+
+def pacific_day(now=None):
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(PACIFIC).strftime("%Y-%m-%d")
+
+
+def next_quota_reset(now=None):
+    # Kuota YouTube reset tiap tengah malam waktu Pasifik
+    now = (now or datetime.now(timezone.utc)).astimezone(PACIFIC)
+    midnight = datetime(now.year, now.month, now.day, tzinfo=PACIFIC) + timedelta(days=1)
+    return midnight.timestamp()
+
+
+@contextmanager
+def file_lock(path):
+    # Kunci read-modify-write file state antar proses
+    try:
+        f = open(path + ".lock", "a") if fcntl else None
+    except OSError:
+        f = None
+    if f is None:
+        yield
+        return
+    with f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def http_error_reason(error):
+    try:
+        body = json.loads(error.content.decode("utf-8") if isinstance(error.content, bytes) else error.content)
+        return body["error"]["errors"][0].get("reason", "")
+    except:
+        return ""
+
+
+class ApiKeyScheduler:
+    # State per key: unit terpakai hari ini + cooldown. Disimpan ke file JSON
+    # (tanpa API key asli) supaya tetap nyambung antar rerun & antar proses.
+    # charge() cuma mengubah memori; yang ditulis ke disk adalah delta
+    # (spent/calls/errors) sejak flush terakhir, ditambahkan ke isi file
+    # terbaru, jadi spend dua proses pada key yang sama tidak saling timpa.
+
+    def __init__(self, state_file=QUOTA_FILE, daily_quota=DAILY_QUOTA):
+        self.state_file = state_file
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._mtime = 0
+        self._synced_at = 0
+        self._flushed_at = time.monotonic()
+        self._state = {"day": pacific_day(), "keys": {}}
+        self._pending = {}      # fp -> delta yang belum ditulis
+        self._inflight = {}     # fp -> delta yang sedang ditulis flush()
+        self._dirty = False     # cooldown berubah sejak flush terakhir
+        self._load()
+        atexit.register(self.flush)
+
+    # --- persistence ---
+    def _read_disk(self):
+        if not os.path.exists(self.state_file):
+            return None
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f)
+        except:
+            return None
+
+    def _write_disk(self, state):
+        tmp = f"{self.state_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_file)
+            return True
+        except:
+            return False
+
+    def _rebase(self, disk):
+        # State di memori = isi disk + delta yang belum sampai ke disk.
+        # Cooldown berupa waktu absolut, jadi cukup ambil yang paling lama.
+        keys = {}
+        if disk and disk.get("day") == self._state["day"]:
+            for fp, entry in disk.get("keys", {}).items():
+                keys[fp] = {**self._empty_entry(), **entry}
+        for deltas in (self._inflight, self._pending):
+            for fp, delta in deltas.items():
+                entry = keys.setdefault(fp, self._empty_entry())
+                for field in COUNTERS: entry[field] += delta.get(field, 0)
+        for fp, mine in self._state["keys"].items():
+            entry = keys.setdefault(fp, self._empty_entry())
+            entry["cooldown_until"] = max(entry["cooldown_until"], mine["cooldown_until"])
+        self._state["keys"] = keys
+
+    def _load(self):
+        disk = self._read_disk()
+        if disk:
+            self._rebase(disk)
+            self._mtime = self._disk_mtime()
+
+    def _disk_mtime(self):
+        try:
+            return os.path.getmtime(self.state_file)
+        except OSError:
+            return 0
+
+    def _sync(self):
+        today = pacific_day()
+        if self._state["day"] != today:
+            # Hari baru: delta kemarin (belum/sedang ditulis) tidak boleh
+            # memakan headroom hari ini
+            self._state = {"day": today, "keys": {}}
+            self._pending = {}
+            self._inflight = {}
+        now = time.monotonic()
+        if now - self._synced_at < SYNC_INTERVAL: return
+        self._synced_at = now
+        mtime = self._disk_mtime()
+        if mtime > self._mtime:
+            self._rebase(self._read_disk())
+            self._mtime = mtime
+
+    def flush(self):
+        # Tulis delta yang terkumpul: baca file terbaru, tambahkan delta,
+        # gabungkan cooldown, tulis atomik. I/O di luar self._lock supaya
+        # thread lain tetap bisa pick/charge selama flush.
+        with self._flush_lock:
+            with self._lock:
+                self._flushed_at = time.monotonic()
+                if not self._pending and not self._dirty: return
+                inflight = self._inflight = self._pending
+                self._pending = {}
+                self._dirty = False
+                day = self._state["day"]
+                cooldowns = {fp: e["cooldown_until"] for fp, e in self._state["keys"].items() if e["cooldown_until"]}
+            with file_lock(self.state_file):
+                disk = self._read_disk()
+                if not disk or disk.get("day") != day: disk = {"day": day, "keys": {}}
+                for fp, delta in inflight.items():
+                    entry = disk["keys"].setdefault(fp, self._empty_entry())
+                    for field in COUNTERS: entry[field] = entry.get(field, 0) + delta.get(field, 0)
+                for fp, until in cooldowns.items():
+                    entry = disk["keys"].setdefault(fp, self._empty_entry())
+                    entry["cooldown_until"] = max(entry.get("cooldown_until", 0), until)
+                written = self._write_disk(disk)
+                mtime = self._disk_mtime()
+            with self._lock:
+                same_day = self._state["day"] == day
+                self._inflight = {}
+                if not written:
+                    # Gagal tulis: delta dikembalikan, dicoba lagi di flush berikutnya
+                    if same_day:
+                        for fp, delta in inflight.items():
+                            self._add_pending(fp, delta)
+                    self._dirty = True
+                    return
+                if same_day:
+                    self._rebase(disk)
+                    self._mtime = mtime
+
+    # --- state ---
+    @staticmethod
+    def _empty_entry():
+        return {"spent": 0, "cooldown_until": 0, "calls": 0, "errors": 0}
+
+    def _entry(self, api_key):
+        return self._state["keys"].setdefault(key_fingerprint(api_key), self._empty_entry())
+
+    def _add_pending(self, fp, delta):
+        pending = self._pending.setdefault(fp, {})
+        for field, value in delta.items():
+            pending[field] = pending.get(field, 0) + value
+
+    def _add(self, api_key, **delta):
+        entry = self._entry(api_key)
+        for field, value in delta.items():
+            entry[field] += value
+        self._add_pending(key_fingerprint(api_key), delta)
+
+    def _flush_due(self):
+        return time.monotonic() - self._flushed_at >= FLUSH_INTERVAL
+
+    def headroom(self, api_key):
+        with self._lock:
+            self._sync()
+            return max(0, self.daily_quota - self._entry(api_key)["spent"])
+
+    def pick(self, api_keys_list, cost=1, exclude=()):
+        # Pilih key dengan sisa kuota terbesar yang tidak sedang cooldown
+        now = time.time()
+        best_idx, best_room = None, -1
+        with self._lock:
+            self._sync()
+            for idx, key in enumerate(api_keys_list):
+                if idx in exclude: continue
+                entry = self._entry(key)
+                if entry["cooldown_until"] > now: continue
+                room = self.daily_quota - entry["spent"]
+                if room < cost: continue
+                if room > best_room:
+                    best_idx, best_room = idx, room
+        return best_idx
+
+    def charge(self, api_key, cost):
+        with self._lock:
+            self._sync()
+            self._add(api_key, spent=cost, calls=1)
+            due = self._flush_due()
+        if due: self.flush()
+
+    def penalize(self, api_key, status, reason=""):
+        # Cooldown langsung di-flush supaya proses lain ikut menghindari key ini
+        with self._lock:
+            self._sync()
+            entry = self._entry(api_key)
+            self._add(api_key, errors=1)
+            if status == 403 and ("quota" in reason.lower() or "dailylimit" in reason.lower() or not reason):
+                self._add(api_key, spent=max(0, self.daily_quota - entry["spent"]))
+                entry["cooldown_until"] = next_quota_reset()
+            elif status in (403, 429):
+                entry["cooldown_until"] = time.time() + RATE_LIMIT_COOLDOWN
+            else:
+                entry["cooldown_until"] = time.time() + SERVER_ERROR_COOLDOWN
+            self._dirty = True
+        self.flush()
+
+    def snapshot(self, api_keys_list):
+        now = time.time()
+        rows = []
+        with self._lock:
+            self._sync()
+            for idx, key in enumerate(api_keys_list):
+                entry = self._entry(key)
+                rows.append({
+                    "key_line": idx + 1,
+                    "spent": entry["spent"],
+                    "headroom": max(0, self.daily_quota - entry["spent"]),
+                    "cooling_down": entry["cooldown_until"] > now,
+                    "calls": entry["calls"],
+                })
+        return rows
@@ -0,0 +1,85 @@
+import html
+import sys
+
+import pandas as pd
+
+from ytintel.enrich import fetch_videos
+
+# ==========================================
+# HASIL SCAN (FRAME BERTIPE, TEKS DIAMBIL BELAKANGAN)
+# ==========================================
+# Baris dari scan.build_video_row langsung diubah per halaman jadi DataFrame
+# bertipe: channel categorical, views/subs/durasi integer.
+# Deskripsi & tags (bagian terbesar tiap baris) tidak disimpan di hasil; yang
+# butuh (Metadata Editor, export) mengambilnya per halaman lewat load_text dari
+# cache metadata, yang memang sudah menyimpan snippet video.
+TEXT_COLUMNS = ("Tags List", "Deskripsi")
+COLUMNS = ["Thumbnail", "Judul Video", "Channel", "ChannelId", "Subs", "Views", "Engagement", "Durasi", "Durasi Detik", "Link", "VideoId"]
+DTYPES = {
+    "Channel": "category",
+    "ChannelId": "category",
+    "Keyword": "category",
+    "Subs": "int64",
+    "Views": "int64",
+    "Engagement": "float32",
+    "Durasi Detik": "int32",
+}
+KEYWORD_SEP = ", "
+TEXT_CHUNK = 50         # baris per load_text saat export (1 videos.list kalau tergusur)
+
+
+def to_frame(rows):
+    # rows: list dict build_video_row (boleh ada "Keyword" berupa list).
+    # Kolom teks besar dibuang, tipe kolom dipadatkan.
+    if not rows: return pd.DataFrame(columns=COLUMNS)
+    columns = COLUMNS + (["Keyword"] if "Keyword" in rows[0] else [])
+    df = pd.DataFrame([[r.get(c) for c in columns] for r in rows], columns=columns)
+    if "Keyword" in df.columns: df["Keyword"] = df["Keyword"].map(KEYWORD_SEP.join)
+    return df.astype({c: t for c, t in DTYPES.items() if c in df.columns})
+
+
+def concat_frames(frames):
+    # concat biasa mengubah categorical jadi object kalau kategorinya beda
+    frames = [f for f in frames if len(f)]
+    if not frames: return to_frame([])
+    df = pd.concat(frames, ignore_index=True)
+    return df.astype({c: t for c, t in DTYPES.items() if c in df.columns})
+
+
+def keyword_mask(df, keyword):
+    return df["Keyword"].map(lambda ks: keyword in ks.split(KEYWORD_SEP)).astype(bool)
+
+
+def load_text(gateway, cache, api_keys_list, video_ids):
+    # Return {videoId: {"Tags List": [...], "Deskripsi": str}}. Snippet dari
+    # cache metadata (umur statistik tidak penting di sini); yang sudah
+    # tergusur dari cache di-fetch ulang. Tag di-intern supaya tag yang sama
+    # di banyak video menunjuk ke string yang sama.
+    video_ids = list(dict.fromkeys(video_ids))
+    fresh, stale, missing = cache.lookup("videos", video_ids, static_parts=("snippet",), count=False)
+    items = {**stale, **fresh}
+    if missing: items.update(fetch_videos(gateway, cache, api_keys_list, missing))
+    texts = {}
+    for vid in video_ids:
+        snippet = items.get(vid, {}).get('snippet', {})
+        texts[vid] = {
+            "Tags List": [sys.intern(t) for t in snippet.get('tags', [])],
+            "Deskripsi": html.unescape(snippet.get('description', "")),
+        }
+    return texts
+
+
+def with_text(df, texts):
+    # Tempelkan kolom teks (hasil load_text) ke potongan frame
+    empty = {"Tags List": [], "Deskripsi": ""}
+    return df.assign(**{c: [texts.get(vid, empty)[c] for vid in df["VideoId"]] for c in TEXT_COLUMNS})
+
+
+def iter_with_text(gateway, cache, api_keys_list, df, chunk=TEXT_CHUNK):
+    # yield (index, baris + kolom teks) per baris; teks diambil per chunk
+    # baris dan dilepas setelah chunk itu habis di-yield, jadi export besar
+    # tidak pernah memegang deskripsi & tags semua baris sekaligus.
+    for start in range(0, len(df), chunk):
+        part = df.iloc[start:start + chunk]
+        texts = load_text(gateway, cache, api_keys_list, part['VideoId'].tolist())
+        yield from with_text(part, texts).iterrows()
@@ -0,0 +1,344 @@
+import html
+import re
+import time
+
+from googleapiclient.errors import HttpError
+
+from ytintel import planner
+from ytintel.filters import duration_bucket, time_windows
+
+# ==========================================
+# SCAN VIDEO VIRAL (TANPA STREAMLIT)
+# ==========================================
+DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+MAX_IDS_CHECKED = 1000
+PAGE_SIZE = 50
+# Jumlah sample search per mode scan (sidebar "Kekuatan")
+SCAN_LIMITS = {"🌱 Hemat": 50, "⚖️ Sedang": 150, "🔥 Agresif": 500, "☠️ BRUTAL": 2000}
+
+
+def parse_duration(pt_string):
+    try:
+        match = DURATION_RE.match(pt_string)
+        if not match: return 0
+        h, m, s = match.groups()
+        return (int(h or 0) * 3600) + (int(m or 0) * 60) + int(s or 0)
+    except:
+        return 0
+
+
+def format_duration_human(seconds):
+    h = seconds // 3600
+    m = (seconds % 3600) // 60
+    s = seconds % 60
+    return f"{h}j {m}m {s}d" if h > 0 else f"{m}m {s}d"
+
+
+def add_timing(report, stage, started):
+    timings = report.setdefault('timings', {})
+    timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - started)
+
+
+# search.list cuma dipakai untuk videoId + channelId (filter subs per halaman);
+# judul, thumbnail dst diambil dari videos.list
+SEARCH_FIELDS = "nextPageToken,items(id/videoId,snippet/channelId)"
+
+
+def search_request(search_query, published_after, video_duration, token=None, published_before=None):
+    return lambda yt: yt.search().list(part="snippet", q=search_query, order="viewCount", publishedAfter=published_after, publishedBefore=published_before, type="video", videoDuration=video_duration, maxResults=PAGE_SIZE, pageToken=token, fields=SEARCH_FIELDS)
+
+
+# ==========================================
+# PAGINASI SEARCH (SATU CURSOR / BANYAK CURSOR)
+# ==========================================
+def unique_items(items, seen=None):
+    # Dedup hasil search per videoId (urutan pertama dipertahankan)
+    seen = seen if seen is not None else set()
+    out = []
+    for item in items:
+        vid = item['id']['videoId']
+        if vid in seen: continue
+        seen.add(vid)
+        out.append(item)
+    return out
+
+
+def page_count(target_count):
+    return -(-target_count // PAGE_SIZE)
+
+
+def search_rounds(gateway, api_keys_list, make_request, keys, target_count, report=None, on_status=None, group=None):
+    # Paginate banyak cursor search.list sekaligus: tiap ronde satu call_many
+    # berisi halaman berikutnya dari semua cursor yang masih jalan.
+    # make_request(key, token) -> lambda untuk search.list.
+    # yield ([(key, response / None)], masih_ada_ronde_berikutnya).
+    # group(key) -> kunci target (default key itu sendiri): cursor dengan group
+    # sama (misal sub-window waktu dari satu query) berbagi satu target_count,
+    # dan tiap ronde cuma cursor secukupnya yang di-request supaya hasilnya
+    # tidak lewat target lebih dari satu halaman.
+    # Budget halaman dibagi round-robin mulai dari cursor terakhir (sub-window
+    # terbaru): cursor yang paling sedikit di-request didahulukan.
+    report = report if report is not None else {}
+    group = group or (lambda key: key)
+    counts = {}
+    tokens = {key: None for key in keys}
+    requested = {key: 0 for key in keys}
+    rounds = 0
+
+    def next_batch():
+        batch, budget = [], {}
+        for key in sorted(reversed(list(tokens)), key=lambda k: requested[k]):
+            g = group(key)
+            if g not in budget: budget[g] = page_count(target_count - counts.get(g, 0))
+            if budget[g] > 0:
+                batch.append(key)
+                budget[g] -= 1
+        return batch
+
+    batch = next_batch()
+    while batch:
+        rounds += 1
+        if on_status: on_status(f"Search halaman {rounds} ({len(batch)} request paralel)...")
+        started = time.perf_counter()
+        for key in batch: requested[key] += 1
+        responses = gateway.call_many(api_keys_list, "search.list", [make_request(key, tokens[key]) for key in batch])
+        add_timing(report, 'search', started)
+        done = list(zip(batch, responses))
+        for key, res in done:
+            items = res.get('items', []) if res else []
+            counts[group(key)] = counts.get(group(key), 0) + len(items)
+            if items and res.get('nextPageToken'): tokens[key] = res['nextPageToken']
+            else: del tokens[key]
+        batch = next_batch()
+        yield done, bool(batch)
+
+
+def cursor_pages(gateway, api_keys_list, make_request, target_count, report, state):
+    # Satu cursor search.list; halaman berikutnya di-prefetch selagi halaman
+    # ini diproses pemanggil. make_request(token). yield (items, key_idx).
+    # state diisi: pages, more (halaman berikutnya sudah di-request),
+    # exhausted (semua key habis di halaman pertama), abandoned (prefetch
+    # yang terlanjur jalan saat pemanggil berhenti duluan).
+    state.update({'pages': 0, 'more': False, 'exhausted': False, 'abandoned': 0})
+    fetched = 0
+    pending = gateway.submit(api_keys_list, "search.list", make_request(None))
+    try:
+        while pending is not None:
+            started = time.perf_counter()
+            try:
+                search_res, key_idx = pending.result()
+            except HttpError:
+                break
+            finally:
+                add_timing(report, 'search', started)
+            pending = None
+            if search_res is None:
+                if state['pages'] == 0: state['exhausted'] = True
+                break
+            items = search_res.get('items', [])
+            state['pages'] += 1
+            fetched += len(items)
+            if search_res.get('nextPageToken') and fetched < target_count:
+                pending = gateway.submit(api_keys_list, "search.list", make_request(search_res['nextPageToken']))
+            state['more'] = pending is not None
+            yield items, key_idx
+    finally:
+        # Prefetch yang sudah terlanjur jalan tetap terhitung kuotanya
+        if pending is not None and not pending.cancel(): state['abandoned'] += 1
+
+
+def window_pages(gateway, api_keys_list, make_request, windows, target_count, report, state, on_status=None):
+    # Versi time-sliced dari cursor_pages: satu cursor per sub-window waktu
+    # (filters.time_windows), semua di-request paralel per ronde lewat
+    # search_rounds. make_request(window, token). Hasil satu ronde di-dedup
+    # per videoId lalu di-yield sebagai satu "halaman": (items, None).
+    state.update({'pages': 0, 'more': False, 'exhausted': False, 'abandoned': 0})
+    seen = set()
+    for done, more in search_rounds(gateway, api_keys_list, lambda i, token: make_request(windows[i], token), range(len(windows)), target_count, report, on_status, group=lambda i: 0):
+        ok = [res for _, res in done if res is not None]
+        if not ok and state['pages'] == 0: state['exhausted'] = True
+        state['pages'] += len(ok)
+        state['more'] = more
+        yield unique_items([item for res in ok for item in res.get('items', [])], seen), None
+
+
+def passes_filters(row, min_views, min_total_seconds, max_total_seconds):
+    # LOGIKA FILTER DURASI (MIN & MAKS) + VIEWS
+    return min_total_seconds <= row['Durasi Detik'] <= max_total_seconds and row['Views'] >= min_views
+
+
+def candidate_rows(ids_to_check, items_map, subs_map):
+    rows = []
+    for vid in ids_to_check:
+        if vid not in items_map: continue
+        try: rows.append(build_video_row(items_map[vid], subs_map))
+        except: pass
+    return rows
+
+
+def filter_rows(ids_to_check, items_map, subs_map, min_views, min_total_seconds, max_total_seconds):
+    return [r for r in candidate_rows(ids_to_check, items_map, subs_map) if passes_filters(r, min_views, min_total_seconds, max_total_seconds)]
+
+
+def build_video_row(item, subs_map):
+    stats = item['statistics']
+    snippet = item['snippet']
+    views = int(stats.get('viewCount', 0))
+    duration_sec = parse_duration(item['contentDetails']['duration'])
+    eng_rate = ((int(stats.get('likeCount', 0)) + int(stats.get('commentCount', 0))) / views * 100) if views > 0 else 0
+    return {
+        "Thumbnail": snippet['thumbnails']['high']['url'],
+        "Judul Video": html.unescape(snippet['title']),
+        "Channel": html.unescape(snippet['channelTitle']),
+        "ChannelId": snippet['channelId'],
+        "Subs": subs_map.get(snippet['channelId'], 0),
+        "Views": views,
+        "Engagement": round(eng_rate, 2),
+        "Durasi": format_duration_human(duration_sec),
+        "Durasi Detik": duration_sec,
+        "Tags List": snippet.get('tags', []),
+        "Deskripsi": html.unescape(snippet.get('description', "")),
+        "Link": f"https://www.youtube.com/watch?v={item['id']}",
+        "VideoId": item['id']
+    }
+
+
+# ==========================================
+# SUPERSET SCAN (PLANNER + REFILTER LOKAL)
+# ==========================================
+# Semua kandidat search masuk superset (planner.new_superset). Urutan
+# enrichment per halaman dipilih planner; filter subs/views/durasi diterapkan
+# ke superset oleh select_rows, jadi perubahan filter cukup dihitung ulang
+# secara lokal (complete_superset cuma melengkapi kandidat yang dulu dilewati).
+def slim_item(item):
+    # Field untuk build_video_row; tags & deskripsi diambil belakangan
+    # (results.load_text)
+    snippet = item['snippet']
+    return {
+        'id': item['id'],
+        'snippet': {'channelId': snippet['channelId'], 'channelTitle': snippet['channelTitle'], 'title': snippet['title'], 'thumbnails': {'high': snippet['thumbnails']['high']}},
+        'statistics': item['statistics'],
+        'contentDetails': {'duration': item['contentDetails']['duration']},
+    }
+
+
+def video_passes(item, min_views, min_total_seconds, max_total_seconds):
+    try:
+        return min_total_seconds <= parse_duration(item['contentDetails']['duration']) <= max_total_seconds and int(item['statistics'].get('viewCount', 0)) >= min_views
+    except:
+        return False
+
+
+def select_rows(superset, video_ids, max_subs, min_views, min_total_seconds, max_total_seconds, checked=0):
+    # Filter subs -> batas MAX_IDS_CHECKED (dihitung lintas halaman lewat
+    # checked) -> filter durasi & views. Return (rows, checked baru).
+    channel_of, subs_map, items = superset['channel_of'], superset['subs'], superset['items']
+    rows = []
+    for vid in video_ids:
+        if max_subs > 0 and subs_map.get(channel_of[vid], 0) >= max_subs: continue
+        if checked >= MAX_IDS_CHECKED: break
+        checked += 1
+        if vid not in items: continue
+        try: row = build_video_row(items[vid], subs_map)
+        except: continue
+        if passes_filters(row, min_views, min_total_seconds, max_total_seconds): rows.append(row)
+    return rows, checked
+
+
+def missing_data(superset, max_subs, min_views, min_total_seconds, max_total_seconds):
+    # (videoId, channelId) yang datanya dibutuhkan select_rows tapi belum
+    # di-fetch. Kalau batas MAX_IDS_CHECKED bisa tercapai, subs semua kandidat
+    # dibutuhkan dulu untuk menghitungnya; kalau tidak, subs yang belum
+    # diketahui dianggap lolos untuk hitungan batas.
+    channel_of, checked_c, checked_v, items = superset['channel_of'], superset['channels_checked'], superset['videos_checked'], superset['items']
+    if max_subs > 0 and len(superset['order']) > MAX_IDS_CHECKED:
+        need_channels = [channel_of[vid] for vid in superset['order'] if channel_of[vid] not in checked_c]
+        if need_channels: return [], need_channels
+    need_videos, need_channels = [], []
+    checked = 0
+    for vid in superset['order']:
+        cid = channel_of[vid]
+        if cid in checked_c and max_subs > 0 and superset['subs'].get(cid, 0) >= max_subs: continue
+        if checked >= MAX_IDS_CHECKED: break
+        checked += 1
+        passes = vid in items and video_passes(items[vid], min_views, min_total_seconds, max_total_seconds)
+        if vid not in checked_v:
+            # Filter subs duluan (lebih sering selektif), detailnya di putaran berikutnya
+            if max_subs > 0 and cid not in checked_c: need_channels.append(cid)
+            else: need_videos.append(vid)
+        elif passes and cid not in checked_c:
+            need_channels.append(cid)
+    return need_videos, need_channels
+
+
+def complete_superset(gateway, cache, api_keys_list, superset, max_subs, min_views, min_total_seconds, max_total_seconds, report=None):
+    # Return (superset, jumlah ID yang di-fetch), lihat planner.complete
+    keep_duration = lambda it: min_total_seconds <= parse_duration(it['contentDetails']['duration']) <= max_total_seconds
+    missing = lambda s: missing_data(s, max_subs, min_views, min_total_seconds, max_total_seconds)
+    return planner.complete(gateway, cache, api_keys_list, superset, missing, slim_item, keep_duration, report)
+
+
+def iter_viral_videos(gateway, cache, api_keys_list, keyword, max_subs, min_views, days_back, target_limit, min_total_seconds, max_total_seconds, report=None, on_progress=None, slices=1, superset=None):
+    # Versi streaming: tiap halaman search langsung di-enrich (urutan channel /
+    # detail dipilih planner), lalu baris yang lolos filter di-yield sebagai
+    # (rows, total_scanned), diakhiri ([], total_scanned).
+    # Halaman search berikutnya di-prefetch selagi halaman ini diproses.
+    # slices > 1: window umur dipecah jadi sub-window waktu yang di-search
+    # paralel (window_pages); tiap ronde diproses seperti satu halaman.
+    # report (dict, opsional) diisi statistik pre-filter durasi, planner, waktu
+    # per tahap, dan keys_exhausted kalau semua key habis di halaman pertama.
+    # on_progress(total_scanned, target_limit, key_idx) dipanggil tiap halaman
+    # (key_idx None untuk ronde time-sliced).
+    # superset (dict planner.new_superset, opsional) diisi semua kandidat
+    # beserta data enrichment-nya, untuk refilter lokal (select_rows).
+    # Jika keyword kosong, gunakan pencarian wildcard '*' agar tetap menemukan video populer
+    search_query = keyword if keyword.strip() != "" else "*"
+
+    windows = time_windows(days_back, slices, pages=page_count(target_limit))
+    superset = superset if superset is not None else planner.new_superset()
+    total_scanned = 0
+    ids_checked = 0
+
+    # PRE-FILTER DURASI: range sidebar -> videoDuration di search.list, dan
+    # video cache yang durasinya pasti gagal tidak di-refresh statistiknya
+    report = report if report is not None else {}
+    report.update({'duration_bucket': duration_bucket(min_total_seconds, max_total_seconds), 'detail_ids_skipped': 0, 'detail_calls_saved': 0, 'keys_exhausted': False, 'time_slices': len(windows),
+                   'plan': {planner.CHANNELS_FIRST: 0, planner.VIDEOS_FIRST: 0}, 'timings': {}})
+    keep_duration = lambda it: min_total_seconds <= parse_duration(it['contentDetails']['duration']) <= max_total_seconds
+    video_ok = lambda it: video_passes(it, min_views, min_total_seconds, max_total_seconds)
+    subs_ok = lambda subs: max_subs <= 0 or subs < max_subs
+    # Batas MAX_IDS_CHECKED dihitung dari kandidat yang lolos subs: kalau bisa
+    # tercapai, subs semua kandidat memang harus diketahui dulu
+    allowed = (planner.CHANNELS_FIRST,) if max_subs > 0 and target_limit + PAGE_SIZE > MAX_IDS_CHECKED else (planner.CHANNELS_FIRST, planner.VIDEOS_FIRST)
+
+    search = lambda window, token: search_request(search_query, window[0], report['duration_bucket'], token, window[1])
+    state = {}
+    if len(windows) > 1:
+        pages = window_pages(gateway, api_keys_list, search, windows, target_limit, report, state)
+    else:
+        pages = cursor_pages(gateway, api_keys_list, lambda token: search(windows[0], token), target_limit, report, state)
+
+    for items, key_idx in pages:
+        total_scanned += len(items)
+        if on_progress: on_progress(total_scanned, target_limit, key_idx)
+
+        page_ids = planner.add_candidates(superset, items)
+        # Tanpa filter subs, batas MAX_IDS_CHECKED langsung memotong kandidat
+        to_enrich = page_ids if max_subs > 0 else page_ids[:max(0, MAX_IDS_CHECKED - ids_checked)]
+        if not to_enrich: continue
+
+        started = time.perf_counter()
+        order, _ = planner.plan_order(cache, superset, to_enrich, video_ok, subs_ok, keep_duration, allowed=allowed)
+        report['plan'][order] += 1
+        planner.enrich(gateway, cache, api_keys_list, superset, to_enrich, order, video_ok, subs_ok, slim_item, keep_duration, report, limit=MAX_IDS_CHECKED - ids_checked)
+        add_timing(report, 'enrich', started)
+
+        started = time.perf_counter()
+        rows, ids_checked = select_rows(superset, page_ids, max_subs, min_views, min_total_seconds, max_total_seconds, ids_checked)
+        add_timing(report, 'rows', started)
+        if rows:
+            yield rows, total_scanned
+
+    report['keys_exhausted'] = state['exhausted']
+    report['details_skipped'], report['channels_skipped'] = planner.skipped(superset)
+    yield [], total_scanned
@@ -0,0 +1,381 @@
+import time
+
+from ytintel import planner
+from ytintel.enrich import fetch_videos, fetch_channel_stats, subscriber_count
+from ytintel.filters import duration_bucket, time_windows
+from ytintel.keywords import aggregate_keywords
+from ytintel.quota import QUOTA_COST
+from ytintel.scan import parse_duration, add_timing, cursor_pages, window_pages, page_count
+
+# ==========================================
+# ANALISA SEO VIRAL (PURE STATS & MAX VOLUME, TANPA STREAMLIT)
+# ==========================================
+def stage1_passes(item, min_duration_sec, min_views):
+    return parse_duration(item['contentDetails']['duration']) >= min_duration_sec and int(item['statistics'].get('viewCount', 0)) >= min_views
+
+
+def filter_video_stage1(items_map, video_ids, min_duration_sec, min_views, debug_stats):
+    valid_items = []
+    for vid in video_ids:
+        if vid not in items_map: continue
+        item = items_map[vid]
+        stats = item['statistics']
+        content = item['contentDetails']
+        views = int(stats.get('viewCount', 0))
+        dur_sec = parse_duration(content['duration'])
+        
+        if dur_sec < min_duration_sec: 
+            debug_stats['blocked_duration'] += 1
+            continue
+        if views < min_views: 
+            debug_stats['blocked_views'] += 1
+            continue
+        
+        valid_items.append(item)
+    return valid_items
+
+
+def apply_subs_filter(valid_items_stage1, subs_map, max_subs, debug_stats):
+    items_to_process = []
+    items_rescued_from_subs = [] 
+
+    for item in valid_items_stage1:
+        cid = item['snippet']['channelId']
+        subs = subs_map.get(cid, 0) 
+        
+        if max_subs > 0:
+            if subs > max_subs:
+                debug_stats['blocked_subs'] += 1
+                items_rescued_from_subs.append(item) 
+                continue
+        
+        debug_stats['passed_final'] += 1
+        items_to_process.append(item)
+
+    if len(items_to_process) == 0 and len(items_rescued_from_subs) > 0:
+        items_to_process = items_rescued_from_subs
+        debug_stats['auto_rescued'] = True 
+        debug_stats['passed_final'] = len(items_rescued_from_subs)
+
+    return items_to_process
+
+
+def keyword_ranking(results, top_n=20):
+    ranked = sorted(results, key=lambda r: (-r['Skor Viral'], r['Kata Kunci']))
+    return [r['Kata Kunci'] for r in ranked[:top_n]]
+
+
+def rank_correlation(prev_top, cur_top):
+    # Spearman rho antar dua daftar top-N; keyword yang tidak ada di salah
+    # satu daftar dianggap berada di peringkat N+1
+    universe = list(dict.fromkeys(prev_top + cur_top))
+    n = len(universe)
+    if n < 2: return 1.0 if prev_top == cur_top and n else 0.0
+    prev_rank = {k: i + 1 for i, k in enumerate(prev_top)}
+    cur_rank = {k: i + 1 for i, k in enumerate(cur_top)}
+    d2 = sum((prev_rank.get(k, len(prev_top) + 1) - cur_rank.get(k, len(cur_top) + 1)) ** 2 for k in universe)
+    return 1 - (6 * d2) / (n * (n * n - 1))
+
+
+# Dari search cukup videoId + channelId (untuk planner: filter subs bisa jalan
+# sebelum videos.list); judul, tags dst diambil dari videos.list
+SEARCH_FIELDS = "nextPageToken,items(id/videoId,snippet/channelId)"
+
+
+def search_request(title_query, published_after, video_duration, token=None, published_before=None):
+    return lambda yt: yt.search().list(
+        part="snippet", 
+        fields=SEARCH_FIELDS,
+        q=title_query, 
+        order="viewCount", 
+        publishedAfter=published_after, 
+        publishedBefore=published_before, 
+        type="video", 
+        videoDuration=video_duration,
+        maxResults=50, 
+        pageToken=token
+    )
+
+
+def new_debug_stats(min_duration_sec, adaptive=False):
+    # FRESH STATS
+    return {
+        'total_found_search': 0,
+        'blocked_duration': 0,
+        'blocked_views': 0,
+        'blocked_subs': 0,
+        'blocked_subs_unchecked': 0,
+        'passed_final': 0,
+        'auto_rescued': False,
+        'unique_channels_count': 0,
+        'total_videos_processed': 0,
+        'real_total_views': 0,
+        'yt_key_line': 0,
+        'duration_bucket': duration_bucket(min_duration_sec),
+        'detail_ids_skipped': 0,
+        'detail_calls_saved': 0,
+        'adaptive': adaptive,
+        'pages_fetched': 0,
+        'pages_planned': 0,
+        'pages_saved': 0,
+        'quota_saved': 0,
+        'rank_correlation': None,
+        'plan_order': None,
+        'details_skipped': 0,
+        'channels_skipped': 0,
+        'timings': {}
+    }
+
+
+def length_targets(length_filters):
+    target_counts = []
+    if "1 Kata" in length_filters: target_counts.append(1)
+    if "2 Kata" in length_filters: target_counts.append(2)
+    if "3+ Kata" in length_filters: target_counts.append(3)
+    if not target_counts: target_counts = [1, 2, 3]
+    return target_counts
+
+
+def research_target_count(mode_research):
+    # --- BOOSTED FETCH COUNT FOR "LOW RESULT" FIX ---
+    if mode_research == "🌱 Hemat":
+        return 200 # Up from 100
+    elif mode_research == "⚖️ Sedang":
+        return 500 # Up from 250
+    elif mode_research == "🔥 Agresif":
+        return 1000 # Up from 450
+    else: # BRUTAL / GOD MODE
+        return 1500 # Massive
+
+
+def finalize_analysis(items_to_process, target_counts, debug_stats):
+    unique_channels_final = set()
+    real_total_views_accumulated = 0 
+
+    for item in items_to_process:
+        unique_channels_final.add(item['snippet']['channelId'])
+        real_total_views_accumulated += int(item['statistics'].get('viewCount', 0))
+
+    debug_stats['unique_channels_count'] = len(unique_channels_final)
+    debug_stats['total_videos_processed'] = len(items_to_process)
+    debug_stats['real_total_views'] = real_total_views_accumulated 
+
+    started = time.perf_counter()
+    results = aggregate_keywords(items_to_process, target_counts)
+    add_timing(debug_stats, 'keywords', started)
+    return results
+
+
+def search_pages(gateway, api_keys_list, title_query, days_back, target_fetch_count, debug_stats, state, slices=1):
+    # SEARCH PAGINATION (ROTASI LEWAT SCHEDULER, HALAMAN BERIKUTNYA DI-PREFETCH)
+    # Generator (items, key_idx) per halaman; slices > 1 -> sub-window waktu
+    # paralel (scan.window_pages), key_idx None
+    windows = time_windows(days_back, slices, pages=page_count(target_fetch_count))
+    debug_stats['pages_planned'] = page_count(target_fetch_count)
+    debug_stats['time_slices'] = len(windows)
+    search = lambda window, token: search_request(title_query, window[0], debug_stats['duration_bucket'], token, window[1])
+    if len(windows) > 1:
+        return window_pages(gateway, api_keys_list, search, windows, target_fetch_count, debug_stats, state)
+    return cursor_pages(gateway, api_keys_list, lambda token: search(windows[0], token), target_fetch_count, debug_stats, state)
+
+
+def close_search(debug_stats, state, video_ids, key_idx):
+    # Prefetch yang sudah terlanjur jalan tetap terhitung kuotanya
+    debug_stats['pages_fetched'] = state['pages'] + state['abandoned']
+    debug_stats['total_found_search'] = len(video_ids)
+    debug_stats['yt_key_line'] = (key_idx or 0) + 1
+
+
+# ==========================================
+# SUPERSET + REFILTER LOKAL (MODE NON-ADAPTIF)
+# ==========================================
+# Semua hasil search masuk superset (planner.new_superset); urutan enrichment
+# (detail dulu / subs dulu) dipilih planner dari selektivitas filter saat ini,
+# kandidat yang sudah pasti gugur tidak di-enrich tahap keduanya. Filter,
+# auto-rescue subs dan agregasi keyword dijalankan di atas superset oleh
+# refilter(); perubahan filter cukup melengkapi data yang kurang
+# (complete_superset), tanpa search ulang. Cuma durasi minimal yang pindah
+# kategori videoDuration yang butuh search ulang.
+SEARCH_STATS = ('total_found_search', 'yt_key_line', 'duration_bucket', 'detail_ids_skipped', 'detail_calls_saved', 'pages_fetched', 'pages_planned', 'time_slices', 'plan_order', 'timings')
+
+
+def slim_item(item):
+    # Field yang dipakai filter_video_stage1, apply_subs_filter & aggregate_keywords
+    snippet = item['snippet']
+    return {
+        'id': item['id'],
+        'snippet': {'channelId': snippet['channelId'], 'title': snippet['title'], 'tags': snippet.get('tags', [])},
+        'statistics': item['statistics'],
+        'contentDetails': {'duration': item['contentDetails']['duration']},
+    }
+
+
+def missing_data(superset, max_subs, min_views, min_duration_sec):
+    # (videoId, channelId) yang dibutuhkan refilter tapi belum di-fetch: detail
+    # untuk kandidat yang tidak diblok subs, subs untuk yang lolos stage 1.
+    # Kalau tidak ada yang lolos subs, auto-rescue butuh detail yang diblok juga.
+    order, channel_of, items, subs = superset['order'], superset['channel_of'], superset['items'], superset['subs']
+    checked_v, checked_c = superset['videos_checked'], superset['channels_checked']
+    if max_subs <= 0: return [vid for vid in order if vid not in checked_v], []
+    need_videos, need_channels = [], []
+    passed = False
+    for vid in order:
+        cid = channel_of[vid]
+        if vid in checked_v:
+            if vid not in items or not stage1_passes(items[vid], min_duration_sec, min_views): continue
+            if cid not in checked_c: need_channels.append(cid)
+            elif subs.get(cid, 0) <= max_subs: passed = True
+        elif cid not in checked_c: need_channels.append(cid)
+        elif subs.get(cid, 0) <= max_subs: need_videos.append(vid)
+    if need_videos or need_channels or passed: return need_videos, need_channels
+    return [vid for vid in order if vid not in checked_v], []
+
+
+def subs_blocked_unchecked(superset, max_subs):
+    # Kandidat yang detailnya tidak pernah di-fetch karena channel-nya sudah
+    # lewat batas subs (planner: subs dulu). Mereka gugur di filter subs, jadi
+    # masuk blocked_subs; blokir durasi/views cuma menghitung sisanya.
+    if max_subs <= 0: return []
+    channel_of, subs = superset['channel_of'], superset['subs']
+    return [vid for vid in superset['order'] if vid not in superset['videos_checked']
+            and channel_of[vid] in superset['channels_checked'] and subs.get(channel_of[vid], 0) > max_subs]
+
+
+def complete_superset(gateway, metadata_cache, api_keys_list, superset, max_subs, min_views, min_duration_sec, report=None):
+    # Return (superset, jumlah ID yang di-fetch), lihat planner.complete
+    keep_duration = lambda it: parse_duration(it['contentDetails']['duration']) >= min_duration_sec
+    missing = lambda s: missing_data(s, max_subs, min_views, min_duration_sec)
+    return planner.complete(gateway, metadata_cache, api_keys_list, superset, missing, slim_item, keep_duration, report)
+
+
+def search_candidates(gateway, metadata_cache, api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, on_progress=None, slices=1):
+    # Return superset (+ 'debug' statistik search) untuk refilter()
+    debug_stats = new_debug_stats(min_duration_sec)
+    target_fetch_count = research_target_count(mode_research)
+    superset = planner.new_superset()
+    state = {}
+    found = 0
+    key_idx = None
+    for items, used_idx in search_pages(gateway, api_keys_list, title_query, days_back, target_fetch_count, debug_stats, state, slices):
+        if used_idx is not None: key_idx = used_idx
+        if not items: continue
+        found += len(items)
+        planner.add_candidates(superset, items)
+        if on_progress: on_progress(found, target_fetch_count, used_idx)
+    close_search(debug_stats, state, superset['order'], key_idx)
+
+    # ENRICHMENT (CACHE + PARALEL PER 50 ID). Tanpa filter subs, statistik
+    # channel tidak dibutuhkan sama sekali: cukup detail video.
+    started = time.perf_counter()
+    if max_subs > 0 and superset['order']:
+        keep_duration = lambda it: parse_duration(it['contentDetails']['duration']) >= min_duration_sec
+        video_ok = lambda it: stage1_passes(it, min_duration_sec, min_views)
+        subs_ok = lambda subs: subs <= max_subs
+        order, _ = planner.plan_order(metadata_cache, superset, superset['order'], video_ok, subs_ok, keep_duration, default=planner.VIDEOS_FIRST)
+        debug_stats['plan_order'] = order
+        planner.enrich(gateway, metadata_cache, api_keys_list, superset, superset['order'], order, video_ok, subs_ok, slim_item, keep_duration, debug_stats)
+    superset, _ = complete_superset(gateway, metadata_cache, api_keys_list, superset, max_subs, min_views, min_duration_sec, debug_stats)
+    add_timing(debug_stats, 'enrich', started)
+
+    superset['debug'] = {k: debug_stats[k] for k in SEARCH_STATS}
+    return superset
+
+
+def refilter(superset, max_subs, min_views, min_duration_sec, length_filters, top_up=None):
+    # Filter + agregasi keyword atas superset (sudah dilengkapi lewat
+    # complete_superset), tanpa API. Return (results, debug_stats) sama seperti
+    # analyze_viral_seo. top_up: report complete_superset kalau superset dari
+    # cache hasil -- statistik pre-filter, planner & waktu run asal diganti
+    # punya run ini.
+    debug_stats = new_debug_stats(min_duration_sec)
+    debug_stats.update(superset['debug'], timings=dict(superset['debug']['timings']))
+    if top_up is not None:
+        debug_stats.update(refiltered=True, plan_order=None, topped_up=top_up.get('topped_up', 0), timings=dict(top_up.get('timings', {})),
+                           detail_ids_skipped=top_up.get('detail_ids_skipped', 0), detail_calls_saved=top_up.get('detail_calls_saved', 0))
+    debug_stats['details_skipped'], debug_stats['channels_skipped'] = planner.skipped(superset)
+    if not superset['order']: return [], debug_stats
+
+    started = time.perf_counter()
+    valid_items_stage1 = filter_video_stage1(superset['items'], superset['order'], min_duration_sec, min_views, debug_stats)
+    debug_stats['blocked_subs_unchecked'] = len(subs_blocked_unchecked(superset, max_subs))
+    add_timing(debug_stats, 'filters', started)
+    if not valid_items_stage1:
+        debug_stats['blocked_subs'] += debug_stats['blocked_subs_unchecked']
+        return [], debug_stats
+
+    items_to_process = apply_subs_filter(valid_items_stage1, superset['subs'], max_subs, debug_stats)
+    debug_stats['blocked_subs'] += debug_stats['blocked_subs_unchecked']
+    return finalize_analysis(items_to_process, length_targets(length_filters), debug_stats), debug_stats
+
+
+def analyze_viral_seo(gateway, metadata_cache, api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, length_filters, adaptive=False, stability_threshold=0.9, stability_pages=2, top_n=20, on_progress=None, slices=1):
+    # on_progress(video_ditemukan, target, key_idx) dipanggil tiap halaman search
+    # (key_idx None untuk ronde time-sliced, lihat scan.window_pages)
+    if not adaptive:
+        superset = search_candidates(gateway, metadata_cache, api_keys_list, title_query, days_back, max_subs, min_views, min_duration_sec, mode_research, on_progress, slices)
+        return refilter(superset, max_subs, min_views, min_duration_sec, length_filters)
+
+    debug_stats = new_debug_stats(min_duration_sec, adaptive)
+    target_counts = length_targets(length_filters)
+    target_fetch_count = research_target_count(mode_research)
+    keep_duration = lambda it: parse_duration(it['contentDetails']['duration']) >= min_duration_sec
+
+    # Mode adaptif: tiap halaman langsung di-enrich & ranking keyword dihitung
+    # ulang selagi halaman berikutnya di-fetch. Stop kalau ranking top-N sudah
+    # stabil (korelasi >= threshold) selama beberapa halaman berturut-turut.
+    # Jumlah halaman bergantung filter, jadi mode ini tidak punya superset.
+    state = {}
+    pages = search_pages(gateway, api_keys_list, title_query, days_back, target_fetch_count, debug_stats, state, slices)
+    video_ids = []
+    valid_items_stage1 = []
+    subs_map = {}
+    key_idx = None
+    prev_top = None
+    stable_streak = 0
+    stopped_early = False
+
+    for items, used_idx in pages:
+        if used_idx is not None: key_idx = used_idx
+        
+        if not items: continue
+        
+        page_ids = [item['id']['videoId'] for item in items]
+        video_ids.extend(page_ids)
+
+        if on_progress: on_progress(len(video_ids), target_fetch_count, used_idx)
+
+        started = time.perf_counter()
+        items_map = fetch_videos(gateway, metadata_cache, api_keys_list, page_ids, keep=keep_duration, report=debug_stats)
+        page_valid = filter_video_stage1(items_map, page_ids, min_duration_sec, min_views, debug_stats)
+        valid_items_stage1.extend(page_valid)
+        add_timing(debug_stats, 'details', started)
+
+        started = time.perf_counter()
+        new_chans = list(set(item['snippet']['channelId'] for item in page_valid) - set(subs_map))
+        for cid, stats in fetch_channel_stats(gateway, metadata_cache, api_keys_list, new_chans).items():
+            subs_map[cid] = subscriber_count(stats)
+        add_timing(debug_stats, 'channels', started)
+
+        started = time.perf_counter()
+        scratch = dict.fromkeys(['blocked_subs', 'passed_final', 'auto_rescued'], 0)
+        cur_top = keyword_ranking(aggregate_keywords(apply_subs_filter(valid_items_stage1, subs_map, max_subs, scratch), target_counts), top_n)
+        add_timing(debug_stats, 'keywords', started)
+        if prev_top is not None and cur_top:
+            rho = rank_correlation(prev_top, cur_top)
+            debug_stats['rank_correlation'] = round(rho, 3)
+            stable_streak = stable_streak + 1 if rho >= stability_threshold else 0
+        prev_top = cur_top
+
+        if state['more'] and stable_streak >= stability_pages:
+            stopped_early = True
+            break
+    pages.close()
+    close_search(debug_stats, state, video_ids, key_idx)
+    if stopped_early:
+        debug_stats['pages_saved'] = max(0, debug_stats['pages_planned'] - debug_stats['pages_fetched'])
+        debug_stats['quota_saved'] = debug_stats['pages_saved'] * QUOTA_COST['search.list']
+
+    if not valid_items_stage1: return [], debug_stats
+
+    items_to_process = apply_subs_filter(valid_items_stage1, subs_map, max_subs, debug_stats)
+    return finalize_analysis(items_to_process, target_counts, debug_stats), debug_stats
@@ -0,0 +1,189 @@
+import html
+import shlex
+from datetime import datetime
+
+from ytintel.enrich import VIDEO_PARTS, VIDEO_FIELDS, chunked, fetch_channels, fetch_videos, response_items
+from ytintel.scan import parse_duration, format_duration_human
+
+# ==========================================
+# CHANNEL SPY (BATCH + CACHE)
+# ==========================================
+# Profil channel diambil 50 channel per channels.list. Top video dihitung dari
+# uploads playlist (playlistItems.list, 1 unit) kalau seluruh upload channel
+# muat dalam UPLOADS_MAX_PAGES halaman; channel yang lebih besar tetap pakai
+# 2x search.list (200 unit) seperti versi lama supaya ranking all-time akurat.
+TOP_N = 3
+UPLOADS_MAX_PAGES = 4
+SPY_VIDEO_PARTS = VIDEO_PARTS + ",liveStreamingDetails"
+SPY_VIDEO_FIELDS = VIDEO_FIELDS.replace("snippet(", "snippet(liveBroadcastContent,", 1)[:-1] + ",liveStreamingDetails(actualStartTime,actualEndTime))"
+UPLOADS_FIELDS = "etag,nextPageToken,items/contentDetails/videoId"
+SPY_SEARCH_FIELDS = "pageInfo/totalResults,items/id/videoId"
+
+
+def video_brief(item):
+    sec = parse_duration(item['contentDetails']['duration'])
+    return {
+        "title": html.unescape(item['snippet']['title']),
+        "duration_text": format_duration_human(sec),
+        "duration_seconds": sec,
+        "views": int(item['statistics'].get('viewCount', 0)),
+        "url": f"https://www.youtube.com/watch?v={item['id']}"
+    }
+
+
+def channel_profile(item):
+    spy_data = {
+        "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "channel_desc": "-", "channel_keywords": [],
+        "channel_age": 0, "channel_created": "-",
+        "subscriber_count": 0, "total_views_all": 0, "total_video_count": 0,
+        "live_count": 0, "reguler_count": 0,
+        "top_live_list": [], "top_reg_list": []
+    }
+    stt = item.get('statistics', {})
+    snp = item.get('snippet', {})
+    brd = item.get('brandingSettings', {}).get('channel', {})
+    spy_data["total_views_all"] = int(stt.get('viewCount', 0))
+    spy_data["total_video_count"] = int(stt.get('videoCount', 0))
+    if not stt.get('hiddenSubscriberCount'):
+        spy_data["subscriber_count"] = int(stt.get('subscriberCount', 0))
+    spy_data["channel_desc"] = snp.get('description', '-')
+    raw_kw = brd.get('keywords', '')
+    if raw_kw:
+        try: spy_data["channel_keywords"] = shlex.split(raw_kw)
+        except: spy_data["channel_keywords"] = raw_kw.split(' ')
+    created_at_str = snp.get('publishedAt', '')
+    if created_at_str:
+        created_date = datetime.strptime(created_at_str[:10], "%Y-%m-%d")
+        spy_data["channel_age"] = round((datetime.now() - created_date).days / 365, 1)
+        spy_data["channel_created"] = created_date.strftime("%Y-%m-%d")
+    return spy_data
+
+
+def broadcast_kind(item):
+    # liveStreamingDetails juga ada di premiere & siaran terjadwal; yang
+    # dihitung live cuma siaran yang sudah tayang (ada actualStartTime) dan
+    # sudah selesai -- sama seperti eventType="completed" di jalur search.
+    status = item.get('snippet', {}).get('liveBroadcastContent', 'none')
+    if status == 'upcoming': return 'upcoming'
+    if status == 'live': return 'live_now'
+    if item.get('liveStreamingDetails', {}).get('actualStartTime'): return 'live'
+    return 'reguler'
+
+
+def top_videos(items, n=TOP_N):
+    return [video_brief(it) for it in sorted(items, key=lambda it: -int(it['statistics'].get('viewCount', 0)))[:n]]
+
+
+def collect_uploads(gateway, api_keys_list, playlists):
+    # playlists: {channelId: uploadsPlaylistId}. Halaman ke-n semua channel
+    # dikirim paralel dalam satu call_many. Return ({cid: [videoId]}, gagal)
+    # -- gagal = channel yang request-nya error atau upload-nya tidak habis.
+    video_ids = {cid: [] for cid in playlists}
+    tokens = {cid: None for cid in playlists}
+    failed = set()
+    for _ in range(UPLOADS_MAX_PAGES):
+        if not tokens: break
+        cids = list(tokens)
+        responses = gateway.call_many(api_keys_list, "playlistItems.list", [
+            lambda yt, p=playlists[cid], t=tokens[cid]: yt.playlistItems().list(part="contentDetails", playlistId=p, maxResults=50, pageToken=t, fields=UPLOADS_FIELDS)
+            for cid in cids
+        ])
+        next_tokens = {}
+        for cid, res in zip(cids, responses):
+            if res is None:
+                failed.add(cid)
+                continue
+            video_ids[cid].extend(x['contentDetails']['videoId'] for x in res.get('items', []))
+            if res.get('nextPageToken'): next_tokens[cid] = res['nextPageToken']
+        tokens = next_tokens
+    failed.update(tokens)
+    return {cid: ids for cid, ids in video_ids.items() if cid not in failed}, failed
+
+
+def fetch_spy_videos(gateway, cache, api_keys_list, video_ids):
+    # videos.list + liveStreamingDetails (untuk memisahkan live vs reguler).
+    # Part standar ikut disimpan ke cache metadata.
+    responses = gateway.call_many(api_keys_list, "videos.list", [
+        lambda yt, c=c: yt.videos().list(part=SPY_VIDEO_PARTS, id=','.join(c), fields=SPY_VIDEO_FIELDS) for c in chunked(video_ids)
+    ])
+    items = {it['id']: it for it in response_items(responses)}
+    cache.store("videos", list(items.values()))
+    return items
+
+
+def batch_channel_spy(gateway, cache, api_keys_list, channel_ids, on_status=None, report=None, spy_cache=None, ttl=None, force=False):
+    # Return {channelId: spy_data}. None = gagal (key habis / channel tidak ada).
+    # spy_cache (SpyCache, opsional): hasil yang umurnya <= ttl dipakai ulang
+    # kecuali force=True; hasil baru disimpan ke sana.
+    channel_ids = list(dict.fromkeys(channel_ids))
+    report = report if report is not None else {}
+    cached = spy_cache.lookup(channel_ids, ttl=ttl) if spy_cache is not None and not force else {}
+    report.update({'channels': len(channel_ids), 'from_cache': len(cached), 'via_playlist': 0, 'via_search': 0})
+    fetched = fetch_channel_spy(gateway, cache, api_keys_list, [cid for cid in channel_ids if cid not in cached], on_status=on_status, report=report, refresh=force)
+    if spy_cache is not None: spy_cache.store(fetched)
+    return {cid: cached.get(cid) or fetched.get(cid) for cid in channel_ids}
+
+
+def fetch_channel_spy(gateway, cache, api_keys_list, channel_ids, on_status=None, report=None, refresh=False):
+    # Spy langsung ke API (tanpa spy cache). Return {channelId: spy_data / None}.
+    # refresh=True: profil channel juga tidak diambil dari cache metadata.
+    results = {cid: None for cid in channel_ids}
+    report = report if report is not None else {}
+    if not channel_ids: return results
+
+    if on_status: on_status(f"Profil {len(channel_ids)} channel...")
+    channels = fetch_channels(gateway, cache, api_keys_list, channel_ids, refresh=refresh)
+    spies = {cid: channel_profile(channels[cid]) for cid in channel_ids if cid in channels}
+
+    playlists = {}
+    for cid, spy_data in spies.items():
+        uploads = channels[cid].get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+        if uploads and spy_data["total_video_count"] <= UPLOADS_MAX_PAGES * 50:
+            playlists[cid] = uploads
+
+    # --- JALUR MURAH: UPLOADS PLAYLIST ---
+    if on_status: on_status(f"Uploads playlist {len(playlists)} channel...")
+    uploads, failed = collect_uploads(gateway, api_keys_list, playlists) if playlists else ({}, set())
+    all_ids = [vid for ids in uploads.values() for vid in ids]
+    video_items = fetch_spy_videos(gateway, cache, api_keys_list, all_ids) if all_ids else {}
+    for cid, ids in uploads.items():
+        items = [video_items[vid] for vid in ids if vid in video_items]
+        kinds = [broadcast_kind(it) for it in items]
+        live = [it for it, k in zip(items, kinds) if k == 'live']
+        reg = [it for it, k in zip(items, kinds) if k == 'reguler']
+        spy_data = spies[cid]
+        spy_data["live_count"] = len(live)
+        spy_data["reguler_count"] = max(0, spy_data["total_video_count"] - spy_data["live_count"] - kinds.count('upcoming'))
+        spy_data["top_live_list"] = top_videos(live)
+        spy_data["top_reg_list"] = top_videos(reg)
+        results[cid] = spy_data
+    report['via_playlist'] = report.get('via_playlist', 0) + len(uploads)
+
+    # --- FALLBACK: SEARCH (CHANNEL BESAR / PLAYLIST GAGAL) ---
+    search_cids = [cid for cid in spies if cid not in uploads]
+    if not search_cids: return results
+    if on_status: on_status(f"Search top video {len(search_cids)} channel...")
+    reqs = []
+    for cid in search_cids:
+        reqs.append(lambda yt, cid=cid: yt.search().list(part="id", channelId=cid, type="video", eventType="completed", order="viewCount", maxResults=TOP_N, fields=SPY_SEARCH_FIELDS))
+        reqs.append(lambda yt, cid=cid: yt.search().list(part="id", channelId=cid, type="video", order="viewCount", maxResults=TOP_N, fields=SPY_SEARCH_FIELDS))
+    responses = gateway.call_many(api_keys_list, "search.list", reqs)
+
+    top_ids = {}
+    for i, cid in enumerate(search_cids):
+        live_res, reg_res = responses[2 * i], responses[2 * i + 1]
+        if live_res is None or reg_res is None: continue
+        spy_data = spies[cid]
+        spy_data["live_count"] = live_res.get('pageInfo', {}).get('totalResults', 0)
+        spy_data["reguler_count"] = max(0, spy_data["total_video_count"] - spy_data["live_count"])
+        top_ids[cid] = ([it['id']['videoId'] for it in live_res.get('items', [])], [it['id']['videoId'] for it in reg_res.get('items', [])])
+
+    details = fetch_videos(gateway, cache, api_keys_list, [vid for pair in top_ids.values() for ids in pair for vid in ids])
+    for cid, (live_ids, reg_ids) in top_ids.items():
+        spy_data = spies[cid]
+        spy_data["top_live_list"] = [video_brief(details[vid]) for vid in live_ids if vid in details]
+        spy_data["top_reg_list"] = [video_brief(details[vid]) for vid in reg_ids if vid in details]
+        results[cid] = spy_data
+    report['via_search'] = report.get('via_search', 0) + len(top_ids)
+    return results
@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# ==========================================
+# APP STORE (SETTINGS, HISTORY, SEARCH LOG)
+# ==========================================
+STORE_FILE = "app_data.db"
+SEARCH_LOG_LIMIT = 30
+
+# File JSON lama, dimigrasi sekali lalu di-rename jadi *.migrated
+LEGACY_SETTINGS_FILE = "settings.json"
+LEGACY_HISTORY_FILE = "history.json"
+LEGACY_SEARCH_LOG_FILE = "search_log.json"
+
+
+class AppStore:
+    # Satu database SQLite (WAL) untuk semua state aplikasi. Lookup history
+    # per video ID lewat primary key, dan setiap tulis hanya menyentuh baris
+    # yang berubah, jadi aman dipakai banyak sesi Streamlit sekaligus.
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS download_history (
+                video_id TEXT PRIMARY KEY,
+                title TEXT,
+                date TEXT
+            );
+            CREATE TABLE IF NOT EXISTS search_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query TEXT,
+                query_norm TEXT,
+                mode TEXT,
+                time TEXT,
+                created REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_search_log_created ON search_log(created);
+            CREATE INDEX IF NOT EXISTS idx_search_log_query ON search_log(query_norm, mode);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._conn.commit()
+        self.migrate_legacy_json()
+
+    # --- migrasi sekali jalan dari file JSON ---
+    def _read_legacy(self, path, default):
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except:
+            return default
+
+    def migrate_legacy_json(self, settings_file=LEGACY_SETTINGS_FILE, history_file=LEGACY_HISTORY_FILE, search_log_file=LEGACY_SEARCH_LOG_FILE):
+        # Marker diklaim di transaksi yang sama dengan insert-nya: proses lain
+        # yang start bersamaan menunggu lock tulis SQLite, lalu mendapati
+        # marker sudah ada (rowcount 0) dan tidak ikut memigrasi.
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key='json_migrated'").fetchone():
+                return
+            settings = self._read_legacy(settings_file, {})
+            history = self._read_legacy(history_file, {})
+            log = self._read_legacy(search_log_file, [])
+
+            with self._conn:
+                claimed = self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('json_migrated', ?)", (datetime.now().isoformat(),))
+                if claimed.rowcount != 1:
+                    return
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)",
+                    [(k, json.dumps(v)) for k, v in settings.items()]
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO download_history (video_id, title, date) VALUES (?, ?, ?)",
+                    [(vid, h.get("title", ""), h.get("date", "")) for vid, h in history.items()]
+                )
+                # Log lama: index 0 = paling baru
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT INTO search_log (query, query_norm, mode, time, created) VALUES (?, ?, ?, ?, ?)",
+                    [(x["query"], x["query"].lower(), x["mode"], x.get("time", ""), now - i) for i, x in enumerate(log)]
+                )
+
+            for path in (settings_file, history_file, search_log_file):
+                if os.path.exists(path):
+                    try: os.replace(path, path + ".migrated")
+                    except: pass
+
+    # --- settings ---
+    def load_settings(self, defaults):
+        config = dict(defaults)
+        with self._lock:
+            for key, value in self._conn.execute("SELECT key, value FROM settings"):
+                try: config[key] = json.loads(value)
+                except: pass
+        return config
+
+    def save_settings(self, values):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v)) for k, v in values.items()]
+            )
+
+    # --- download history ---
+    def mark_downloaded(self, video_id, title):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO download_history (video_id, title, date) VALUES (?, ?, ?)",
+                (video_id, title, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+
+    def mark_many_downloaded(self, videos):
+        # videos: [(video_id, title)], satu transaksi untuk semua baris
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO download_history (video_id, title, date) VALUES (?, ?, ?)",
+                [(vid, title, date) for vid, title in videos]
+            )
+
+    def download_history(self, video_ids):
+        # Return {video_id: {"title", "date"}} hanya untuk ID yang diminta
+        found = {}
+        video_ids = list(video_ids)
+        with self._lock:
+            for i in range(0, len(video_ids), 500):
+                chunk = video_ids[i:i+500]
+                q = f"SELECT video_id, title, date FROM download_history WHERE video_id IN ({','.join('?' * len(chunk))})"
+                for vid, title, date in self._conn.execute(q, chunk):
+                    found[vid] = {"title": title, "date": date}
+        return found
+
+    # --- search log ---
+    def search_log(self, limit=SEARCH_LOG_LIMIT):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, query, mode, time FROM search_log ORDER BY created DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"id": r[0], "query": r[1], "mode": r[2], "time": r[3]} for r in rows]
+
+    def add_search_log(self, query, mode, limit=SEARCH_LOG_LIMIT):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_log WHERE query_norm=? AND mode=?", (query.lower(), mode))
+            self._conn.execute(
+                "INSERT INTO search_log (query, query_norm, mode, time, created) VALUES (?, ?, ?, ?, ?)",
+                (query, query.lower(), mode, datetime.now().strftime("%d/%m %H:%M"), time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM search_log WHERE id NOT IN (SELECT id FROM search_log ORDER BY created DESC LIMIT ?)", (limit,)
+            )
+
+    def delete_search_log(self, log_id=None, delete_all=False):
+        with self._lock, self._conn:
+            if delete_all:
+                self._conn.execute("DELETE FROM search_log")
+            elif log_id is not None:
+                self._conn.execute("DELETE FROM search_log WHERE id=?", (log_id,))
@@ -0,0 +1,189 @@
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# ==========================================
+# TELEMETRI PER SCAN (WAKTU, KUOTA, CACHE)
+# ==========================================
+# Satu ScanTrace per scan/analisa. Selama tracing(trace) aktif, gateway
+# mencatat tiap request ke trace itu (endpoint, key, unit kuota, 304, rotasi
+# key, error); waktu per tahap diambil dari report['timings'] milik pipeline.
+# Hasil akhir (record) ditampilkan di panel UI dan ditulis sebagai JSON lines
+# ke METRICS_FILE, jadi p50/p95 latency bisa dihitung lintas sesi & proses.
+METRICS_FILE = "scan_metrics.jsonl"
+SUMMARY_TAIL_BYTES = 512 * 1024     # ringkasan p50/p95 cuma baca ekor file
+
+_current = contextvars.ContextVar("ytintel_trace", default=None)
+_write_lock = threading.Lock()
+
+
+def current_trace():
+    return _current.get()
+
+
+@contextmanager
+def tracing(trace):
+    # with tracing(trace): ... -> request gateway di dalamnya tercatat ke trace.
+    # Thread worker gateway ikut mewarisi trace lewat contextvars.
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def cache_delta(before, after, keys):
+    delta = {k: after.get(k, 0) - before.get(k, 0) for k in keys}
+    total = sum(delta.values())
+    delta["hit_rate"] = round(delta[keys[0]] / total * 100, 1) if total else 0.0
+    return delta
+
+
+# Counter cache yang dibandingkan sebelum/sesudah scan: (kunci "hit", kunci lain...)
+CACHE_COUNTERS = {
+    "metadata": ("hits", "stale", "misses"),
+    "etag": ("not_modified", "modified"),
+}
+
+
+def etag_counters(stats):
+    return {"not_modified": stats.get("not_modified", 0), "modified": stats.get("conditional", 0) - stats.get("not_modified", 0)}
+
+
+class ScanTrace:
+    # Thread-safe: on_call dipanggil dari thread worker gateway. Counter cache
+    # dicatat sebagai selisih sebelum/sesudah scan (cache dipakai bersama
+    # semua sesi, jadi scan yang jalan bersamaan ikut terhitung).
+
+    def __init__(self, kind, query="", metadata_cache=None, etags=None):
+        self.kind = kind
+        self.query = query
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._sources = {}
+        if metadata_cache is not None: self._sources["metadata"] = metadata_cache.stats
+        if etags is not None: self._sources["etag"] = lambda: etag_counters(etags.stats())
+        self._before = {name: stats() for name, stats in self._sources.items()}
+        self.stages = {}
+        self.endpoints = {}     # endpoint -> calls, units, not_modified, rotated, errors
+        self.keys = {}          # "Key #n" -> calls, units, rotated
+        self.exhausted = 0
+        self.record = None
+
+    # --- dipanggil gateway (thread mana pun) ---
+    def on_call(self, endpoint, key_idx, cost, outcome):
+        # outcome: "ok" / "not_modified" / "rotated" / "error" / "exhausted"
+        with self._lock:
+            if outcome == "exhausted":
+                self.exhausted += 1
+                return
+            ep = self.endpoints.setdefault(endpoint, {"calls": 0, "units": 0, "not_modified": 0, "rotated": 0, "errors": 0})
+            key = self.keys.setdefault(f"Key #{key_idx + 1}", {"calls": 0, "units": 0, "rotated": 0})
+            if outcome == "rotated":
+                ep["rotated"] += 1
+                key["rotated"] += 1
+                return
+            ep["calls"] += 1
+            ep["units"] += cost
+            key["calls"] += 1
+            key["units"] += cost
+            if outcome == "not_modified": ep["not_modified"] += 1
+            if outcome == "error": ep["errors"] += 1
+
+    # --- dipanggil pemilik scan ---
+    def add_stages(self, timings):
+        for stage, seconds in (timings or {}).items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def finish(self, results=0, cached=False, **extra):
+        # Tutup trace (waktu backend) dan bentuk record; tahap "render" bisa
+        # ditambahkan belakangan lewat add_render sebelum ditulis.
+        cache = {}
+        for name, stats in self._sources.items():
+            try: cache[name] = cache_delta(self._before[name], stats(), CACHE_COUNTERS[name])
+            except: pass
+        with self._lock:
+            self.record = {
+                "ts": self.started_at,
+                "kind": self.kind,
+                "query": self.query,
+                "cached": cached,
+                "results": results,
+                "wall_s": round(time.perf_counter() - self._started, 4),
+                "stages": {k: round(v, 4) for k, v in self.stages.items()},
+                "endpoints": {k: dict(v) for k, v in self.endpoints.items()},
+                "keys": {k: dict(v) for k, v in self.keys.items()},
+                "calls": sum(v["calls"] for v in self.endpoints.values()),
+                "units": sum(v["units"] for v in self.endpoints.values()),
+                "rotations": sum(v["rotated"] for v in self.endpoints.values()),
+                "exhausted": self.exhausted,
+                "cache": cache,
+                **extra,
+            }
+        return self.record
+
+
+def add_render(record, seconds):
+    record["stages"]["render"] = round(seconds, 4)
+    record["wall_s"] = round(record["wall_s"] + seconds, 4)
+    return record
+
+
+def write_metrics(record, path=METRICS_FILE):
+    try:
+        line = json.dumps(record, ensure_ascii=False)
+        with _write_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except:
+        pass
+
+
+def read_metrics(path=METRICS_FILE, tail_bytes=SUMMARY_TAIL_BYTES):
+    if not os.path.exists(path): return []
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            lines = f.read().decode("utf-8", errors="ignore").splitlines()
+    except:
+        return []
+    if size > tail_bytes: lines = lines[1:]     # baris pertama bisa terpotong
+    records = []
+    for line in lines:
+        try: records.append(json.loads(line))
+        except: pass
+    return records
+
+
+def percentile(values, q):
+    # Nearest-rank, cukup untuk ringkasan latency
+    if not values: return 0.0
+    values = sorted(values)
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def latency_summary(records, include_cached=False):
+    # {kind: {"n", "p50", "p95", "units_avg"}} dari record hasil read_metrics.
+    # Hit cache & refilter superset tidak mewakili scan penuh, default dilewati
+    by_kind = {}
+    for r in records:
+        if (r.get("cached") or r.get("refiltered")) and not include_cached: continue
+        by_kind.setdefault(r.get("kind", "?"), []).append(r)
+    summary = {}
+    for kind, rs in by_kind.items():
+        walls = [r.get("wall_s", 0) for r in rs]
+        summary[kind] = {
+            "n": len(rs),
+            "p50": round(percentile(walls, 50), 2),
+            "p95": round(percentile(walls, 95), 2),
+            "units_avg": round(sum(r.get("units", 0) for r in rs) / len(rs), 1),
+        }
+    return summary